@@ -0,0 +1,162 @@
+import logging
+from datetime import timedelta
+from typing import Iterator, NamedTuple, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import models, transaction
+from django.utils import timezone
+
+from .models import AccountDeletion
+
+logger = logging.getLogger(__name__)
+
+# Relations set to NULL by Django whose rows are useless without the user, so they are deleted instead.
+DELETE_ORPHANS = {'token_blacklist.outstandingtoken'}
+
+MAX_DEPTH = 5
+
+
+class DeletionStep(NamedTuple):
+    """
+    Rows of `model` reaching the user through `lookup`, either deleted or detached from the user.
+    """
+
+    model: type[models.Model]
+    lookup: str
+    field_name: str
+    nullify: bool
+
+    @property
+    def name(self) -> str:
+        return f'{self.model._meta.label_lower}:{self.lookup}'
+
+    def queryset(self, user_id) -> models.QuerySet:
+        return self.model._base_manager.filter(**{self.lookup: user_id})
+
+
+def _cascading_relations(model: type[models.Model]) -> Iterator:
+    for relation in model._meta.related_objects:
+        if (relation.one_to_many or relation.one_to_one) and relation.on_delete in (models.CASCADE, models.SET_NULL):
+            yield relation
+
+
+def build_steps(model: Optional[type[models.Model]] = None, lookup: str = '', depth: int = 0) -> list[DeletionStep]:
+    """
+    The chunked steps deleting the dependents of a user, children before their parents.
+
+    The relations are read from the models, so the steps follow the `on_delete` of every foreign key
+    pointing, directly or not, at the user: CASCADE rows are deleted and SET_NULL rows are detached.
+    Other relations (PROTECT, many-to-many rows, ...) are left to the final `user.delete()`.
+    """
+    model = model or get_user_model()
+    steps = []
+    if depth >= MAX_DEPTH:
+        return steps
+    for relation in _cascading_relations(model):
+        related_model = relation.related_model
+        related_lookup = f'{relation.field.name}__{lookup}' if lookup else relation.field.name
+        nullify = relation.on_delete is models.SET_NULL and related_model._meta.label_lower not in DELETE_ORPHANS
+        if not nullify:
+            steps.extend(build_steps(related_model, related_lookup, depth + 1))
+        steps.append(DeletionStep(related_model, related_lookup, relation.field.name, nullify))
+    return steps
+
+
+def request_account_deletion(user) -> AccountDeletion:
+    """
+    Deactivates the user at once and hands the deletion of the account over to a worker.
+
+    Requesting the deletion of an account already being deleted returns the pending deletion.
+    """
+    with transaction.atomic():
+        user.is_active = False
+        user.save(update_fields=['is_active', 'deactivation_date', 'updated_at'])
+        deletion = AccountDeletion.objects.filter(user_id=user.pk).exclude(status=AccountDeletion.Status.DONE).first()
+        if deletion is None:
+            deletion = AccountDeletion.objects.create(user_id=user.pk, email=user.email)
+        transaction.on_commit(lambda: dispatch_account_deletion(deletion.pk))
+    return deletion
+
+
+def dispatch_account_deletion(deletion_id: int) -> None:
+    from .tasks import delete_account
+
+    try:
+        delete_account.delay(deletion_id)
+    except Exception:
+        # The deletion is resumed by the periodic `resume_account_deletions` task.
+        logger.exception('Could not dispatch the deletion of account %s.', deletion_id)
+
+
+def _run_step(deletion: AccountDeletion, step: DeletionStep, batch_size: int) -> None:
+    progress = deletion.progress.get(step.name, {'done': 0})
+    queryset = step.queryset(deletion.user_id)
+    progress['total'] = progress['done'] + queryset.count()
+    deletion.step = step.name
+    deletion.progress[step.name] = progress
+    deletion.save(update_fields=['step', 'progress', 'updated_at'])
+
+    pks = queryset.order_by('pk').values_list('pk', flat=True)
+    while ids := list(pks[:batch_size]):
+        with transaction.atomic():
+            chunk = step.model._base_manager.filter(pk__in=ids)
+            if step.nullify:
+                chunk.update(**{step.field_name: None})
+            else:
+                chunk.delete()
+            progress['done'] += len(ids)
+            deletion.save(update_fields=['progress', 'updated_at'])
+
+
+def run_account_deletion(deletion_id: int, batch_size: Optional[int] = None) -> AccountDeletion:
+    """
+    Deletes the dependents of the user in chunks of `batch_size` rows, then the user.
+
+    Every chunk is its own transaction, so locks are short and memory stays bounded. The steps only see
+    the rows still there, so a deletion interrupted at any point can simply be run again.
+    """
+    batch_size = batch_size or settings.ACCOUNT_DELETION_BATCH_SIZE
+    deletion = AccountDeletion.objects.get(pk=deletion_id)
+    if deletion.status == AccountDeletion.Status.DONE:
+        return deletion
+
+    deletion.status = AccountDeletion.Status.RUNNING
+    deletion.attempts += 1
+    deletion.save(update_fields=['status', 'attempts', 'updated_at'])
+    try:
+        for step in build_steps():
+            _run_step(deletion, step, batch_size)
+
+        deletion.step = 'user'
+        # Only light relations (emails, permissions, ...) are left for Django's collector.
+        get_user_model()._base_manager.filter(pk=deletion.user_id).delete()
+    except Exception as error:
+        deletion.status = AccountDeletion.Status.FAILED
+        deletion.last_error = f'{error.__class__.__name__}: {error}'
+        deletion.save(update_fields=['status', 'last_error', 'updated_at'])
+        raise
+
+    deletion.status = AccountDeletion.Status.DONE
+    deletion.finished_at = timezone.now()
+    deletion.last_error = ''
+    deletion.save(update_fields=['status', 'step', 'finished_at', 'last_error', 'updated_at'])
+    return deletion
+
+
+def resume_account_deletions() -> int:
+    """
+    Dispatches again the deletions that failed or stopped making progress, e.g. when their worker died.
+
+    Returns:
+      int: Number of dispatched deletions.
+    """
+    stalled_before = timezone.now() - timedelta(seconds=settings.ACCOUNT_DELETION_RESUME_AFTER_SECONDS)
+    deletion_ids = list(
+        AccountDeletion.objects.exclude(status=AccountDeletion.Status.DONE)
+        .filter(updated_at__lt=stalled_before)
+        .values_list('pk', flat=True)
+    )
+    for deletion_id in deletion_ids:
+        dispatch_account_deletion(deletion_id)
+    return len(deletion_ids)
@@ -1,7 +1,23 @@
 from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.db.models import Q
+from django.template.response import TemplateResponse
+from django.urls import path
+from django.utils import timezone
+from django.utils.translation import gettext as _
 
-from apps.membership.models import LoginAttempt, User
-from apps.utils.admin import SearchableRelatedFieldListFilter
+from apps.membership.account_deletion import dispatch_account_deletion
+from apps.membership.models import (
+    AccountDeletion,
+    GeoLocation,
+    LoginAttempt,
+    LoginAttemptRollup,
+    OutboundEmail,
+    User,
+    UserAgent,
+)
+from apps.membership.rollups import get_login_dashboard
+from apps.utils.admin import LookupValueListFilter, SearchableRelatedFieldListFilter
 
 
 @admin.register(User)
@@ -27,29 +43,76 @@ class UserAdmin(admin.ModelAdmin):
         'created_at',
     )
     ordering = ('id',)
+    actions = ['activate_users', 'deactivate_users']
+
+    # Single UPDATE statements keeping the activation dates, instead of a `save()` per user.
+    @admin.action(description=_('Activate the selected users'))
+    def activate_users(self, request, queryset):
+        updated = queryset.activate()
+        self.message_user(request, _('{count} users activated.').format(count=updated))
+
+    @admin.action(description=_('Deactivate the selected users'))
+    def deactivate_users(self, request, queryset):
+        updated = queryset.deactivate()
+        self.message_user(request, _('{count} users deactivated.').format(count=updated))
+
+
+@admin.register(GeoLocation)
+class GeoLocationAdmin(admin.ModelAdmin):
+    list_display = ['id', 'city', 'region', 'country', 'country_code', 'latitude', 'longitude']
+    list_filter = ['country_code']
+    search_fields = ['=city', '=country']
+    ordering = ['country_code', 'city']
+
+
+@admin.register(UserAgent)
+class UserAgentAdmin(admin.ModelAdmin):
+    list_display = ['id', 'browser_family', 'browser_version', 'os_family', 'os_version']
+    list_filter = ['browser_family', 'os_family']
+    search_fields = ['=browser_family', '=os_family']
+    ordering = ['browser_family', 'browser_version']
+
+
+class CityListFilter(LookupValueListFilter):
+    title = _('city')
+    parameter_name = 'city'
+    field_name = 'geo_location'
+    lookup_field = 'city'
+
+
+class BrowserFamilyListFilter(LookupValueListFilter):
+    title = _('browser family')
+    parameter_name = 'browser_family'
+    field_name = 'user_agent'
+    lookup_field = 'browser_family'
 
 
 @admin.register(LoginAttempt)
 class LoginAttemptAdmin(admin.ModelAdmin):
-    list_display = ['created_at', 'username', 'user', 'ip', 'city', 'has_logged_in']
+    list_display = ['attempted_at', 'username', 'user', 'ip', 'city', 'user_agent', 'has_logged_in']
+    list_select_related = ['user', 'geo_location', 'user_agent']
     list_filter = [
         ('user', SearchableRelatedFieldListFilter),
+        CityListFilter,
+        BrowserFamilyListFilter,
         'has_logged_in',
     ]
+    # `icontains` on these still reads every attempt; the city and browser family are matched exactly
+    # through the lookup tables instead, see `get_search_results`.
     search_fields = [
         'username',
-        'browser',
         'ip',
     ]
-    date_hierarchy = 'created_at'
-    ordering = ['-created_at']
+    # Filtering and ordering by the partition key lets PostgreSQL skip the partitions of other months.
+    date_hierarchy = 'attempted_at'
+    ordering = ['-attempted_at']
     fields = [
         'user',
         'username',
         ('attempted_at', 'has_logged_in'),
-        'browser',
+        'user_agent',
         'ip',
-        'geolocation',
+        'geo_location',
         ('created_at', 'updated_at'),
     ]
     readonly_fields = [
@@ -58,8 +121,110 @@ class LoginAttemptAdmin(admin.ModelAdmin):
         'username',
         'attempted_at',
         'has_logged_in',
-        'browser',
-        'geolocation',
+        'user_agent',
+        'geo_location',
         'created_at',
         'updated_at',
     ]
+
+    def get_search_results(self, request, queryset, search_term):
+        matches, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        search_term = search_term.strip()
+        if search_term:
+            # Resolved in the small lookup tables through their UPPER() indexes, so the attempts
+            # are filtered by foreign key instead of being joined with the lookup tables.
+            geo_location_ids = list(GeoLocation.objects.filter(city__iexact=search_term).values_list('pk', flat=True))
+            user_agent_ids = list(
+                UserAgent.objects.filter(browser_family__iexact=search_term).values_list('pk', flat=True)
+            )
+            if geo_location_ids or user_agent_ids:
+                matches |= queryset.filter(
+                    Q(geo_location_id__in=geo_location_ids) | Q(user_agent_id__in=user_agent_ids)
+                )
+        return matches, may_have_duplicates
+
+
+@admin.register(LoginAttemptRollup)
+class LoginAttemptRollupAdmin(admin.ModelAdmin):
+    list_display = ['period_start', 'granularity', 'attempts', 'successes', 'failures', 'unique_ips', 'top_cities']
+    list_filter = ['granularity']
+    date_hierarchy = 'period_start'
+    ordering = ['-period_start', 'granularity']
+    change_list_template = 'admin/membership/loginattemptrollup/change_list.html'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        return [
+            path(
+                'dashboard/',
+                self.admin_site.admin_view(self.dashboard_view),
+                name='membership_loginattemptrollup_dashboard',
+            ),
+            *super().get_urls(),
+        ]
+
+    def dashboard_view(self, request):
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        context = {
+            **self.admin_site.each_context(request),
+            **get_login_dashboard(),
+            'title': _('Login dashboard'),
+            'opts': self.model._meta,
+        }
+        return TemplateResponse(request, 'admin/membership/loginattemptrollup/dashboard.html', context)
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ['subject', 'to', 'status', 'attempts', 'next_attempt_at', 'sent_at', 'created_at']
+    list_filter = ['status']
+    search_fields = ['subject']
+    date_hierarchy = 'created_at'
+    ordering = ['-created_at']
+    readonly_fields = ['attempts', 'sent_at', 'last_error', 'created_at', 'updated_at']
+    actions = ['retry']
+
+    @admin.action(description=_('Retry the selected emails'))
+    def retry(self, request, queryset):
+        updated = queryset.exclude(status=OutboundEmail.Status.SENT).update(
+            status=OutboundEmail.Status.PENDING, attempts=0, next_attempt_at=timezone.now()
+        )
+        self.message_user(request, _('{count} emails queued again.').format(count=updated))
+
+
+@admin.register(AccountDeletion)
+class AccountDeletionAdmin(admin.ModelAdmin):
+    list_display = ['email', 'user_id', 'status', 'step', 'attempts', 'created_at', 'finished_at']
+    list_filter = ['status']
+    search_fields = ['email']
+    date_hierarchy = 'created_at'
+    ordering = ['-created_at']
+    readonly_fields = [
+        'user_id',
+        'email',
+        'status',
+        'step',
+        'progress',
+        'attempts',
+        'finished_at',
+        'last_error',
+        'created_at',
+        'updated_at',
+    ]
+    actions = ['resume']
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description=_('Resume the selected deletions'))
+    def resume(self, request, queryset):
+        deletion_ids = list(queryset.exclude(status=AccountDeletion.Status.DONE).values_list('pk', flat=True))
+        for deletion_id in deletion_ids:
+            dispatch_account_deletion(deletion_id)
+        self.message_user(request, _('{count} deletions resumed.').format(count=len(deletion_ids)))
@@ -3,27 +3,27 @@ from django.contrib.auth.models import update_last_login
 from django.contrib.auth.password_validation import validate_password
 from django.contrib.auth.tokens import default_token_generator
 from django.core.exceptions import ValidationError as DjangoValidationError
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
 from django.utils.encoding import force_bytes, force_str
-from django.utils.html import strip_tags
 from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
 from django.utils.translation import gettext as _
-from google.auth.transport import requests as google_requests
-from google.oauth2 import id_token
+from google.auth.exceptions import TransportError
 from rest_framework import status
 from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.generics import CreateAPIView, RetrieveUpdateAPIView
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenRefreshView
 
+from apps.membership.account_deletion import request_account_deletion
+from apps.membership.google_certs import verify_google_id_token
+from apps.membership.hashing import get_password_hashing_pool
+from apps.membership.outbox import enqueue_email
 from apps.membership.serializers import CustomUserSerializer, LoginUserSerializer, RegisterUserSerializer
 from apps.membership.throttling import LoginRateThrottle, RegisterRateThrottle
+from apps.membership.tokens import UserClaimsRefreshToken
 from apps.membership.utils import activation_token
 
 User = get_user_model()
@@ -45,7 +45,7 @@ class LoginView(APIView):
 
         if serializer.is_valid():
             user = serializer.validated_data
-            refresh = RefreshToken.for_user(user)
+            refresh = UserClaimsRefreshToken.for_user(user)
 
             access_token = str(refresh.access_token)
             access_token_expiry = refresh.access_token['exp']
@@ -89,8 +89,8 @@ class LoginGoogleView(APIView):
             return Response({'error': 'Token is required.'}, status=400)
 
         try:
-            # Verify the Google ID token
-            google_user_info = id_token.verify_oauth2_token(google_token, google_requests.Request())
+            # Verify the Google ID token against the cached Google certificates
+            google_user_info = verify_google_id_token(google_token)
 
             # Extract user's email from the token payload
             email = google_user_info.get('email')
@@ -100,7 +100,7 @@ class LoginGoogleView(APIView):
                 user = User.objects.get(email=email)
 
                 # Generate JWT tokens for the user
-                refresh = RefreshToken.for_user(user)
+                refresh = UserClaimsRefreshToken.for_user(user)
                 return Response(
                     {
                         'refresh': str(refresh),
@@ -120,6 +120,10 @@ class LoginGoogleView(APIView):
             # Token verification failed
             return Response({'error': 'Invalid token.'}, status=400)
 
+        except TransportError:
+            # Google's certificates could not be fetched
+            return Response({'error': 'Google sign-in is temporarily unavailable.'}, status=503)
+
 
 class LogoutView(APIView):
     """
@@ -134,7 +138,7 @@ class LogoutView(APIView):
 
         if refresh_token:
             try:
-                refresh = RefreshToken(refresh_token)
+                refresh = UserClaimsRefreshToken(refresh_token)
                 refresh.blacklist()
             except InvalidToken:
                 pass
@@ -168,9 +172,8 @@ class CookieTokenRefreshView(TokenRefreshView):
             return Response({'error': _('Refresh token not provided')}, status=status.HTTP_401_UNAUTHORIZED)
 
         try:
-            refresh = RefreshToken(refresh_token)
-            if refresh.is_expired:
-                raise TokenError('Refresh token has expired')
+            # Raises TokenError when the token is expired or blacklisted.
+            refresh = UserClaimsRefreshToken(refresh_token)
             access_token = str(refresh.access_token)
             access_token_expiry = refresh.access_token['exp']
             refresh_token_expiry = refresh['exp']
@@ -184,7 +187,7 @@ class CookieTokenRefreshView(TokenRefreshView):
             response = Response(response_data, status=status.HTTP_200_OK)
             response.set_cookie(key='access_token', value=access_token, httponly=True, secure=True, samesite='None')
             return response
-        except InvalidToken:
+        except (InvalidToken, TokenError):
             return Response({'error': _('Invalid token')}, status=status.HTTP_401_UNAUTHORIZED)
 
 
@@ -213,15 +216,16 @@ class UserRegistrationView(CreateAPIView):
         frontend_base_url = 'http://localhost:5173/activate'
         activation_link = f'{frontend_base_url}?uidb64={uid}&token={token}'
         subject = 'Activate Your Account'
-        message = render_to_string(
-            'membership/email/activation_email.html',
-            {
-                'user': user,
+        enqueue_email(
+            subject,
+            [user.email],
+            template_name='membership/email/activation_email.html',
+            context={
+                'user': {'username': user.get_username()},
                 'activation_link': activation_link,
             },
+            from_email='youremail@example.com',
         )
-        plain_message = strip_tags(message)
-        send_mail(subject, plain_message, 'youremail@example.com', [user.email], html_message=message)
 
     def create(self, request, *args, **kwargs):
         """
@@ -254,10 +258,10 @@ class DeleteAccountView(APIView):
         if not password or not authenticate(email=user.email, password=password):
             return Response({'error': 'Invalid password'}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Perform deletion
-        user.delete()
+        # Deactivate the account now, its data is deleted in the background
+        request_account_deletion(user)
 
-        return Response({'message': 'Account deleted successfully.'}, status=status.HTTP_200_OK)
+        return Response({'message': 'Account scheduled for deletion.'}, status=status.HTTP_202_ACCEPTED)
 
 
 class ChangePasswordView(APIView):
@@ -356,7 +360,7 @@ class ResetPasswordView(APIView):
         # Send password reset email
         subject = 'Reset Your Password'
         message = f"Click the link below to reset your password:\n{reset_link}"
-        send_mail(subject, message, 'noreply@example.com', [user.email])
+        enqueue_email(subject, [user.email], body=message, from_email='noreply@example.com')
 
         return Response(
             {'message': 'If the email exists, a password reset link will be sent.'}, status=status.HTTP_200_OK
@@ -390,3 +394,15 @@ class ConfirmResetPasswordView(APIView):
         user.set_password(new_password)
         user.save()
         return Response({'message': 'Password has been successfully reset.'}, status=status.HTTP_200_OK)
+
+
+class PasswordHashingStatsView(APIView):
+    """
+    API endpoint exposing the password hashing pool metrics (queue depth, wait time, rejections) to staff.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        pool = get_password_hashing_pool()
+        return Response({'enabled': pool is not None, **(pool.stats() if pool else {})}, status=status.HTTP_200_OK)
@@ -6,3 +6,6 @@ class MembershipConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.membership'
     verbose_name = _('Userbase')
+
+    def ready(self):
+        from . import signals  # noqa F401
@@ -1,7 +1,20 @@
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication, JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from apps.membership.user_cache import get_cached_user
 
 
 class CookieJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication reading the token from the `Authorization` header or the `access_token` cookie.
+
+    Users are resolved through the versioned user cache (see `apps.membership.user_cache`),
+    so an authenticated request does not query the database while the user is unchanged.
+    """
+
     def authenticate(self, request):
         header = self.get_header(request)
 
@@ -16,3 +29,35 @@ class CookieJWTAuthentication(JWTAuthentication):
         except:  # noqa
             return None, None
         return self.get_user(validated_token), validated_token
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        user = get_cached_user(user_id)
+        if user is None:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(_("The user's password has been changed."), code='password_changed')
+
+        return user
+
+
+class CookieJWTStatelessAuthentication(CookieJWTAuthentication):
+    """
+    Builds a `TokenUser` from the token claims (see `apps.membership.tokens`) without any lookup.
+
+    For endpoints that only need the user id and flags; a deactivated user keeps access until
+    the access token expires.
+    """
+
+    def get_user(self, validated_token):
+        return JWTStatelessUserAuthentication.get_user(self, validated_token)
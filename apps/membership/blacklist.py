@@ -0,0 +1,136 @@
+import threading
+import time
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from apps.utils.bloom import BloomFilter
+
+CACHE_KEY_PREFIX = 'jwt-blacklist'
+
+
+def _cache_key(jti: str) -> str:
+    return f'{CACHE_KEY_PREFIX}:{jti}'
+
+
+class TokenBlacklist:
+    """
+    Answers "is this jti blacklisted" mostly without the database.
+
+    Each process keeps a Bloom filter of the blacklisted jtis, topped up with the newly blacklisted tokens
+    every `sync_interval` seconds and rebuilt from the unexpired ones every `rebuild_interval` seconds.
+    Only jtis the filter may contain are looked up in the database. Tokens blacklisted since the last sync
+    are caught by a shared cache entry written when they are blacklisted (see `mark_blacklisted`),
+    which outlives the sync interval.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        error_rate: float,
+        sync_interval: float,
+        rebuild_interval: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.rebuild_interval = rebuild_interval
+        self.clock = clock
+        self.database_lookups = 0
+        self._filter: Optional[BloomFilter] = None
+        self._last_id = 0
+        self._synced_at = 0.0
+        self._rebuilt_at = 0.0
+        self._lock = threading.Lock()
+
+    def _rebuild(self, now: float) -> None:
+        bloom = BloomFilter(self.capacity, self.error_rate)
+        last_id = BlacklistedToken.objects.aggregate(Max('pk'))['pk__max'] or 0
+        blacklisted = BlacklistedToken.objects.filter(pk__lte=last_id, token__expires_at__gt=timezone.now())
+        for jti in blacklisted.values_list('token__jti', flat=True).iterator():
+            bloom.add(jti)
+        self._filter, self._last_id, self._rebuilt_at = bloom, last_id, now
+
+    def _sync(self) -> None:
+        now = self.clock()
+        if self._filter is not None and now - self._synced_at < self.sync_interval:
+            return
+        with self._lock:
+            if self._filter is not None and now - self._synced_at < self.sync_interval:
+                return
+            if (
+                self._filter is None
+                or now - self._rebuilt_at >= self.rebuild_interval
+                or len(self._filter) >= self.capacity
+            ):
+                self._rebuild(now)
+            else:
+                for pk, jti in BlacklistedToken.objects.filter(pk__gt=self._last_id).values_list('pk', 'token__jti'):
+                    self._filter.add(jti)
+                    self._last_id = max(self._last_id, pk)
+            self._synced_at = now
+
+    def add(self, jti: str) -> None:
+        with self._lock:
+            if self._filter is not None:
+                self._filter.add(jti)
+
+    def is_blacklisted(self, jti: str) -> bool:
+        if cache.get(_cache_key(jti)):
+            return True
+        self._sync()
+        if jti not in self._filter:
+            return False
+
+        self.database_lookups += 1
+        blacklisted = BlacklistedToken.objects.filter(token__jti=jti).exists()
+        if blacklisted:
+            cache.set(_cache_key(jti), True, settings.JWT_BLACKLIST_CACHE_TIMEOUT)
+        return blacklisted
+
+
+_blacklist: Optional[TokenBlacklist] = None
+_blacklist_lock = threading.Lock()
+
+
+def get_token_blacklist() -> TokenBlacklist:
+    global _blacklist
+    with _blacklist_lock:
+        if _blacklist is None:
+            _blacklist = TokenBlacklist(
+                capacity=settings.JWT_BLACKLIST_BLOOM_CAPACITY,
+                error_rate=settings.JWT_BLACKLIST_BLOOM_ERROR_RATE,
+                sync_interval=settings.JWT_BLACKLIST_SYNC_INTERVAL_SECONDS,
+                rebuild_interval=settings.JWT_BLACKLIST_REBUILD_INTERVAL_SECONDS,
+            )
+        return _blacklist
+
+
+def mark_blacklisted(jti: str) -> None:
+    """
+    Makes a newly blacklisted jti visible to every process before their filters sync.
+    """
+    cache.set(_cache_key(jti), True, settings.JWT_BLACKLIST_CACHE_TIMEOUT)
+    get_token_blacklist().add(jti)
+
+
+def purge_expired_tokens(batch_size: int, now=None) -> int:
+    """
+    Deletes the expired outstanding tokens, with their blacklist entries, in batches of `batch_size`.
+
+    Returns:
+      int: Number of deleted outstanding tokens.
+    """
+    now = now or timezone.now()
+    expired = OutstandingToken.objects.filter(expires_at__lte=now).order_by('pk').values_list('pk', flat=True)
+    deleted = 0
+    while ids := list(expired[:batch_size]):
+        # Cascades to the blacklist entries of the batch.
+        OutstandingToken.objects.filter(pk__in=ids).delete()
+        deleted += len(ids)
+    return deleted
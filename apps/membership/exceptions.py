@@ -1,2 +1,18 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
 class TooManyLoginAttemptsException(Exception):
     pass
+
+
+class PasswordHashingBusyException(APIException):
+    """
+    Raised when the password hashing queue stays full; answered with 503 by the API views
+    and by `PasswordHashingBusyMiddleware` everywhere else.
+    """
+
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _('The server is busy, please try again shortly.')
+    default_code = 'password_hashing_busy'
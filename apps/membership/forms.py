@@ -8,8 +8,9 @@ from django.http import HttpRequest
 from django.utils.translation import gettext as _
 
 from apps.membership.exceptions import TooManyLoginAttemptsException
+from apps.membership.login_attempts import record_login_attempt
 from apps.membership.models import User
-from apps.membership.utils import handle_login_attempt
+from apps.membership.utils import handle_failed_login, handle_login_attempt
 
 
 class BaseLoginForm(forms.Form):
@@ -36,6 +37,12 @@ class BaseLoginForm(forms.Form):
             )
         return login_attempt
 
+    def _handle_failed_login(self, username: Optional[str]) -> None:
+        """
+        Helper method counting a failed login towards the lockout.
+        """
+        handle_failed_login(self.request, username)
+
 
 class AdminLoginForm(AdminAuthenticationForm, BaseLoginForm):
     """
@@ -46,10 +53,16 @@ class AdminLoginForm(AdminAuthenticationForm, BaseLoginForm):
         cleaned_username: Optional[str] = self.cleaned_data.get('username')
         login_attempt = self._handle_login_attempt(cleaned_username)
 
-        validated_data = super().clean()
-        login_attempt.has_logged_in = True
-        login_attempt.user = self.user_cache
-        login_attempt.save()
+        try:
+            validated_data = super().clean()
+        except forms.ValidationError:
+            self._handle_failed_login(cleaned_username)
+            raise
+        else:
+            login_attempt.has_logged_in = True
+            login_attempt.user = self.user_cache
+        finally:
+            record_login_attempt(login_attempt)
         return validated_data
 
 
@@ -59,8 +72,10 @@ class UserLoginForm(AuthenticationForm, BaseLoginForm):
     """
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
-        self.request: Optional[HttpRequest] = kwargs.pop('request', None)
+        request: Optional[HttpRequest] = kwargs.pop('request', None)
         super().__init__(*args, **kwargs)
+        # Set after `AuthenticationForm.__init__`, which would reset it to None.
+        self.request = request
 
     def confirm_login_allowed(self, user: User) -> None:
         if not user.is_active:
@@ -73,10 +88,16 @@ class UserLoginForm(AuthenticationForm, BaseLoginForm):
         cleaned_username: Optional[str] = self.cleaned_data.get('username')
         login_attempt = self._handle_login_attempt(cleaned_username)
 
-        validated_data = super().clean()
-        login_attempt.has_logged_in = True
-        login_attempt.user = self.user_cache
-        login_attempt.save()
+        try:
+            validated_data = super().clean()
+        except forms.ValidationError:
+            self._handle_failed_login(cleaned_username)
+            raise
+        else:
+            login_attempt.has_logged_in = True
+            login_attempt.user = self.user_cache
+        finally:
+            record_login_attempt(login_attempt)
         return validated_data
 
 
@@ -0,0 +1,218 @@
+import logging
+import re
+import threading
+import time
+from typing import Callable, Optional
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from google.auth import exceptions, jwt
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY = 'google-certs'
+
+REFRESH_LOCK_KEY = 'google-certs:refresh'
+
+GOOGLE_ISSUERS = ('accounts.google.com', 'https://accounts.google.com')
+
+MAX_AGE_RE = re.compile(r'(?:^|,)\s*max-age\s*=\s*(\d+)', re.IGNORECASE)
+
+
+def parse_max_age(headers, default: int) -> int:
+    """
+    Seconds a response stays fresh according to its `Cache-Control` max-age, less its `Age`.
+
+    Returns:
+      int: The remaining freshness, or `default` when the response has no max-age.
+    """
+    match = MAX_AGE_RE.search(headers.get('Cache-Control', ''))
+    if match is None:
+        return default
+    try:
+        age = int(headers.get('Age', 0))
+    except ValueError:
+        age = 0
+    return max(int(match.group(1)) - age, 0)
+
+
+class GoogleCertCache:
+    """
+    Google's ID token signing certificates, kept in process and in the shared cache.
+
+    The certificates are fetched over a pooled HTTP session and kept for as long as the `Cache-Control`
+    max-age of the response allows, so verifying a token is local CPU work in steady state. Within
+    `refresh_margin` seconds of the expiry one background thread per process refreshes them, taking
+    a fresher copy from the shared cache when another worker has already fetched one. A token signed
+    with a key missing from the cached certificates (Google rotated its keys early) forces a refresh,
+    at most once every `min_refresh_interval` seconds.
+
+    Args:
+      certs_url (str): The certificates endpoint.
+      timeout (float): HTTP timeout in seconds.
+      default_max_age (int): Seconds to keep the certificates when the response has no max-age.
+      refresh_margin (float): Seconds before the expiry at which a background refresh starts.
+      min_refresh_interval (float): Minimum seconds between two fetches outside the normal schedule.
+      clock (Callable, optional): Source of the current (wall clock) time, used by tests.
+      session (requests.Session, optional): The HTTP session.
+    """
+
+    def __init__(
+        self,
+        certs_url: str,
+        timeout: float,
+        default_max_age: int,
+        refresh_margin: float,
+        min_refresh_interval: float,
+        clock: Callable[[], float] = time.time,
+        session: Optional[requests.Session] = None,
+    ) -> None:
+        self.certs_url = certs_url
+        self.timeout = timeout
+        self.default_max_age = default_max_age
+        self.refresh_margin = refresh_margin
+        self.min_refresh_interval = min_refresh_interval
+        self.clock = clock
+        self.session = session or requests.Session()
+        self.fetches = 0
+        self._certs: Optional[dict] = None
+        self._expires_at = 0.0
+        self._attempted_at = float('-inf')
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _fetch(self) -> tuple[dict, float]:
+        self._attempted_at = self.clock()
+        try:
+            response = self.session.get(self.certs_url, timeout=self.timeout)
+            response.raise_for_status()
+            certs = response.json()
+        except (requests.RequestException, ValueError) as error:
+            raise exceptions.TransportError(f'Could not fetch certificates at {self.certs_url}') from error
+
+        self.fetches += 1
+        now = self.clock()
+        max_age = parse_max_age(response.headers, self.default_max_age)
+        expires_at = now + max_age
+        if max_age:
+            cache.set(CACHE_KEY, (certs, expires_at), max_age)
+        return certs, expires_at
+
+    def _adopt(self, certs: dict, expires_at: float) -> dict:
+        self._certs, self._expires_at = certs, expires_at
+        return certs
+
+    def _load(self, force: bool) -> dict:
+        now = self.clock()
+        shared = cache.get(CACHE_KEY)
+        if shared is not None and now < shared[1] and (not force or shared[0] != self._certs):
+            return self._adopt(*shared)
+
+        if self._certs is not None and now - self._attempted_at < self.min_refresh_interval:
+            # Fetched a moment ago: keep what is there rather than calling Google on every request.
+            return self._certs
+        try:
+            return self._adopt(*self._fetch())
+        except exceptions.TransportError:
+            if self._certs is None:
+                raise
+            # Google keeps a key valid well past the max-age of the response listing it.
+            logger.exception('Could not refresh the Google certificates, keeping the cached ones.')
+            return self._certs
+
+    def get_certs(self, force: bool = False) -> dict:
+        """
+        The current certificates, as a mapping of key ids to PEM certificates.
+
+        Args:
+          force (bool, optional): Look for newer certificates even when the cached ones are still fresh.
+
+        Raises:
+          TransportError: If there are no certificates yet and they cannot be fetched.
+        """
+        certs, expires_at, now = self._certs, self._expires_at, self.clock()
+        if not force and certs is not None and now < expires_at:
+            if expires_at - now <= self.refresh_margin:
+                self._refresh_in_background()
+            return certs
+
+        with self._lock:
+            if not force and self._certs is not None and now < self._expires_at:
+                return self._certs
+            return self._load(force)
+
+    def _refresh_in_background(self) -> None:
+        with self._lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = threading.Thread(target=self._refresh, name='google-certs-refresh', daemon=True)
+            self._refresh_thread.start()
+
+    def _refresh(self) -> None:
+        try:
+            shared = cache.get(CACHE_KEY)
+            if shared is not None and shared[1] - self.clock() > self.refresh_margin:
+                with self._lock:
+                    self._adopt(*shared)
+            # One worker fetches for all; the others pick its certificates from the shared cache.
+            elif cache.add(REFRESH_LOCK_KEY, 1, max(int(self.timeout * 2), 1)):
+                try:
+                    certs, expires_at = self._fetch()
+                    with self._lock:
+                        self._adopt(certs, expires_at)
+                finally:
+                    cache.delete(REFRESH_LOCK_KEY)
+        except Exception:
+            logger.exception('Could not refresh the Google certificates in the background.')
+
+    def verify(self, token: str, audience: Optional[str] = None, clock_skew_in_seconds: int = 0) -> dict:
+        """
+        Verifies a Google ID token against the cached certificates.
+
+        Returns:
+          dict: The decoded token.
+
+        Raises:
+          ValueError: If the token is invalid or was not issued by Google.
+          TransportError: If there are no certificates yet and they cannot be fetched.
+        """
+        certs = self.get_certs()
+        try:
+            payload = jwt.decode(token, certs=certs, audience=audience, clock_skew_in_seconds=clock_skew_in_seconds)
+        except ValueError:
+            if jwt.decode_header(token).get('kid') in certs:
+                raise
+            refreshed = self.get_certs(force=True)
+            if refreshed == certs:
+                raise
+            payload = jwt.decode(token, certs=refreshed, audience=audience, clock_skew_in_seconds=clock_skew_in_seconds)
+
+        if payload.get('iss') not in GOOGLE_ISSUERS:
+            raise ValueError(f'Wrong issuer {payload.get("iss")!r}.')
+        return payload
+
+
+_cert_cache: Optional[GoogleCertCache] = None
+_cert_cache_lock = threading.Lock()
+
+
+def get_google_cert_cache() -> GoogleCertCache:
+    global _cert_cache
+    with _cert_cache_lock:
+        if _cert_cache is None:
+            _cert_cache = GoogleCertCache(
+                certs_url=settings.GOOGLE_OAUTH2_CERTS_URL,
+                timeout=settings.GOOGLE_CERTS_TIMEOUT_SECONDS,
+                default_max_age=settings.GOOGLE_CERTS_DEFAULT_MAX_AGE_SECONDS,
+                refresh_margin=settings.GOOGLE_CERTS_REFRESH_MARGIN_SECONDS,
+                min_refresh_interval=settings.GOOGLE_CERTS_MIN_REFRESH_INTERVAL_SECONDS,
+            )
+        return _cert_cache
+
+
+def verify_google_id_token(token: str) -> dict:
+    """
+    Verifies a Google ID token without fetching Google's certificates on every call.
+    """
+    return get_google_cert_cache().verify(token)
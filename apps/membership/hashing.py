@@ -0,0 +1,166 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+from .exceptions import PasswordHashingBusyException
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """
+    Argon2id with the minimum parameters recommended by OWASP (19 MiB, 2 passes, 1 lane).
+
+    Django's defaults (100 MiB, 8 lanes) cost several times more CPU and memory per login, which a small
+    container pays for every concurrent login; these are still far more expensive to brute force than PBKDF2.
+    """
+
+    time_cost = 2
+    memory_cost = 19 * 1024
+    parallelism = 1
+
+
+class PasswordHashingPool:
+    """
+    Runs password hashing and verification in a bounded thread pool.
+
+    PBKDF2 and Argon2 release the GIL, so a worker thread hashes while the request threads, or the event
+    loop under ASGI, keep serving other requests. At most `max_workers` passwords are hashed at once and
+    `max_queue` more wait for a worker; a request finding the queue full for `queue_timeout` seconds is
+    rejected with `PasswordHashingBusyException` rather than piling up.
+
+    `run` still blocks its caller until the hash is done, so a sync gunicorn worker is held for the whole
+    hash as before: only the bound on concurrent hashing and the 503 under overload apply there. Serve
+    with threaded (gthread) or ASGI workers for logins to stop starving the other requests.
+
+    Args:
+      max_workers (int): Passwords hashed at the same time.
+      max_queue (int): Hashing requests allowed to wait for a worker.
+      queue_timeout (float): Seconds to wait for a place in the queue.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, queue_timeout: float) -> None:
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.queued = 0
+        self.active = 0
+        self.max_queued = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix='password-hashing')
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+
+    def _acquire(self) -> None:
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHashingBusyException
+
+    def _start(self, func: Callable, *args) -> Future:
+        enqueued_at = time.monotonic()
+        with self._lock:
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+
+        def run() -> Any:
+            with self._lock:
+                self.queued -= 1
+                self.active += 1
+                self.wait_seconds += time.monotonic() - enqueued_at
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self.active -= 1
+                    self.completed += 1
+                self._slots.release()
+
+        return self._executor.submit(run)
+
+    def run(self, func: Callable, *args) -> Any:
+        """
+        Calls `func(*args)` on a worker and waits for the result.
+        """
+        self._acquire()
+        return self._start(func, *args).result()
+
+    async def arun(self, func: Callable, *args) -> Any:
+        """
+        Awaitable `run`; waiting for a place in a full queue happens off the event loop.
+        """
+        if not self._slots.acquire(blocking=False):
+            await asyncio.to_thread(self._acquire)
+        return await asyncio.wrap_future(self._start(func, *args))
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                'workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'queued': self.queued,
+                'active': self.active,
+                'max_queued': self.max_queued,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'average_wait_ms': self.wait_seconds / self.completed * 1000 if self.completed else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+_pool: Optional[PasswordHashingPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_password_hashing_pool() -> Optional[PasswordHashingPool]:
+    """
+    The process-wide hashing pool, or None when `PASSWORD_HASHING_POOL_ENABLED` is off.
+    """
+    global _pool
+    if not settings.PASSWORD_HASHING_POOL_ENABLED:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = PasswordHashingPool(
+                max_workers=settings.PASSWORD_HASHING_WORKERS,
+                max_queue=settings.PASSWORD_HASHING_MAX_QUEUE,
+                queue_timeout=settings.PASSWORD_HASHING_QUEUE_TIMEOUT_SECONDS,
+            )
+        return _pool
+
+
+def run_hashing(func: Callable, *args) -> Any:
+    pool = get_password_hashing_pool()
+    return pool.run(func, *args) if pool else func(*args)
+
+
+async def arun_hashing(func: Callable, *args) -> Any:
+    pool = get_password_hashing_pool()
+    return await pool.arun(func, *args) if pool else await asyncio.to_thread(func, *args)
+
+
+def make_password(raw_password: Optional[str]) -> str:
+    return run_hashing(hashers.make_password, raw_password)
+
+
+def verify_password(raw_password: Optional[str], encoded: str) -> tuple[bool, bool]:
+    """
+    Returns whether the password matches the encoded hash and whether the hash should be regenerated,
+    i.e. it was made with another hasher than the first of `PASSWORD_HASHERS` or with other parameters.
+    """
+    return run_hashing(hashers.verify_password, raw_password, encoded)
+
+
+async def amake_password(raw_password: Optional[str]) -> str:
+    return await arun_hashing(hashers.make_password, raw_password)
+
+
+async def averify_password(raw_password: Optional[str], encoded: str) -> tuple[bool, bool]:
+    return await arun_hashing(hashers.verify_password, raw_password, encoded)
@@ -0,0 +1,89 @@
+import hashlib
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+CACHE_KEY_PREFIX = 'login-lockout'
+
+
+def _window_seconds() -> int:
+    return settings.LOGIN_ATTEMPTS_TIMEOUT_MINUTES * 60
+
+
+def _identities(ip: Optional[str], username: Optional[str]) -> list[str]:
+    """
+    Cache key parts of every identity a failed login is counted against: the client IP and the username.
+    """
+    identities = []
+    if ip:
+        identities.append(f'ip:{ip}')
+    if username:
+        # Hashed, so any username is a valid cache key.
+        identities.append(f'username:{hashlib.sha256(username.casefold().encode()).hexdigest()}')
+    return identities
+
+
+def _bucket_key(identity: str, bucket: int) -> str:
+    return f'{CACHE_KEY_PREFIX}:{identity}:{bucket}'
+
+
+def get_failed_login_counts(
+    ip: Optional[str], username: Optional[str], now: Optional[float] = None
+) -> dict[str, float]:
+    """
+    Failed logins per identity within the sliding window of `LOGIN_ATTEMPTS_TIMEOUT_MINUTES`.
+
+    The window is approximated with two fixed buckets: the current one counts in full and the previous
+    one in proportion to how much of it still overlaps the window. All buckets are read with one
+    `get_many` call, so checking a login costs a single cache round trip and no database queries.
+
+    Args:
+      ip (str, optional): The client IP address.
+      username (str, optional): The username used to log in.
+      now (float, optional): Current UNIX time, used by tests.
+
+    Returns:
+      dict: Estimated number of failed logins for each identity.
+    """
+    now = time.time() if now is None else now
+    window = _window_seconds()
+    bucket, elapsed = divmod(now, window)
+    bucket = int(bucket)
+
+    identities = _identities(ip, username)
+    keys = {identity: (_bucket_key(identity, bucket), _bucket_key(identity, bucket - 1)) for identity in identities}
+    values = cache.get_many([key for pair in keys.values() for key in pair])
+    previous_weight = 1 - elapsed / window
+    return {
+        identity: values.get(current_key, 0) + values.get(previous_key, 0) * previous_weight
+        for identity, (current_key, previous_key) in keys.items()
+    }
+
+
+def is_locked_out(ip: Optional[str], username: Optional[str], now: Optional[float] = None) -> bool:
+    """
+    Whether the IP or the username reached `MAX_LOGIN_ATTEMPTS` failed logins within the window.
+    """
+    counts = get_failed_login_counts(ip, username, now=now)
+    return any(count >= settings.MAX_LOGIN_ATTEMPTS for count in counts.values())
+
+
+def register_failed_login(ip: Optional[str], username: Optional[str], now: Optional[float] = None) -> None:
+    """
+    Atomically counts a failed login for the IP and the username in the current bucket.
+
+    A bucket lives for two windows, long enough to be read as the previous one.
+    """
+    now = time.time() if now is None else now
+    window = _window_seconds()
+    bucket = int(now // window)
+    for identity in _identities(ip, username):
+        key = _bucket_key(identity, bucket)
+        cache.add(key, 0, timeout=2 * window)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # The bucket expired between `add` and `incr`.
+            cache.add(key, 1, timeout=2 * window)
@@ -0,0 +1,149 @@
+import atexit
+import logging
+import os
+import threading
+from collections import deque
+from typing import Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .login_details import resolve_login_attempt_details
+from .models import LoginAttempt
+
+logger = logging.getLogger(__name__)
+
+
+class LoginAttemptBuffer:
+    """
+    Write-behind buffer of `LoginAttempt` objects with their final outcome.
+
+    Logins only append to an in-process queue; a daemon thread saves the queue with `bulk_create`
+    every `flush_interval` seconds, or as soon as `batch_size` attempts are waiting. When the queue
+    holds `max_size` attempts the oldest ones are dropped. With `flush_on_shutdown` the remaining
+    attempts are saved when the interpreter exits; otherwise they are lost with the process.
+    """
+
+    def __init__(
+        self, batch_size: int = 100, flush_interval: float = 5, max_size: int = 10000, flush_on_shutdown: bool = True
+    ) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.flush_on_shutdown = flush_on_shutdown
+        self._queue: deque = deque(maxlen=max_size)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def add(self, login_attempt: LoginAttempt) -> None:
+        with self._lock:
+            if len(self._queue) == self._queue.maxlen:
+                self.dropped += 1
+                logger.warning('Login attempt buffer is full, dropping the oldest attempt.')
+            self._queue.append(login_attempt)
+            self._ensure_started()
+            if len(self._queue) >= self.batch_size:
+                self._wakeup.set()
+
+    def _ensure_started(self) -> None:
+        # A forked worker inherits the queue but not the thread, so the flusher is started per process.
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name='login-attempt-flusher', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if self._stopped.is_set():
+                return
+            close_old_connections()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Could not save buffered login attempts.')
+
+    def _take_batch(self) -> list:
+        with self._lock:
+            return [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+
+    def _write(self, batch: list) -> None:
+        resolve_login_attempt_details(batch)
+        LoginAttempt.objects.bulk_create(batch)
+
+    def flush(self) -> int:
+        """
+        Saves every buffered attempt in batches of `batch_size`.
+
+        A batch that cannot be saved is put back at the front of the queue and the error is raised.
+
+        Returns:
+          int: Number of saved attempts.
+        """
+        saved = 0
+        with self._flush_lock:
+            while batch := self._take_batch():
+                try:
+                    self._write(batch)
+                except Exception:
+                    with self._lock:
+                        self._queue.extendleft(reversed(batch))
+                    raise
+                saved += len(batch)
+        return saved
+
+    def close(self) -> None:
+        """
+        Stops the flusher thread and, with `flush_on_shutdown`, saves what is left in the queue.
+        """
+        atexit.unregister(self.close)
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.flush_interval)
+        self._thread = None
+        if self.flush_on_shutdown:
+            self.flush()
+        else:
+            with self._lock:
+                self._queue.clear()
+
+
+_buffer: Optional[LoginAttemptBuffer] = None
+_buffer_lock = threading.Lock()
+
+
+def get_login_attempt_buffer() -> LoginAttemptBuffer:
+    global _buffer
+    with _buffer_lock:
+        if _buffer is None:
+            _buffer = LoginAttemptBuffer(
+                batch_size=settings.LOGIN_ATTEMPTS_BATCH_SIZE,
+                flush_interval=settings.LOGIN_ATTEMPTS_FLUSH_INTERVAL_SECONDS,
+                max_size=settings.LOGIN_ATTEMPTS_MAX_BUFFER_SIZE,
+                flush_on_shutdown=settings.LOGIN_ATTEMPTS_FLUSH_ON_SHUTDOWN,
+            )
+        return _buffer
+
+
+def record_login_attempt(login_attempt: LoginAttempt) -> None:
+    """
+    Saves a login attempt once its outcome is known: buffered when `LOGIN_ATTEMPTS_WRITE_BEHIND`
+    is enabled, immediately otherwise.
+    """
+    if settings.LOGIN_ATTEMPTS_WRITE_BEHIND:
+        get_login_attempt_buffer().add(login_attempt)
+    else:
+        resolve_login_attempt_details([login_attempt])
+        login_attempt.save()
@@ -0,0 +1,97 @@
+from functools import partial, reduce
+from operator import or_
+from typing import Iterable, Optional
+
+from django.db import transaction
+from django.db.models import Model, Q
+
+from apps.utils.cache import LRUCache
+from .models import GeoLocation, LoginAttempt, UserAgent
+
+GEO_LOCATION_KEY_FIELDS = ('country_code', 'region', 'city')
+USER_AGENT_KEY_FIELDS = ('browser_family', 'browser_version', 'os_family', 'os_version')
+
+# Lookup rows are never updated, so their ids can be remembered for the lifetime of the process.
+lookup_id_cache = LRUCache(max_size=10000)
+
+
+def get_geo_location_values(geo_data: Optional[dict]) -> Optional[dict]:
+    """
+    Returns the `GeoLocation` field values of a GeoIP2 city lookup, or None when the lookup failed.
+    """
+    if not geo_data or 'errors' in geo_data:
+        return None
+    return {
+        'country_code': geo_data.get('country_code') or '',
+        'country': geo_data.get('country_name') or '',
+        'region': geo_data.get('region') or '',
+        'city': geo_data.get('city') or '',
+        'latitude': geo_data.get('latitude'),
+        'longitude': geo_data.get('longitude'),
+    }
+
+
+def get_user_agent_values(device_info: Optional[dict]) -> Optional[dict]:
+    """
+    Returns the `UserAgent` field values of `get_device_info` output.
+    """
+    if not device_info:
+        return None
+    os = device_info.get('os') or {}
+    browser = device_info.get('browser') or {}
+    return {
+        'browser_family': browser.get('family') or '',
+        'browser_version': browser.get('browser_version') or '',
+        'os_family': os.get('family') or '',
+        'os_version': os.get('os_version') or '',
+    }
+
+
+def resolve_lookup_ids(model: type[Model], key_fields: tuple, values: list[Optional[dict]]) -> list[Optional[int]]:
+    """
+    Returns the ids of the lookup rows matching `values`, creating the missing ones.
+
+    Rows not remembered in `lookup_id_cache` cost one `bulk_create(ignore_conflicts=True)`
+    and one `SELECT` for the whole list, whatever its length.
+    """
+    keys = [None if row is None else tuple(row[field] for field in key_fields) for row in values]
+    ids = {}
+    missing = {}
+    for key, row in zip(keys, values):
+        if key is None or key in ids or key in missing:
+            continue
+        cached_id = lookup_id_cache.get((model._meta.label, key))
+        if cached_id is None:
+            missing[key] = row
+        else:
+            ids[key] = cached_id
+
+    if missing:
+        model.objects.bulk_create([model(**row) for row in missing.values()], ignore_conflicts=True)
+        condition = reduce(or_, (Q(**dict(zip(key_fields, key))) for key in missing))
+        for pk, *key in model.objects.filter(condition).values_list('pk', *key_fields):
+            ids[tuple(key)] = pk
+            # Remembered only once committed, so a rolled back row is never reused.
+            transaction.on_commit(partial(lookup_id_cache.set, (model._meta.label, tuple(key)), pk))
+
+    return [None if key is None else ids.get(key) for key in keys]
+
+
+def resolve_login_attempt_details(login_attempts: Iterable[LoginAttempt]) -> None:
+    """
+    Points unsaved login attempts at the deduplicated `GeoLocation` and `UserAgent` rows
+    of their `geo_data` and `device_info`.
+    """
+    login_attempts = [attempt for attempt in login_attempts if attempt.geo_data or attempt.device_info]
+    if not login_attempts:
+        return
+
+    geo_location_ids = resolve_lookup_ids(
+        GeoLocation, GEO_LOCATION_KEY_FIELDS, [get_geo_location_values(attempt.geo_data) for attempt in login_attempts]
+    )
+    user_agent_ids = resolve_lookup_ids(
+        UserAgent, USER_AGENT_KEY_FIELDS, [get_user_agent_values(attempt.device_info) for attempt in login_attempts]
+    )
+    for attempt, geo_location_id, user_agent_id in zip(login_attempts, geo_location_ids, user_agent_ids):
+        attempt.geo_location_id = geo_location_id
+        attempt.user_agent_id = user_agent_id
@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from apps.membership import partitions
+
+
+class Command(BaseCommand):
+    help = (
+        'Converts the login attempts table into a table partitioned by month of attempted_at (PostgreSQL only), '
+        'or back into a regular table with --revert. The rows are copied, so run it in a maintenance window. '
+        'Revert it before unapplying membership migration 0005_loginattempt_attempted_at_index or earlier.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months-ahead', type=int, default=settings.LOGIN_ATTEMPTS_PARTITIONS_AHEAD)
+        parser.add_argument('--revert', action='store_true')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Partitioning the login attempts needs PostgreSQL.')
+
+        partitioned = partitions.is_partitioned(connection)
+        if options['revert']:
+            if not partitioned:
+                self.stdout.write('The login attempts table is not partitioned')
+                return
+            with transaction.atomic():
+                partitions.unpartition_table(connection=connection)
+            self.stdout.write(self.style.SUCCESS('The login attempts table is no longer partitioned'))
+            return
+
+        if partitioned:
+            self.stdout.write('The login attempts table is already partitioned')
+            return
+        with transaction.atomic():
+            partitions.partition_table(options['months_ahead'], connection=connection)
+        self.stdout.write(self.style.SUCCESS('The login attempts table is partitioned by month'))
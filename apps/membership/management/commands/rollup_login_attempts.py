@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from apps.membership.rollups import backfill_rollups, refresh_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        'Refreshes the hourly and daily login attempt rollups. With --backfill, recomputes the history '
+        'in chunks of --chunk-days days.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--backfill', action='store_true')
+        parser.add_argument('--date-from', help='ISO datetime. Defaults to the oldest login attempt.')
+        parser.add_argument('--date-to', help='ISO datetime. Defaults to now.')
+        parser.add_argument('--chunk-days', type=int, default=1)
+
+    def handle(self, *args, **options):
+        if options['backfill']:
+            saved = backfill_rollups(
+                self.parse_date(options['date_from']),
+                self.parse_date(options['date_to']),
+                chunk_days=options['chunk_days'],
+            )
+        else:
+            saved = refresh_rollups()
+        self.stdout.write(self.style.SUCCESS(f'Saved {saved} login attempt rollups'))
+
+    @staticmethod
+    def parse_date(value):
+        if value is None:
+            return None
+        parsed = parse_datetime(value)
+        if parsed is None:
+            raise CommandError(f'Invalid datetime: {value}')
+        return parsed
@@ -0,0 +1,42 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.membership import partitions
+
+
+class Command(BaseCommand):
+    help = (
+        'Drops login attempts older than LOGIN_ATTEMPTS_RETENTION_DAYS. A partitioned table gets its future '
+        'monthly partitions created and its expired ones detached and dropped; any other table is purged '
+        'with batched deletes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retention-days', type=int, default=settings.LOGIN_ATTEMPTS_RETENTION_DAYS)
+        parser.add_argument('--months-ahead', type=int, default=settings.LOGIN_ATTEMPTS_PARTITIONS_AHEAD)
+        parser.add_argument('--batch-size', type=int, default=settings.LOGIN_ATTEMPTS_DELETE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        cutoff = now - timedelta(days=options['retention_days'])
+
+        if not partitions.is_partitioned(connection):
+            deleted = partitions.delete_before(cutoff, options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} login attempts older than {cutoff:%Y-%m-%d}'))
+            return
+
+        with transaction.atomic():
+            current_month = partitions.month_start(now.date())
+            created = partitions.create_partitions(
+                current_month, partitions.add_months(current_month, options['months_ahead']), connection
+            )
+            dropped = partitions.drop_partitions_before(cutoff, connection)
+        for name in created:
+            self.stdout.write(f'Created partition {name}')
+        for name in dropped:
+            self.stdout.write(f'Dropped partition {name}')
+        self.stdout.write(self.style.SUCCESS(f'Created {len(created)} and dropped {len(dropped)} partitions'))
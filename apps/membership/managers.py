@@ -1,8 +1,25 @@
 from django.contrib.auth.base_user import BaseUserManager
 from django.utils.translation import gettext as _
 
+from apps.utils.managers import ActiveManager, ActiveQuerySet
+from .user_cache import invalidate_cached_user
 
-class UserManager(BaseUserManager):
+
+class UserQuerySet(ActiveQuerySet):
+    """
+    `update()` sends no `post_save`, so the cached users are invalidated here. Their ids are read
+    with a SELECT before the UPDATE, i.e. every bulk operation on users costs two queries.
+    """
+
+    def update(self, **kwargs) -> int:
+        user_ids = list(self.values_list('pk', flat=True))
+        updated = super().update(**kwargs)
+        for user_id in user_ids:
+            invalidate_cached_user(user_id)
+        return updated
+
+
+class UserManager(BaseUserManager, ActiveManager.from_queryset(UserQuerySet)):
     def create_user(self, email, password=None, **extra_fields):
         if not email:
             raise ValueError(_('The Email field must be set'))
@@ -23,10 +40,10 @@ class UserManager(BaseUserManager):
         """
         Returns a queryset of all active users.
         """
-        return self.filter(is_active=True)
+        return self.active()
 
     def get_inactive_users(self):
         """
         Returns a queryset of all inactive users.
         """
-        return self.filter(is_active=False)
+        return self.inactive()
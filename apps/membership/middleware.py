@@ -0,0 +1,21 @@
+from django.http import HttpResponse
+
+from .exceptions import PasswordHashingBusyException
+
+
+class PasswordHashingBusyMiddleware:
+    """
+    Answers `PasswordHashingBusyException` with 503 outside the API views, which DRF handles itself:
+    the login and registration forms, the admin login, ModelBackend's dummy hash for unknown users, ...
+    """
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_exception(self, request, exception):
+        if not isinstance(exception, PasswordHashingBusyException):
+            return None
+        return HttpResponse(str(exception.detail), status=exception.status_code, content_type='text/plain')
@@ -0,0 +1,94 @@
+# Generated by Django 5.0.7 on 2026-10-18 12:52
+
+import django.db.models.deletion
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('membership', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserAgent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                (
+                    'browser_family',
+                    models.CharField(blank=True, db_index=True, max_length=100, verbose_name='browser family'),
+                ),
+                ('browser_version', models.CharField(blank=True, max_length=50, verbose_name='browser version')),
+                ('os_family', models.CharField(blank=True, max_length=100, verbose_name='operating system family')),
+                ('os_version', models.CharField(blank=True, max_length=50, verbose_name='operating system version')),
+            ],
+            options={
+                'verbose_name': 'user agent',
+                'verbose_name_plural': 'user agents',
+            },
+        ),
+        migrations.CreateModel(
+            name='GeoLocation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('country_code', models.CharField(blank=True, max_length=2, verbose_name='country code')),
+                ('country', models.CharField(blank=True, max_length=100, verbose_name='country')),
+                ('region', models.CharField(blank=True, max_length=100, verbose_name='region')),
+                ('city', models.CharField(blank=True, db_index=True, max_length=100, verbose_name='city')),
+                ('latitude', models.FloatField(blank=True, null=True, verbose_name='latitude')),
+                ('longitude', models.FloatField(blank=True, null=True, verbose_name='longitude')),
+            ],
+            options={
+                'verbose_name': 'geolocation',
+                'verbose_name_plural': 'geolocations',
+                'indexes': [
+                    models.Index(django.db.models.functions.text.Upper('city'), name='membership_geo_city_up_idx')
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='geolocation',
+            constraint=models.UniqueConstraint(
+                fields=('country_code', 'region', 'city'), name='membership_geolocation_unique'
+            ),
+        ),
+        migrations.AddField(
+            model_name='loginattempt',
+            name='geo_location',
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name='login_attempts',
+                to='membership.geolocation',
+                verbose_name='geolocation',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='useragent',
+            index=models.Index(
+                django.db.models.functions.text.Upper('browser_family'), name='membership_ua_browser_up_idx'
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name='useragent',
+            constraint=models.UniqueConstraint(
+                fields=('browser_family', 'browser_version', 'os_family', 'os_version'),
+                name='membership_useragent_unique',
+            ),
+        ),
+        migrations.AddField(
+            model_name='loginattempt',
+            name='user_agent',
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name='login_attempts',
+                to='membership.useragent',
+                verbose_name='browser',
+            ),
+        ),
+    ]
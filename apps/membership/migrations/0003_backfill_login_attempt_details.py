@@ -0,0 +1,147 @@
+# Generated by Django 5.0.7 on 2026-10-18 12:52
+
+import ast
+from functools import reduce
+from operator import or_
+
+from django.db import migrations, transaction
+from django.db.models import Q
+
+BATCH_SIZE = 2000
+
+GEO_LOCATION_KEY_FIELDS = ('country_code', 'region', 'city')
+USER_AGENT_KEY_FIELDS = ('browser_family', 'browser_version', 'os_family', 'os_version')
+
+
+def get_geo_location_values(geolocation):
+    if not isinstance(geolocation, dict) or not geolocation or 'errors' in geolocation:
+        return None
+    return {
+        'country_code': geolocation.get('country_code') or '',
+        'country': geolocation.get('country_name') or '',
+        'region': geolocation.get('region') or '',
+        'city': geolocation.get('city') or '',
+        'latitude': geolocation.get('latitude'),
+        'longitude': geolocation.get('longitude'),
+    }
+
+
+def get_user_agent_values(browser):
+    # `browser` holds the `str()` of the device info dict.
+    try:
+        device_info = ast.literal_eval(browser) if browser else None
+    except (ValueError, SyntaxError):
+        device_info = None
+    if not isinstance(device_info, dict):
+        return None
+    os = device_info.get('os') or {}
+    browser = device_info.get('browser') or {}
+    return {
+        'browser_family': browser.get('family') or '',
+        'browser_version': browser.get('browser_version') or '',
+        'os_family': os.get('family') or '',
+        'os_version': os.get('os_version') or '',
+    }
+
+
+def resolve_ids(model, key_fields, values, known_ids):
+    keys = [None if row is None else tuple(row[field] for field in key_fields) for row in values]
+    missing = {key: row for key, row in zip(keys, values) if key is not None and key not in known_ids}
+    if missing:
+        model.objects.bulk_create([model(**row) for row in missing.values()], ignore_conflicts=True)
+        condition = reduce(or_, (Q(**dict(zip(key_fields, key))) for key in missing))
+        for pk, *key in model.objects.filter(condition).values_list('pk', *key_fields):
+            known_ids[tuple(key)] = pk
+    return [None if key is None else known_ids.get(key) for key in keys]
+
+
+def backfill_login_attempt_details(apps, schema_editor):
+    LoginAttempt = apps.get_model('membership', 'LoginAttempt')
+    GeoLocation = apps.get_model('membership', 'GeoLocation')
+    UserAgent = apps.get_model('membership', 'UserAgent')
+
+    geo_location_ids = {}
+    user_agent_ids = {}
+    last_id = 0
+    while True:
+        # Every batch is committed separately, so a large table is not rewritten in one transaction.
+        with transaction.atomic():
+            attempts = list(
+                LoginAttempt.objects.filter(pk__gt=last_id)
+                .order_by('pk')
+                .only('pk', 'browser', 'geolocation')[:BATCH_SIZE]
+            )
+            if not attempts:
+                return
+
+            geo_ids = resolve_ids(
+                GeoLocation,
+                GEO_LOCATION_KEY_FIELDS,
+                [get_geo_location_values(attempt.geolocation) for attempt in attempts],
+                geo_location_ids,
+            )
+            agent_ids = resolve_ids(
+                UserAgent,
+                USER_AGENT_KEY_FIELDS,
+                [get_user_agent_values(attempt.browser) for attempt in attempts],
+                user_agent_ids,
+            )
+            for attempt, geo_location_id, user_agent_id in zip(attempts, geo_ids, agent_ids):
+                attempt.geo_location_id = geo_location_id
+                attempt.user_agent_id = user_agent_id
+            LoginAttempt.objects.bulk_update(attempts, ['geo_location', 'user_agent'])
+        last_id = attempts[-1].pk
+
+
+def restore_login_attempt_details(apps, schema_editor):
+    LoginAttempt = apps.get_model('membership', 'LoginAttempt')
+
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            attempts = list(
+                LoginAttempt.objects.filter(pk__gt=last_id)
+                .select_related('geo_location', 'user_agent')
+                .order_by('pk')[:BATCH_SIZE]
+            )
+            if not attempts:
+                return
+
+            for attempt in attempts:
+                if attempt.geo_location is not None:
+                    attempt.geolocation = {
+                        'country_code': attempt.geo_location.country_code,
+                        'country_name': attempt.geo_location.country,
+                        'region': attempt.geo_location.region,
+                        'city': attempt.geo_location.city,
+                        'latitude': attempt.geo_location.latitude,
+                        'longitude': attempt.geo_location.longitude,
+                    }
+                if attempt.user_agent is not None:
+                    attempt.browser = str(
+                        {
+                            'os': {
+                                'family': attempt.user_agent.os_family,
+                                'os_version': attempt.user_agent.os_version,
+                            },
+                            'browser': {
+                                'family': attempt.user_agent.browser_family,
+                                'browser_version': attempt.user_agent.browser_version,
+                            },
+                        }
+                    )
+            LoginAttempt.objects.bulk_update(attempts, ['geolocation', 'browser'])
+        last_id = attempts[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('membership', '0002_login_attempt_details'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_login_attempt_details, restore_login_attempt_details),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.7 on 2026-10-18 12:52
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('membership', '0003_backfill_login_attempt_details'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='loginattempt',
+            name='browser',
+        ),
+        migrations.RemoveField(
+            model_name='loginattempt',
+            name='geolocation',
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.7 on 2026-10-18 12:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('membership', '0004_remove_loginattempt_browser_geolocation'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='loginattempt',
+            index=models.Index(fields=['attempted_at'], name='membership_attempted_at_idx'),
+        ),
+    ]
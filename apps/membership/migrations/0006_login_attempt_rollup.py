@@ -0,0 +1,40 @@
+# Generated by Django 5.0.7 on 2026-10-18 12:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('membership', '0005_loginattempt_attempted_at_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LoginAttemptRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                (
+                    'granularity',
+                    models.CharField(
+                        choices=[('hour', 'godzina'), ('day', 'day')], max_length=4, verbose_name='granularity'
+                    ),
+                ),
+                ('period_start', models.DateTimeField(verbose_name='period start')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='attempts')),
+                ('successes', models.PositiveIntegerField(default=0, verbose_name='successful logins')),
+                ('failures', models.PositiveIntegerField(default=0, verbose_name='failed logins')),
+                ('unique_ips', models.PositiveIntegerField(default=0, verbose_name='unique IP addresses')),
+                ('top_cities', models.JSONField(blank=True, default=list, verbose_name='top cities')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'login attempt rollup',
+                'verbose_name_plural': 'login attempt rollups',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='loginattemptrollup',
+            constraint=models.UniqueConstraint(fields=('granularity', 'period_start'), name='membership_rollup_unique'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.0.7 on 2026-10-18 13:07
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('membership', '0006_login_attempt_rollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboundEmail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('subject', models.CharField(max_length=255, verbose_name='subject')),
+                ('from_email', models.CharField(blank=True, max_length=254, verbose_name='sender')),
+                ('to', models.JSONField(default=list, verbose_name='recipients')),
+                ('body', models.TextField(blank=True, verbose_name='plain text body')),
+                ('template_name', models.CharField(blank=True, max_length=255, verbose_name='HTML template')),
+                ('context', models.JSONField(blank=True, default=dict, verbose_name='template context')),
+                (
+                    'status',
+                    models.CharField(
+                        choices=[('pending', 'pending'), ('sent', 'wysłano'), ('dead', 'dead')],
+                        default='pending',
+                        max_length=7,
+                        verbose_name='status',
+                    ),
+                ),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='attempts')),
+                (
+                    'next_attempt_at',
+                    models.DateTimeField(default=django.utils.timezone.now, verbose_name='next attempt'),
+                ),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='sent at')),
+                ('last_error', models.TextField(blank=True, verbose_name='last error')),
+            ],
+            options={
+                'verbose_name': 'outbound email',
+                'verbose_name_plural': 'outbound emails',
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='membership_outbox_due_idx')],
+            },
+        ),
+    ]
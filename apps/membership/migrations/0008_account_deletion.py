@@ -0,0 +1,47 @@
+# Generated by Django 5.0.7 on 2026-10-18 13:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('membership', '0007_outbound_email'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccountDeletion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user_id', models.BigIntegerField(db_index=True, verbose_name='user ID')),
+                ('email', models.EmailField(max_length=254, verbose_name='e-mail')),
+                (
+                    'status',
+                    models.CharField(
+                        choices=[
+                            ('pending', 'pending'),
+                            ('running', 'running'),
+                            ('done', 'done'),
+                            ('failed', 'failed'),
+                        ],
+                        default='pending',
+                        max_length=7,
+                        verbose_name='status',
+                    ),
+                ),
+                ('step', models.CharField(blank=True, max_length=255, verbose_name='current step')),
+                ('progress', models.JSONField(blank=True, default=dict, verbose_name='progress')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='attempts')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='finished at')),
+                ('last_error', models.TextField(blank=True, verbose_name='last error')),
+            ],
+            options={
+                'verbose_name': 'account deletion',
+                'verbose_name_plural': 'account deletions',
+                'indexes': [models.Index(fields=['status', 'updated_at'], name='membership_deletion_due_idx')],
+            },
+        ),
+    ]
@@ -1,13 +1,17 @@
+from typing import Optional
+
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from django.db import models
-from django.db.models import JSONField
+from django.db.models.functions import Upper
+from django.utils import timezone
 from django.utils.translation import gettext as _
 
+from apps.membership import hashing
 from apps.membership.managers import UserManager
-from apps.utils.models import ActiveMixin, TimeStampMixin
+from apps.utils.models import ActiveMixin, DirtyFieldsMixin, TimeStampMixin
 
 
-class User(AbstractBaseUser, PermissionsMixin, TimeStampMixin, ActiveMixin):
+class User(AbstractBaseUser, PermissionsMixin, TimeStampMixin, ActiveMixin, DirtyFieldsMixin):
     """
     A user model using email as the username.
     """
@@ -39,14 +43,145 @@ class User(AbstractBaseUser, PermissionsMixin, TimeStampMixin, ActiveMixin):
     def __str__(self):
         return self.email
 
+    # Hashing runs in the pool of `apps.membership.hashing`, so a burst of logins cannot take every worker.
+
+    def set_password(self, raw_password):
+        self.password = hashing.make_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        is_correct, must_update = hashing.verify_password(raw_password, self.password)
+        if is_correct and must_update:
+            self.set_password(raw_password)
+            # Password hash upgrades shouldn't be considered password changes.
+            self._password = None
+            self.save(update_fields=['password'])
+        return is_correct
+
+    async def acheck_password(self, raw_password):
+        is_correct, must_update = await hashing.averify_password(raw_password, self.password)
+        if is_correct and must_update:
+            self.password = await hashing.amake_password(raw_password)
+            await self.asave(update_fields=['password'])
+        return is_correct
+
     class Meta:
         verbose_name = _('user')
         verbose_name_plural = _('users')
 
 
+class GeoLocation(models.Model):
+    """
+    A deduplicated location resolved from an IP address, shared by all login attempts made from it.
+    """
+
+    country_code = models.CharField(
+        max_length=2,
+        blank=True,
+        verbose_name=_('country code'),
+    )
+    country = models.CharField(
+        max_length=100,
+        blank=True,
+        verbose_name=_('country'),
+    )
+    region = models.CharField(
+        max_length=100,
+        blank=True,
+        verbose_name=_('region'),
+    )
+    city = models.CharField(
+        max_length=100,
+        blank=True,
+        db_index=True,
+        verbose_name=_('city'),
+    )
+    latitude = models.FloatField(
+        blank=True,
+        null=True,
+        verbose_name=_('latitude'),
+    )
+    longitude = models.FloatField(
+        blank=True,
+        null=True,
+        verbose_name=_('longitude'),
+    )
+
+    def __str__(self):
+        return ', '.join(part for part in (self.city, self.country or self.country_code) if part)
+
+    class Meta:
+        verbose_name = _('geolocation')
+        verbose_name_plural = _('geolocations')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['country_code', 'region', 'city'],
+                name='membership_geolocation_unique',
+            ),
+        ]
+        indexes = [
+            models.Index(
+                Upper('city'),
+                name='membership_geo_city_up_idx',
+            ),
+        ]
+
+
+class UserAgent(models.Model):
+    """
+    A deduplicated browser and operating system combination, shared by all login attempts made with it.
+    """
+
+    browser_family = models.CharField(
+        max_length=100,
+        blank=True,
+        db_index=True,
+        verbose_name=_('browser family'),
+    )
+    browser_version = models.CharField(
+        max_length=50,
+        blank=True,
+        verbose_name=_('browser version'),
+    )
+    os_family = models.CharField(
+        max_length=100,
+        blank=True,
+        verbose_name=_('operating system family'),
+    )
+    os_version = models.CharField(
+        max_length=50,
+        blank=True,
+        verbose_name=_('operating system version'),
+    )
+
+    def __str__(self):
+        browser = f'{self.browser_family} {self.browser_version}'.strip()
+        os = f'{self.os_family} {self.os_version}'.strip()
+        return f'{browser} ({os})' if os else browser
+
+    class Meta:
+        verbose_name = _('user agent')
+        verbose_name_plural = _('user agents')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['browser_family', 'browser_version', 'os_family', 'os_version'],
+                name='membership_useragent_unique',
+            ),
+        ]
+        indexes = [
+            models.Index(
+                Upper('browser_family'),
+                name='membership_ua_browser_up_idx',
+            ),
+        ]
+
+
 class LoginAttempt(TimeStampMixin):
     """
     A model representing a user's login attempt.
+
+    The raw `geo_data` and `device_info` of an unsaved attempt are turned into `geo_location`
+    and `user_agent` references when it is recorded (see `apps.membership.login_details`).
     """
 
     user = models.ForeignKey(
@@ -69,9 +204,12 @@ class LoginAttempt(TimeStampMixin):
         default=False,
         verbose_name=_('logged in'),
     )
-    browser = models.CharField(
-        max_length=300,
+    user_agent = models.ForeignKey(
+        UserAgent,
         blank=True,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name='login_attempts',
         verbose_name=_('browser'),
     )
     ip = models.GenericIPAddressField(
@@ -79,15 +217,21 @@ class LoginAttempt(TimeStampMixin):
         null=True,
         verbose_name=_('IP address'),
     )
-    geolocation = JSONField(
-        default={},
+    geo_location = models.ForeignKey(
+        GeoLocation,
         blank=True,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name='login_attempts',
         verbose_name=_('geolocation'),
     )
 
+    geo_data: Optional[dict] = None
+    device_info: Optional[dict] = None
+
     @property
     def city(self):
-        return self.geolocation.get('city', '')
+        return self.geo_location.city if self.geo_location_id else ''
 
     def __str__(self):
         return _('Login attempt by {username}').format(username=self.username)
@@ -95,3 +239,199 @@ class LoginAttempt(TimeStampMixin):
     class Meta:
         verbose_name = _('user login attempt')
         verbose_name_plural = _('user login attempts')
+        indexes = [
+            models.Index(fields=['attempted_at'], name='membership_attempted_at_idx'),
+        ]
+
+
+class LoginAttemptRollup(models.Model):
+    """
+    Login attempt counts of one hour or one day, maintained by `apps.membership.rollups`
+    so that reports do not aggregate the login attempts table.
+    """
+
+    class Granularity(models.TextChoices):
+        HOUR = 'hour', _('hour')
+        DAY = 'day', _('day')
+
+    granularity = models.CharField(
+        max_length=4,
+        choices=Granularity.choices,
+        verbose_name=_('granularity'),
+    )
+    period_start = models.DateTimeField(
+        verbose_name=_('period start'),
+    )
+    attempts = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('attempts'),
+    )
+    successes = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('successful logins'),
+    )
+    failures = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('failed logins'),
+    )
+    unique_ips = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('unique IP addresses'),
+    )
+    top_cities = models.JSONField(
+        default=list,
+        blank=True,
+        verbose_name=_('top cities'),
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+    )
+
+    def __str__(self):
+        return f'{self.get_granularity_display()} {self.period_start:%Y-%m-%d %H:%M}'
+
+    class Meta:
+        verbose_name = _('login attempt rollup')
+        verbose_name_plural = _('login attempt rollups')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['granularity', 'period_start'],
+                name='membership_rollup_unique',
+            ),
+        ]
+
+
+class OutboundEmail(TimeStampMixin):
+    """
+    A queued email, sent by a worker (see `apps.membership.outbox`) instead of during the request.
+
+    The HTML body is rendered from `template_name` and `context` when the email is sent.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', _('pending')
+        SENT = 'sent', _('sent')
+        DEAD = 'dead', _('dead')
+
+    subject = models.CharField(
+        max_length=255,
+        verbose_name=_('subject'),
+    )
+    from_email = models.CharField(
+        max_length=254,
+        blank=True,
+        verbose_name=_('sender'),
+    )
+    to = models.JSONField(
+        default=list,
+        verbose_name=_('recipients'),
+    )
+    body = models.TextField(
+        blank=True,
+        verbose_name=_('plain text body'),
+    )
+    template_name = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name=_('HTML template'),
+    )
+    context = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name=_('template context'),
+    )
+    status = models.CharField(
+        max_length=7,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name=_('status'),
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name=_('attempts'),
+    )
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name=_('next attempt'),
+    )
+    sent_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name=_('sent at'),
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name=_('last error'),
+    )
+
+    def __str__(self):
+        return self.subject
+
+    class Meta:
+        verbose_name = _('outbound email')
+        verbose_name_plural = _('outbound emails')
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='membership_outbox_due_idx'),
+        ]
+
+
+class AccountDeletion(TimeStampMixin):
+    """
+    A requested account deletion, carried out in chunks by a worker (see `apps.membership.account_deletion`).
+
+    The user is deactivated when the deletion is requested. `progress` maps each step to the number of rows
+    it has processed and the total found when it started; a restarted deletion skips the rows already gone.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', _('pending')
+        RUNNING = 'running', _('running')
+        DONE = 'done', _('done')
+        FAILED = 'failed', _('failed')
+
+    user_id = models.BigIntegerField(
+        db_index=True,
+        verbose_name=_('user ID'),
+    )
+    email = models.EmailField(
+        verbose_name=_('e-mail'),
+    )
+    status = models.CharField(
+        max_length=7,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name=_('status'),
+    )
+    step = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name=_('current step'),
+    )
+    progress = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name=_('progress'),
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name=_('attempts'),
+    )
+    finished_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name=_('finished at'),
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name=_('last error'),
+    )
+
+    def __str__(self):
+        return _('Deletion of {email}').format(email=self.email)
+
+    class Meta:
+        verbose_name = _('account deletion')
+        verbose_name_plural = _('account deletions')
+        indexes = [
+            models.Index(fields=['status', 'updated_at'], name='membership_deletion_due_idx'),
+        ]
@@ -0,0 +1,173 @@
+import logging
+import smtplib
+from datetime import timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+from .models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+# Errors after which the SMTP connection cannot be reused; a refused recipient keeps it usable.
+DISCONNECT_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+
+def enqueue_email(
+    subject: str,
+    to: list[str],
+    body: str = '',
+    template_name: str = '',
+    context: Optional[dict] = None,
+    from_email: str = '',
+) -> OutboundEmail:
+    """
+    Queues an email and asks a worker to send it once the current transaction commits.
+
+    Args:
+      subject (str): The subject line.
+      to (list): Recipient addresses.
+      body (str, optional): Plain text body; derived from the HTML body when empty.
+      template_name (str, optional): HTML body template, rendered when the email is sent.
+      context (dict, optional): JSON-serializable template context.
+      from_email (str, optional): Sender; `DEFAULT_FROM_EMAIL` when empty.
+
+    Returns:
+      OutboundEmail: The queued email.
+    """
+    email = OutboundEmail.objects.create(
+        subject=subject,
+        to=list(to),
+        body=body,
+        template_name=template_name,
+        context=context or {},
+        from_email=from_email,
+    )
+    if settings.OUTBOUND_EMAIL_DISPATCH_ON_COMMIT:
+        transaction.on_commit(_dispatch)
+    return email
+
+
+def _dispatch() -> None:
+    from .tasks import send_outbound_emails
+
+    try:
+        send_outbound_emails.delay()
+    except Exception:
+        # The email stays queued and is picked up by the periodic run.
+        logger.exception('Could not dispatch the outbound email task.')
+
+
+def build_message(email: OutboundEmail, connection) -> EmailMultiAlternatives:
+    html = render_to_string(email.template_name, email.context) if email.template_name else ''
+    message = EmailMultiAlternatives(
+        subject=email.subject,
+        body=email.body or strip_tags(html),
+        from_email=email.from_email or None,
+        to=email.to,
+        connection=connection,
+    )
+    if html:
+        message.attach_alternative(html, 'text/html')
+    return message
+
+
+def claim_batch(batch_size: int, now=None) -> list[OutboundEmail]:
+    """
+    Leases up to `batch_size` due emails to the calling worker.
+
+    A leased email is due again after `OUTBOUND_EMAIL_LEASE_SECONDS`, so the emails of a worker that
+    died mid-batch are retried; concurrent workers skip each other's locked rows.
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        emails = list(
+            OutboundEmail.objects.select_for_update(skip_locked=True)
+            .filter(status=OutboundEmail.Status.PENDING, next_attempt_at__lte=now)
+            .order_by('next_attempt_at')[:batch_size]
+        )
+        OutboundEmail.objects.filter(pk__in=[email.pk for email in emails]).update(
+            attempts=F('attempts') + 1,
+            next_attempt_at=now + timedelta(seconds=settings.OUTBOUND_EMAIL_LEASE_SECONDS),
+        )
+    for email in emails:
+        email.attempts += 1
+    return emails
+
+
+def _record_failure(email: OutboundEmail, error: Exception, now) -> None:
+    email.last_error = f'{error.__class__.__name__}: {error}'
+    if email.attempts >= settings.OUTBOUND_EMAIL_MAX_ATTEMPTS:
+        email.status = OutboundEmail.Status.DEAD
+        logger.error('Giving up on outbound email %s after %s attempts: %s', email.pk, email.attempts, error)
+    else:
+        delay = settings.OUTBOUND_EMAIL_RETRY_DELAY_SECONDS * 2 ** (email.attempts - 1)
+        email.next_attempt_at = now + timedelta(seconds=delay)
+    email.save(update_fields=['status', 'next_attempt_at', 'last_error', 'updated_at'])
+
+
+def send_batch(batch_size: int) -> int:
+    """
+    Sends one batch of due emails over a single SMTP connection.
+
+    A failed email is retried with exponential backoff from `OUTBOUND_EMAIL_RETRY_DELAY_SECONDS`;
+    after `OUTBOUND_EMAIL_MAX_ATTEMPTS` attempts it is dead-lettered with the `dead` status.
+
+    Returns:
+      int: Number of claimed emails, 0 when nothing was due.
+    """
+    emails = claim_batch(batch_size)
+    if not emails:
+        return 0
+
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as error:
+        now = timezone.now()
+        for email in emails:
+            _record_failure(email, error, now)
+        return len(emails)
+
+    try:
+        for email in emails:
+            try:
+                connection.send_messages([build_message(email, connection)])
+            except Exception as error:
+                _record_failure(email, error, timezone.now())
+                if isinstance(error, DISCONNECT_ERRORS):
+                    # The rest of the batch gets a fresh connection, or is retried once its lease expires.
+                    connection.close()
+                    try:
+                        connection.open()
+                    except Exception:
+                        logger.exception('Could not reconnect to send outbound emails.')
+                        break
+            else:
+                email.status = OutboundEmail.Status.SENT
+                email.sent_at = timezone.now()
+                email.last_error = ''
+                email.save(update_fields=['status', 'sent_at', 'last_error', 'updated_at'])
+    finally:
+        connection.close()
+    return len(emails)
+
+
+def send_pending_emails(batch_size: Optional[int] = None) -> int:
+    """
+    Sends batches until no email is due.
+
+    Returns:
+      int: Number of emails attempted.
+    """
+    batch_size = batch_size or settings.OUTBOUND_EMAIL_BATCH_SIZE
+    attempted = 0
+    while claimed := send_batch(batch_size):
+        attempted += claimed
+    return attempted
@@ -0,0 +1,253 @@
+import re
+from datetime import date, datetime, timezone
+from typing import Optional
+
+from django.db import connection as default_connection
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+from .models import LoginAttempt
+
+TABLE = 'membership_loginattempt'
+
+PARTITION_NAME_RE = re.compile(rf'^{TABLE}_p(\d{{4}})_(\d{{2}})$')
+
+DEFAULT_PARTITION = f'{TABLE}_default'
+
+ID_SEQUENCE = f'{TABLE}_partitioned_id_seq'
+
+FOREIGN_KEYS = [
+    ('user_id', 'membership_user'),
+    ('user_agent_id', 'membership_useragent'),
+    ('geo_location_id', 'membership_geolocation'),
+]
+
+INDEXES = {
+    'membership_attempted_at_idx': 'attempted_at',
+    f'{TABLE}_user_id_idx': 'user_id',
+    f'{TABLE}_user_agent_id_idx': 'user_agent_id',
+    f'{TABLE}_geo_location_id_idx': 'geo_location_id',
+}
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def get_partition_name(month: date) -> str:
+    return f'{TABLE}_p{month:%Y_%m}'
+
+
+def _bound(month: date) -> str:
+    # Explicit UTC, so the bounds do not depend on the session time zone.
+    return datetime(month.year, month.month, 1, tzinfo=timezone.utc).isoformat()
+
+
+def is_partitioned(connection: BaseDatabaseWrapper = default_connection) -> bool:
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT 1 FROM pg_partitioned_table JOIN pg_class ON pg_class.oid = partrelid WHERE relname = %s',
+            [TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def get_partitions(connection: BaseDatabaseWrapper = default_connection) -> dict[date, str]:
+    """
+    Returns the monthly partitions of the login attempts table by the first day of their month.
+
+    The default partition is not included.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT child.relname FROM pg_inherits '
+            'JOIN pg_class parent ON parent.oid = inhparent '
+            'JOIN pg_class child ON child.oid = inhrelid '
+            'WHERE parent.relname = %s',
+            [TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    partitions = {}
+    for name in names:
+        if match := PARTITION_NAME_RE.match(name):
+            partitions[date(int(match[1]), int(match[2]), 1)] = name
+    return partitions
+
+
+def _has_default_partition(cursor) -> bool:
+    cursor.execute('SELECT 1 FROM pg_class WHERE relname = %s', [DEFAULT_PARTITION])
+    return cursor.fetchone() is not None
+
+
+def _create_partition(cursor, month: date, connection: BaseDatabaseWrapper, has_default: bool) -> str:
+    quote = connection.ops.quote_name
+    name = get_partition_name(month)
+    bounds = [_bound(month), _bound(add_months(month, 1))]
+    create = f'CREATE TABLE {quote(name)} PARTITION OF {quote(TABLE)} FOR VALUES FROM (%s) TO (%s)'
+    in_month = f'SELECT * FROM {quote(DEFAULT_PARTITION)} WHERE attempted_at >= %s AND attempted_at < %s'  # noqa S608
+    default_has_rows = False
+    if has_default:
+        cursor.execute(f'{in_month} LIMIT 1', bounds)
+        default_has_rows = cursor.fetchone() is not None
+    if not default_has_rows:
+        cursor.execute(create, bounds)
+        return name
+
+    # Attempts of this month already landed in the default partition, which PostgreSQL refuses
+    # to leave there once the month has a partition of its own: they are moved across first.
+    cursor.execute(f'ALTER TABLE {quote(TABLE)} DETACH PARTITION {quote(DEFAULT_PARTITION)}')
+    cursor.execute(create, bounds)
+    cursor.execute(f'INSERT INTO {quote(TABLE)} {in_month}', bounds)
+    cursor.execute(
+        f'DELETE FROM {quote(DEFAULT_PARTITION)} WHERE attempted_at >= %s AND attempted_at < %s',  # noqa S608
+        bounds,
+    )
+    cursor.execute(f'ALTER TABLE {quote(TABLE)} ATTACH PARTITION {quote(DEFAULT_PARTITION)} DEFAULT')
+    return name
+
+
+def create_partitions(
+    first_month: date, last_month: date, connection: BaseDatabaseWrapper = default_connection
+) -> list[str]:
+    """
+    Creates the missing monthly partitions from `first_month` to `last_month`, both inclusive.
+
+    Attempts of a new month found in the default partition are moved into the new partition, so it
+    has to run in a transaction. Only then is the default partition locked and read, and it is
+    expected to stay small as long as partitions are created ahead of time.
+
+    Returns:
+      list[str]: Names of the created partitions.
+    """
+    existing = get_partitions(connection)
+    created = []
+    month = month_start(first_month)
+    with connection.cursor() as cursor:
+        has_default = _has_default_partition(cursor)
+        while month <= last_month:
+            if month not in existing:
+                created.append(_create_partition(cursor, month, connection, has_default))
+            month = add_months(month, 1)
+    return created
+
+
+def drop_partitions_before(cutoff: datetime, connection: BaseDatabaseWrapper = default_connection) -> list[str]:
+    """
+    Detaches and drops the monthly partitions holding only attempts older than `cutoff`.
+
+    Dropping a partition is a catalog change, so no rows are deleted one by one and the table is not bloated.
+
+    Returns:
+      list[str]: Names of the dropped partitions.
+    """
+    cutoff_month = month_start(cutoff.astimezone(timezone.utc).date())
+    dropped = []
+    with connection.cursor() as cursor:
+        for month, name in sorted(get_partitions(connection).items()):
+            if add_months(month, 1) > cutoff_month:
+                continue
+            cursor.execute(
+                f'ALTER TABLE {connection.ops.quote_name(TABLE)} DETACH PARTITION {connection.ops.quote_name(name)}'
+            )
+            cursor.execute(f'DROP TABLE {connection.ops.quote_name(name)}')
+            dropped.append(name)
+    return dropped
+
+
+def delete_before(cutoff: datetime, batch_size: int) -> int:
+    """
+    Deletes the attempts older than `cutoff` in batches of `batch_size` rows.
+
+    Used when the table is not partitioned; every batch is a statement of its own,
+    so the table is not locked for the whole purge.
+
+    Returns:
+      int: Number of deleted attempts.
+    """
+    deleted = 0
+    expired = LoginAttempt.objects.filter(attempted_at__lt=cutoff).order_by('pk').values_list('pk', flat=True)
+    while ids := list(expired[:batch_size]):
+        deleted += LoginAttempt.objects.filter(pk__in=ids).delete()[0]
+    return deleted
+
+
+def _add_constraints(cursor, connection: BaseDatabaseWrapper) -> None:
+    quote = connection.ops.quote_name
+    for column, referenced_table in FOREIGN_KEYS:
+        cursor.execute(
+            f'ALTER TABLE {quote(TABLE)} ADD CONSTRAINT {quote(f"{TABLE}_{column}_fk")} FOREIGN KEY ({column}) '
+            f'REFERENCES {quote(referenced_table)} (id) DEFERRABLE INITIALLY DEFERRED'
+        )
+    for name, column in INDEXES.items():
+        cursor.execute(f'CREATE INDEX {quote(name)} ON {quote(TABLE)} ({column})')
+
+
+def partition_table(
+    months_ahead: int, now: Optional[datetime] = None, connection: BaseDatabaseWrapper = default_connection
+) -> None:
+    """
+    Converts the login attempts table into a table partitioned by month of `attempted_at`.
+
+    The rows are copied into the new table, so on a large table this has to run in a maintenance window.
+    PostgreSQL requires the partition key in the primary key, so it becomes `(id, attempted_at)`;
+    ids still come from a single sequence and stay unique.
+    """
+    quote = connection.ops.quote_name
+    table = quote(TABLE)
+    old_table = quote(f'{TABLE}_unpartitioned')
+    now = now or datetime.now(timezone.utc)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE {table} RENAME TO {old_table}')
+        cursor.execute(
+            f'CREATE TABLE {table} (LIKE {old_table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+            'PARTITION BY RANGE (attempted_at)'
+        )
+        cursor.execute(f'CREATE SEQUENCE {quote(ID_SEQUENCE)} OWNED BY {table}.id')
+        cursor.execute(
+            f"SELECT setval('{ID_SEQUENCE}', COALESCE((SELECT MAX(id) FROM {old_table}), 0) + 1, false)"  # noqa S608
+        )
+        cursor.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT nextval('{ID_SEQUENCE}')")
+
+        cursor.execute(f'SELECT MIN(attempted_at) FROM {old_table}')  # noqa S608
+        oldest = cursor.fetchone()[0] or now
+        current_month = month_start(now.astimezone(timezone.utc).date())
+        create_partitions(
+            month_start(oldest.astimezone(timezone.utc).date()),
+            add_months(current_month, months_ahead),
+            connection,
+        )
+        # Catches attempts outside the created months, so inserts never fail when partitions run out.
+        cursor.execute(f'CREATE TABLE {quote(DEFAULT_PARTITION)} PARTITION OF {table} DEFAULT')
+
+        cursor.execute(f'INSERT INTO {table} SELECT * FROM {old_table}')  # noqa S608
+        # Dropped before the keys and indexes are built, so they keep the names Django knows them by.
+        cursor.execute(f'DROP TABLE {old_table}')
+        cursor.execute(f'ALTER TABLE {table} ADD PRIMARY KEY (id, attempted_at)')
+        _add_constraints(cursor, connection)
+
+
+def unpartition_table(connection: BaseDatabaseWrapper = default_connection) -> None:
+    """
+    Converts the partitioned login attempts table back into a regular table.
+    """
+    quote = connection.ops.quote_name
+    table = quote(TABLE)
+    old_table = quote(f'{TABLE}_partitioned')
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE {table} RENAME TO {old_table}')
+        # The sequence would otherwise be dropped together with the partitioned table.
+        cursor.execute(f'ALTER SEQUENCE {quote(ID_SEQUENCE)} OWNED BY NONE')
+        cursor.execute(f'CREATE TABLE {table} (LIKE {old_table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+        cursor.execute(f'ALTER SEQUENCE {quote(ID_SEQUENCE)} OWNED BY {table}.id')
+        cursor.execute(f'INSERT INTO {table} SELECT * FROM {old_table}')  # noqa S608
+        cursor.execute(f'DROP TABLE {old_table}')
+        cursor.execute(f'ALTER TABLE {table} ADD PRIMARY KEY (id)')
+        _add_constraints(cursor, connection)
@@ -0,0 +1,195 @@
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max, Min, Q
+from django.db.models.functions import Trunc
+from django.utils import timezone
+
+from .models import LoginAttempt, LoginAttemptRollup
+
+Granularity = LoginAttemptRollup.Granularity
+
+LOGIN_DASHBOARD_CACHE_KEY = 'membership:login-dashboard'
+
+# The `now` of the last refresh, so quiet hours without any rollup are not scanned again.
+ROLLUPS_REFRESHED_UNTIL_CACHE_KEY = 'membership:login-rollups-refreshed-until'
+
+ROLLUP_FIELDS = ['attempts', 'successes', 'failures', 'unique_ips', 'top_cities']
+
+
+def floor_period(value: datetime, granularity: str) -> datetime:
+    """
+    Start of the hour or the local (`TIME_ZONE`) day containing `value`.
+    """
+    if granularity == Granularity.HOUR:
+        return value.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+    return timezone.localtime(value).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def next_period(period_start: datetime, granularity: str) -> datetime:
+    if granularity == Granularity.HOUR:
+        return period_start + timedelta(hours=1)
+    # Wall-clock arithmetic, so a day across a DST change still ends at local midnight.
+    return timezone.localtime(period_start) + timedelta(days=1)
+
+
+def compute_rollups(granularity: str, start: datetime, end: datetime) -> list[LoginAttemptRollup]:
+    """
+    Aggregates the login attempts made between `start` and `end` into unsaved rollups of `granularity`.
+
+    Two grouped queries over the `attempted_at` range, whatever its length: one for the counts
+    and one for the cities.
+    """
+    attempts = LoginAttempt.objects.filter(attempted_at__gte=start, attempted_at__lt=end).annotate(
+        period=Trunc('attempted_at', granularity)
+    )
+    rollups = {
+        row['period']: LoginAttemptRollup(
+            granularity=granularity,
+            period_start=row['period'],
+            attempts=row['attempts'],
+            successes=row['successes'],
+            failures=row['attempts'] - row['successes'],
+            unique_ips=row['unique_ips'],
+        )
+        for row in attempts.values('period')
+        .annotate(
+            attempts=Count('pk'),
+            successes=Count('pk', filter=Q(has_logged_in=True)),
+            unique_ips=Count('ip', distinct=True),
+        )
+        .order_by()
+    }
+
+    cities = defaultdict(list)
+    for row in (
+        attempts.filter(geo_location__isnull=False)
+        .exclude(geo_location__city='')
+        .values('period', 'geo_location__city')
+        .annotate(count=Count('pk'))
+        .order_by()
+    ):
+        cities[row['period']].append([row['geo_location__city'], row['count']])
+    for period, counts in cities.items():
+        counts.sort(key=lambda city: (-city[1], city[0]))
+        rollups[period].top_cities = counts[: settings.LOGIN_ROLLUPS_TOP_CITIES]
+
+    return list(rollups.values())
+
+
+def rollup_range(start: datetime, end: datetime) -> int:
+    """
+    Recomputes the hourly and daily rollups of every period overlapping `start` - `end`.
+
+    Rollups are upserted, so a period can be recomputed any number of times.
+
+    Returns:
+      int: Number of saved rollups.
+    """
+    saved = 0
+    for granularity in Granularity.values:
+        period_start = floor_period(start, granularity)
+        period_end = floor_period(end, granularity)
+        if period_end < end:
+            period_end = next_period(period_end, granularity)
+        rollups = compute_rollups(granularity, period_start, period_end)
+        LoginAttemptRollup.objects.bulk_create(
+            rollups,
+            update_conflicts=True,
+            unique_fields=['granularity', 'period_start'],
+            update_fields=[*ROLLUP_FIELDS, 'updated_at'],
+        )
+        saved += len(rollups)
+    return saved
+
+
+def refresh_rollups(now: Optional[datetime] = None) -> int:
+    """
+    Brings the rollups up to date, starting one hour before the previous refresh.
+
+    The extra hour picks up attempts saved late, e.g. by the write-behind buffer. The previous refresh is
+    remembered in the cache; without it (first run, cache flushed) the latest hourly rollup is used instead.
+    Run periodically; the history before the first rollup is filled in by `backfill_rollups`.
+
+    Returns:
+      int: Number of saved rollups.
+    """
+    now = now or timezone.now()
+    refreshed_until = cache.get(ROLLUPS_REFRESHED_UNTIL_CACHE_KEY)
+    if refreshed_until is None:
+        latest = LoginAttemptRollup.objects.filter(granularity=Granularity.HOUR).aggregate(Max('period_start'))
+        refreshed_until = latest['period_start__max'] or floor_period(now, Granularity.HOUR)
+    saved = rollup_range(min(refreshed_until, now) - timedelta(hours=1), now)
+    cache.set(ROLLUPS_REFRESHED_UNTIL_CACHE_KEY, now, None)
+    cache.delete(LOGIN_DASHBOARD_CACHE_KEY)
+    return saved
+
+
+def backfill_rollups(start: Optional[datetime] = None, end: Optional[datetime] = None, chunk_days: int = 1) -> int:
+    """
+    Computes the rollups from `start` (the oldest attempt by default) to `end` (now by default)
+    in chunks of `chunk_days` local days.
+
+    Every chunk is a pair of short read-only queries over an `attempted_at` range, so the login
+    attempts table is never locked and new logins are not held up.
+
+    Returns:
+      int: Number of saved rollups.
+    """
+    end = end or timezone.now()
+    if start is None:
+        start = LoginAttempt.objects.aggregate(Min('attempted_at'))['attempted_at__min']
+        if start is None:
+            return 0
+
+    saved = 0
+    chunk_start = floor_period(start, Granularity.DAY)
+    while chunk_start < end:
+        chunk_end = timezone.localtime(chunk_start) + timedelta(days=chunk_days)
+        saved += rollup_range(chunk_start, min(chunk_end, end))
+        chunk_start = chunk_end
+    cache.delete(LOGIN_DASHBOARD_CACHE_KEY)
+    return saved
+
+
+def build_login_dashboard(now: Optional[datetime] = None) -> dict:
+    """
+    Daily and hourly series and totals of the last `LOGIN_ROLLUPS_DASHBOARD_DAYS` days, read from the rollups only.
+    """
+    now = now or timezone.now()
+    since = floor_period(now, Granularity.DAY) - timedelta(days=settings.LOGIN_ROLLUPS_DASHBOARD_DAYS - 1)
+    days = list(
+        LoginAttemptRollup.objects.filter(granularity=Granularity.DAY, period_start__gte=since)
+        .order_by('-period_start')
+        .values('period_start', *ROLLUP_FIELDS)
+    )
+    hours = list(
+        LoginAttemptRollup.objects.filter(
+            granularity=Granularity.HOUR, period_start__gte=floor_period(now, Granularity.HOUR) - timedelta(hours=23)
+        )
+        .order_by('-period_start')
+        .values('period_start', *ROLLUP_FIELDS)
+    )
+
+    totals = {field: sum(day[field] for day in days) for field in ('attempts', 'successes', 'failures')}
+    city_counts: dict[str, int] = defaultdict(int)
+    for day in days:
+        for city, count in day['top_cities']:
+            city_counts[city] += count
+    top_cities = sorted(city_counts.items(), key=lambda city: (-city[1], city[0]))[: settings.LOGIN_ROLLUPS_TOP_CITIES]
+
+    return {'since': since, 'days': days, 'hours': hours, 'totals': totals, 'top_cities': top_cities}
+
+
+def get_login_dashboard() -> dict:
+    """
+    The dashboard data from the cache, rebuilt when it expires or the rollups are refreshed.
+    """
+    dashboard = cache.get(LOGIN_DASHBOARD_CACHE_KEY)
+    if dashboard is None:
+        dashboard = build_login_dashboard()
+        cache.set(LOGIN_DASHBOARD_CACHE_KEY, dashboard, settings.LOGIN_ROLLUPS_DASHBOARD_CACHE_TIMEOUT)
+    return dashboard
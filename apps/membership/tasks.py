@@ -0,0 +1,30 @@
+from celery import shared_task
+from django.conf import settings
+
+from . import account_deletion, blacklist, outbox
+from .rollups import refresh_rollups
+
+
+@shared_task(ignore_result=True)
+def refresh_login_attempt_rollups() -> int:
+    return refresh_rollups()
+
+
+@shared_task(ignore_result=True)
+def purge_expired_tokens() -> int:
+    return blacklist.purge_expired_tokens(settings.JWT_PURGE_BATCH_SIZE)
+
+
+@shared_task(ignore_result=True)
+def send_outbound_emails() -> int:
+    return outbox.send_pending_emails()
+
+
+@shared_task(ignore_result=True)
+def delete_account(deletion_id: int) -> None:
+    account_deletion.run_account_deletion(deletion_id)
+
+
+@shared_task(ignore_result=True)
+def resume_account_deletions() -> int:
+    return account_deletion.resume_account_deletions()
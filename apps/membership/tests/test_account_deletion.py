@@ -0,0 +1,169 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.db.models import QuerySet
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from apps.membership.account_deletion import (
+    build_steps,
+    request_account_deletion,
+    resume_account_deletions,
+    run_account_deletion,
+)
+from apps.membership.api_views import DeleteAccountView
+from apps.membership.models import AccountDeletion, LoginAttempt, User
+from apps.membership.tests.factories import UserFactory
+from apps.membership.tokens import UserClaimsRefreshToken
+from apps.shop.factories import OrderFactory, OrderItemFactory, ProductFactory
+from apps.shop.models import Order, OrderItem
+
+original_delete = QuerySet.delete
+
+
+class AccountDeletionTests(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.user = UserFactory()
+        self.other_user = UserFactory()
+        product = ProductFactory()
+        for user in (self.user, self.other_user):
+            for _ in range(3):
+                order = OrderFactory(user=user)
+                OrderItemFactory.create_batch(2, order=order, product=product)
+            LoginAttempt.objects.bulk_create(
+                [LoginAttempt(user=user, username=user.email, attempted_at=timezone.now()) for _ in range(5)]
+            )
+            UserClaimsRefreshToken.for_user(user).blacklist()
+
+    def request_deletion(self) -> AccountDeletion:
+        with (
+            mock.patch('apps.membership.tasks.delete_account.delay') as delay,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            deletion = request_account_deletion(self.user)
+        delay.assert_called_once_with(deletion.pk)
+        return deletion
+
+    def assert_other_user_untouched(self) -> None:
+        self.assertEqual(Order.objects.filter(user=self.other_user).count(), 3)
+        self.assertEqual(OrderItem.objects.filter(order__user=self.other_user).count(), 6)
+        self.assertEqual(LoginAttempt.objects.filter(user=self.other_user).count(), 5)
+        self.assertEqual(OutstandingToken.objects.filter(user=self.other_user).count(), 1)
+
+    def test_steps_follow_the_relations(self) -> None:
+        steps = {step.name: step for step in build_steps()}
+
+        names = list(steps)
+        self.assertLess(names.index('shop.orderitem:order__user'), names.index('shop.order:user'))
+        self.assertLess(
+            names.index('token_blacklist.blacklistedtoken:token__user'),
+            names.index('token_blacklist.outstandingtoken:user'),
+        )
+        self.assertTrue(steps['membership.loginattempt:user'].nullify)
+        self.assertFalse(steps['token_blacklist.outstandingtoken:user'].nullify)
+
+    def test_request_deactivates_the_user_at_once(self) -> None:
+        deletion = self.request_deletion()
+
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+        self.assertIsNotNone(self.user.deactivation_date)
+        self.assertEqual(deletion.status, AccountDeletion.Status.PENDING)
+        self.assertEqual(Order.objects.filter(user=self.user).count(), 3)
+        self.assertEqual(self.request_deletion(), deletion)
+
+    def test_dependents_are_deleted_in_chunks(self) -> None:
+        deletion = self.request_deletion()
+
+        deletion = run_account_deletion(deletion.pk, batch_size=2)
+
+        self.assertEqual(deletion.status, AccountDeletion.Status.DONE)
+        self.assertIsNotNone(deletion.finished_at)
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists())
+        self.assertEqual(Order.objects.count(), 3)
+        self.assertEqual(OrderItem.objects.count(), 6)
+        # Login attempts stay for auditing, without the user.
+        self.assertEqual(LoginAttempt.objects.filter(user__isnull=True).count(), 5)
+        self.assertEqual(BlacklistedToken.objects.count(), 1)
+        self.assert_other_user_untouched()
+        self.assertEqual(deletion.progress['shop.orderitem:order__user'], {'done': 6, 'total': 6})
+        self.assertEqual(deletion.progress['shop.order:user'], {'done': 3, 'total': 3})
+        self.assertEqual(deletion.progress['membership.loginattempt:user'], {'done': 5, 'total': 5})
+        self.assertEqual(deletion.progress['token_blacklist.outstandingtoken:user'], {'done': 1, 'total': 1})
+
+    def test_deletes_are_bounded_by_the_batch_size(self) -> None:
+        deletion = self.request_deletion()
+        chunks = []
+
+        def delete(queryset):
+            chunks.append((queryset.model, len(queryset)))
+            return original_delete(queryset)
+
+        with mock.patch.object(QuerySet, 'delete', delete), override_settings(ACCOUNT_DELETION_BATCH_SIZE=2):
+            run_account_deletion(deletion.pk)
+
+        self.assertEqual([size for model, size in chunks if model is OrderItem], [2, 2, 2])
+        self.assertEqual([size for model, size in chunks if model is Order], [2, 1])
+        self.assertFalse(Order.objects.filter(user_id=self.user.pk).exists())
+
+    def test_interrupted_deletion_resumes(self) -> None:
+        deletion = self.request_deletion()
+        order_chunks = []
+
+        def delete(queryset):
+            if queryset.model is Order:
+                order_chunks.append(queryset)
+                if len(order_chunks) == 2:
+                    raise ConnectionError('worker lost')
+            return original_delete(queryset)
+
+        with mock.patch.object(QuerySet, 'delete', delete), self.assertRaises(ConnectionError):
+            run_account_deletion(deletion.pk, batch_size=1)
+
+        deletion.refresh_from_db()
+        self.assertEqual(deletion.status, AccountDeletion.Status.FAILED)
+        self.assertEqual(deletion.step, 'shop.order:user')
+        self.assertEqual(deletion.progress['shop.order:user']['done'], 1)
+        self.assertIn('worker lost', deletion.last_error)
+        self.assertEqual(Order.objects.filter(user=self.user).count(), 2)
+
+        deletion = run_account_deletion(deletion.pk, batch_size=1)
+
+        self.assertEqual(deletion.status, AccountDeletion.Status.DONE)
+        self.assertEqual(deletion.attempts, 2)
+        self.assertEqual(deletion.progress['shop.order:user'], {'done': 3, 'total': 3})
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists())
+        self.assert_other_user_untouched()
+
+        self.assertEqual(run_account_deletion(deletion.pk).attempts, 2)
+
+    def test_stalled_deletions_are_resumed(self) -> None:
+        deletion = self.request_deletion()
+        done = AccountDeletion.objects.create(user_id=0, email='done@example.com', status=AccountDeletion.Status.DONE)
+        AccountDeletion.objects.filter(pk__in=[deletion.pk, done.pk]).update(
+            updated_at=timezone.now() - timedelta(hours=1)
+        )
+
+        with mock.patch('apps.membership.tasks.delete_account.delay') as delay:
+            self.assertEqual(resume_account_deletions(), 1)
+        delay.assert_called_once_with(deletion.pk)
+
+    def test_view_schedules_the_deletion(self) -> None:
+        data = {'password': 'password123'}  # noqa S105
+        request = APIRequestFactory().post('/api/delete-account/', data, format='json')
+        force_authenticate(request, user=self.user)
+
+        with (
+            mock.patch('apps.membership.tasks.delete_account.delay') as delay,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            response = DeleteAccountView.as_view()(request)
+
+        self.assertEqual(response.status_code, 202)
+        deletion = AccountDeletion.objects.get(user_id=self.user.pk)
+        delay.assert_called_once_with(deletion.pk)
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
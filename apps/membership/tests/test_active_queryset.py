@@ -0,0 +1,98 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.membership.models import User
+from apps.membership.tests.factories import StaffUserFactory, UserFactory
+from apps.membership.tests.test_dirty_fields import updated_columns
+from apps.membership.user_cache import get_cached_user
+
+
+class ActiveQuerySetTests(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        self.long_ago = timezone.now() - timedelta(days=30)
+        self.active_user = UserFactory()
+        self.reactivated_user = UserFactory(is_active=False)
+        self.new_user = UserFactory(is_active=False)
+        User.objects.filter(pk=self.reactivated_user.pk).update(activation_date=self.long_ago)
+        User.objects.filter(pk=self.new_user.pk).update(activation_date=None)
+        User.objects.update(updated_at=self.long_ago)
+
+    def test_activate_is_a_single_update(self) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(User.objects.activate(), 2)
+
+        self.assertEqual(
+            updated_columns(queries), [{'is_active', 'activation_date', 'deactivation_date', 'updated_at'}]
+        )
+        reactivated_user = User.objects.get(pk=self.reactivated_user.pk)
+        self.assertTrue(reactivated_user.is_active)
+        self.assertEqual(reactivated_user.activation_date, self.long_ago)
+        self.assertIsNone(reactivated_user.deactivation_date)
+        self.assertGreater(reactivated_user.updated_at, self.long_ago)
+        self.assertIsNotNone(User.objects.get(pk=self.new_user.pk).activation_date)
+        # Rows already active are left alone.
+        self.assertEqual(User.objects.get(pk=self.active_user.pk).updated_at, self.long_ago)
+
+    def test_deactivate_sets_the_deactivation_date(self) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(User.objects.filter(pk=self.active_user.pk).deactivate(), 1)
+
+        self.assertEqual(updated_columns(queries), [{'is_active', 'deactivation_date', 'updated_at'}])
+        user = User.objects.get(pk=self.active_user.pk)
+        self.assertFalse(user.is_active)
+        self.assertIsNotNone(user.deactivation_date)
+        self.assertGreater(user.updated_at, self.long_ago)
+
+    def test_touch_updates_the_auto_now_fields(self) -> None:
+        self.assertEqual(User.objects.filter(pk=self.active_user.pk).touch(first_name='Jan'), 1)
+
+        user = User.objects.get(pk=self.active_user.pk)
+        self.assertEqual(user.first_name, 'Jan')
+        self.assertGreater(user.updated_at, self.long_ago)
+
+    def test_bulk_update_keeps_the_activation_dates(self) -> None:
+        users = list(User.objects.filter(pk__in=[self.active_user.pk, self.new_user.pk]).order_by('pk'))
+        for user in users:
+            user.is_active = not user.is_active
+
+        with CaptureQueriesContext(connection) as queries:
+            User.objects.bulk_update(users, ['is_active'])
+
+        (columns,) = updated_columns(queries)
+        # "id" comes from the `CASE WHEN "id" = ...` expressions of `bulk_update`.
+        self.assertEqual(columns - {'id'}, {'is_active', 'activation_date', 'deactivation_date', 'updated_at'})
+        deactivated_user, activated_user = User.objects.filter(pk__in=[user.pk for user in users]).order_by('pk')
+        self.assertIsNotNone(deactivated_user.deactivation_date)
+        self.assertIsNotNone(activated_user.activation_date)
+        self.assertIsNone(activated_user.deactivation_date)
+        self.assertGreater(activated_user.updated_at, self.long_ago)
+        self.assertFalse(any(user.is_dirty() for user in users))
+
+    def test_cached_users_are_invalidated(self) -> None:
+        self.assertTrue(get_cached_user(self.active_user.pk).is_active)
+
+        # The SELECT of the ids to invalidate, then the UPDATE.
+        with self.assertNumQueries(2), self.captureOnCommitCallbacks(execute=True):
+            User.objects.filter(pk=self.active_user.pk).deactivate()
+
+        self.assertFalse(get_cached_user(self.active_user.pk).is_active)
+
+    def test_admin_actions(self) -> None:
+        self.client.force_login(StaffUserFactory(is_superuser=True))
+        url = reverse('admin:membership_user_changelist')
+        selected = [self.active_user.pk, self.new_user.pk]
+
+        self.client.post(url, {'action': 'deactivate_users', '_selected_action': selected})
+        self.assertFalse(User.objects.filter(pk__in=selected, is_active=True).exists())
+
+        self.client.post(url, {'action': 'activate_users', '_selected_action': selected})
+        self.assertEqual(User.objects.filter(pk__in=selected, is_active=True).count(), 2)
+        self.assertFalse(User.objects.filter(pk__in=selected, deactivation_date__isnull=False).exists())
@@ -0,0 +1,82 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+
+from apps.membership.authentication import CookieJWTAuthentication, CookieJWTStatelessAuthentication
+from apps.membership.tests.factories import StaffUserFactory, UserFactory
+from apps.membership.tokens import UserClaimsRefreshToken
+
+
+class CookieJWTAuthenticationTests(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        self.user = UserFactory()
+        self.token = str(UserClaimsRefreshToken.for_user(self.user).access_token)
+
+    def authenticate(self, authentication=None, **headers):
+        request = APIRequestFactory().get('/', **headers)
+        return (authentication or CookieJWTAuthentication()).authenticate(request)
+
+    def test_user_is_cached(self) -> None:
+        with self.assertNumQueries(1):
+            user, _ = self.authenticate(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        self.assertEqual(user, self.user)
+
+        with self.assertNumQueries(0):
+            user, _ = self.authenticate(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        self.assertEqual(user.email, self.user.email)
+
+    def test_cookie_token_is_accepted(self) -> None:
+        self.authenticate()
+        request = APIRequestFactory().get('/')
+        request.COOKIES['access_token'] = self.token
+        self.assertEqual(CookieJWTAuthentication().authenticate(request)[0], self.user)
+
+    def test_saving_the_user_invalidates_the_cache(self) -> None:
+        self.authenticate(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+
+        self.user.first_name = 'Changed'
+        self.user.save()
+
+        with self.assertNumQueries(1):
+            user, _ = self.authenticate(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        self.assertEqual(user.first_name, 'Changed')
+
+    def test_deactivated_user_is_rejected(self) -> None:
+        self.authenticate(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+
+        self.user.is_active = False
+        self.user.save()
+
+        with self.assertRaises(AuthenticationFailed) as context:
+            self.authenticate(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        self.assertEqual(context.exception.detail['code'], 'user_inactive')
+        self.assertIsNotNone(self.user.deactivation_date)
+
+    def test_deleted_user_is_rejected(self) -> None:
+        self.authenticate(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+
+        self.user.delete()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+
+    def test_evicted_version_does_not_revive_a_stale_entry(self) -> None:
+        self.authenticate(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        cache.delete(f'user-cache:version:{self.user.pk}')
+
+        with self.assertNumQueries(1):
+            self.authenticate(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+
+    def test_stateless_authentication_reads_the_claims(self) -> None:
+        staff_user = StaffUserFactory()
+        token = str(UserClaimsRefreshToken.for_user(staff_user).access_token)
+
+        with self.assertNumQueries(0):
+            user, _ = self.authenticate(CookieJWTStatelessAuthentication(), HTTP_AUTHORIZATION=f'Bearer {token}')
+
+        self.assertIsInstance(user, TokenUser)
+        self.assertEqual((user.id, user.username, user.is_staff), (staff_user.pk, staff_user.email, True))
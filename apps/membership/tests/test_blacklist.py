@@ -0,0 +1,129 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from apps.membership import blacklist
+from apps.membership.api_views import CookieTokenRefreshView
+from apps.membership.blacklist import TokenBlacklist, purge_expired_tokens
+from apps.membership.tests.factories import UserFactory
+from apps.membership.tokens import UserClaimsRefreshToken
+from apps.utils.tests.benchmarks import benchmark, measure, report
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TokenBlacklistTests(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        patcher = mock.patch.object(blacklist, '_blacklist', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.user = UserFactory()
+        self.clock = FakeClock()
+
+    def build_blacklist(self) -> TokenBlacklist:
+        return TokenBlacklist(
+            capacity=1000, error_rate=0.001, sync_interval=30, rebuild_interval=3600, clock=self.clock
+        )
+
+    def blacklist_token(self) -> UserClaimsRefreshToken:
+        token = UserClaimsRefreshToken.for_user(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            token.blacklist()
+        return token
+
+    def test_unknown_jti_skips_the_database(self) -> None:
+        token_blacklist = self.build_blacklist()
+        blacklisted = self.blacklist_token()
+        token_blacklist.is_blacklisted('warm-up')
+
+        jti = UserClaimsRefreshToken.for_user(self.user)['jti']
+        with self.assertNumQueries(0):
+            self.assertFalse(token_blacklist.is_blacklisted(jti))
+
+        cache.clear()
+        with self.assertNumQueries(1):
+            self.assertTrue(token_blacklist.is_blacklisted(blacklisted['jti']))
+        self.assertEqual(token_blacklist.database_lookups, 1)
+
+    def test_token_blacklisted_elsewhere_is_seen_before_the_next_sync(self) -> None:
+        other_process = self.build_blacklist()
+        other_process.is_blacklisted('warm-up')
+
+        token = self.blacklist_token()
+
+        self.assertTrue(other_process.is_blacklisted(token['jti']))
+
+    def test_sync_picks_up_new_blacklist_entries(self) -> None:
+        token_blacklist = self.build_blacklist()
+        token_blacklist.is_blacklisted('warm-up')
+        token = self.blacklist_token()
+        cache.clear()
+
+        self.clock.now += 30
+        self.assertTrue(token_blacklist.is_blacklisted(token['jti']))
+
+    def test_blacklisted_refresh_token_is_rejected(self) -> None:
+        token = self.blacklist_token()
+        request = APIRequestFactory().post('/')
+        request.COOKIES['refresh_token'] = str(token)
+
+        response = CookieTokenRefreshView.as_view()(request)
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_refresh_with_a_valid_token(self) -> None:
+        request = APIRequestFactory().post('/')
+        request.COOKIES['refresh_token'] = str(UserClaimsRefreshToken.for_user(self.user))
+
+        response = CookieTokenRefreshView.as_view()(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('access_token', response.cookies)
+
+    @override_settings(JWT_BLACKLIST_BLOOM_ENABLED=False)
+    def test_database_check_when_disabled(self) -> None:
+        token = self.blacklist_token()
+        cache.clear()
+        with self.assertNumQueries(1), self.assertRaises(TokenError):
+            UserClaimsRefreshToken(str(token))
+
+    def test_expired_tokens_are_purged_in_batches(self) -> None:
+        for _ in range(5):
+            self.blacklist_token()
+        OutstandingToken.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        UserClaimsRefreshToken.for_user(self.user)
+
+        self.assertEqual(purge_expired_tokens(batch_size=2), 5)
+        self.assertEqual(OutstandingToken.objects.count(), 1)
+        self.assertFalse(BlacklistedToken.objects.exists())
+
+    @benchmark
+    def test_refresh_throughput(self) -> None:
+        for _ in range(2000):
+            self.blacklist_token()
+        cache.clear()
+        refresh_token = str(UserClaimsRefreshToken.for_user(self.user))
+        view = CookieTokenRefreshView.as_view()
+
+        def refresh() -> None:
+            request = APIRequestFactory().post('/')
+            request.COOKIES['refresh_token'] = refresh_token
+            view(request)
+
+        with override_settings(JWT_BLACKLIST_BLOOM_ENABLED=False):
+            report('token refresh, blacklist read from the database', measure(refresh, iterations=2000))
+        report('token refresh, blacklist read through the Bloom filter', measure(refresh, iterations=2000))
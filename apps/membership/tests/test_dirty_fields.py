@@ -0,0 +1,153 @@
+import re
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models.signals import post_save
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.membership.models import User
+from apps.membership.tests.factories import UserFactory
+from apps.membership.user_cache import get_cached_user
+from apps.utils.tests.benchmarks import benchmark, report
+
+SET_COLUMN_RE = re.compile(r'"(\w+)" = ')
+
+
+def updated_columns(queries: CaptureQueriesContext) -> list[set[str]]:
+    return [
+        set(SET_COLUMN_RE.findall(query['sql'].split(' SET ', 1)[1].split(' WHERE ', 1)[0]))
+        for query in queries.captured_queries
+        if query['sql'].startswith('UPDATE "membership_user"')
+    ]
+
+
+class DirtyFieldsMixinTests(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.user = User.objects.get(pk=UserFactory().pk)
+
+    def test_loaded_user_is_clean(self) -> None:
+        self.assertEqual(self.user.get_dirty_fields(), [])
+
+        with self.assertNumQueries(0):
+            self.user.save()
+
+    def test_no_op_save_still_sends_the_save_signals(self) -> None:
+        cache.clear()
+        receiver = mock.Mock()
+        post_save.connect(receiver, sender=User)
+        self.addCleanup(post_save.disconnect, receiver, sender=User)
+        self.assertEqual(get_cached_user(self.user.pk).first_name, self.user.first_name)
+        # Written behind the back of the cache, e.g. by a raw query of another process.
+        User._base_manager.filter(pk=self.user.pk).update(first_name='Anna')
+        self.user.refresh_from_db()
+
+        with self.assertNumQueries(0), self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+
+        receiver.assert_called_once()
+        self.assertEqual(receiver.call_args.kwargs['update_fields'], frozenset())
+        self.assertFalse(receiver.call_args.kwargs['created'])
+        self.assertEqual(get_cached_user(self.user.pk).first_name, 'Anna')
+
+    def test_only_changed_columns_are_updated(self) -> None:
+        self.user.first_name = 'Jan'
+
+        with CaptureQueriesContext(connection) as queries:
+            self.user.save()
+
+        self.assertEqual(updated_columns(queries), [{'first_name', 'updated_at'}])
+        self.assertFalse(self.user.is_dirty())
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, 'Jan')
+
+    def test_activation_updates_the_activation_dates(self) -> None:
+        user = User.objects.create_user(email='new@example.com', password='password123')  # noqa S106
+        user = User.objects.get(pk=user.pk)
+        user.is_active = True
+
+        with CaptureQueriesContext(connection) as queries:
+            user.save()
+
+        self.assertEqual(updated_columns(queries), [{'is_active', 'activation_date', 'updated_at'}])
+        self.assertIsNotNone(User.objects.get(pk=user.pk).activation_date)
+
+    def test_deactivation_date_is_kept_by_later_saves(self) -> None:
+        self.user.is_active = False
+        self.user.save()
+        deactivation_date = self.user.deactivation_date
+
+        with self.assertNumQueries(0):
+            self.user.save()
+
+        self.user.last_name = 'Kowalski'
+        self.user.save()
+        self.assertEqual(User.objects.get(pk=self.user.pk).deactivation_date, deactivation_date)
+
+    def test_explicit_update_fields_add_the_activation_dates(self) -> None:
+        self.user.is_active = False
+        self.user.first_name = 'Jan'
+
+        with CaptureQueriesContext(connection) as queries:
+            self.user.save(update_fields=['is_active'])
+
+        self.assertEqual(updated_columns(queries), [{'is_active', 'activation_date', 'deactivation_date'}])
+        self.assertEqual(self.user.get_dirty_fields(), ['first_name'])
+
+    def test_refresh_from_db_resets_the_snapshot(self) -> None:
+        User.objects.filter(pk=self.user.pk).update(first_name='Anna')
+        self.user.first_name = 'Jan'
+
+        self.user.refresh_from_db()
+
+        self.assertEqual(self.user.first_name, 'Anna')
+        self.assertFalse(self.user.is_dirty())
+        self.user.first_name = 'Jan'
+        self.user.refresh_from_db(fields=['first_name'])
+        self.assertFalse(self.user.is_dirty())
+
+    def test_deferred_fields_are_tracked_once_loaded(self) -> None:
+        user = User.objects.only('email').get(pk=self.user.pk)
+
+        self.assertEqual(user.get_dirty_fields(), [])
+        user.first_name = user.first_name + ' Jan'
+
+        with CaptureQueriesContext(connection) as queries:
+            user.save()
+        self.assertEqual(updated_columns(queries), [{'first_name', 'updated_at'}])
+
+    def test_new_instances_are_inserted(self) -> None:
+        user = User(email='other@example.com')
+
+        user.save()
+
+        self.assertFalse(user.is_dirty())
+        self.assertTrue(User.objects.filter(email='other@example.com').exists())
+
+
+class DirtyFieldsBenchmarks(TestCase):
+    @benchmark
+    def test_user_write_volume(self) -> None:
+        # The typical writes of the account views: deactivation, a profile edit and a save without changes.
+        full_columns = {field.attname for field in User._meta.concrete_fields if not field.primary_key}
+        operations = {
+            'deactivate': lambda user: setattr(user, 'is_active', False),
+            'edit profile': lambda user: setattr(user, 'first_name', 'Jan'),
+            'no-op save': lambda user: None,
+        }
+        for name, change in operations.items():
+            volumes = {}
+            for mode in ('full row', 'dirty fields'):
+                user = User.objects.get(pk=UserFactory().pk)
+                change(user)
+                with CaptureQueriesContext(connection) as queries:
+                    if mode == 'full row':
+                        user.save(update_fields=full_columns)
+                    else:
+                        user.save()
+                columns = updated_columns(queries)
+                volumes[f'{mode} columns'] = sum(len(statement) for statement in columns)
+                volumes[f'{mode} sql bytes'] = sum(len(query['sql']) for query in queries.captured_queries)
+            report(f'user {name}', volumes)
@@ -0,0 +1,79 @@
+import unittest
+
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+from geoip2.errors import AddressNotFoundError
+
+from apps.membership import utils
+from apps.membership.utils import geo_data_cache, get_geo_data, lookup_geo_data, open_geo_ip
+from apps.utils.tests.benchmarks import benchmark, measure, report
+
+
+class CountingGeoIP2:
+    def __init__(self) -> None:
+        self.lookups = []
+
+    def city(self, ip: str) -> dict:
+        self.lookups.append(ip)
+        if ip.startswith('192.0.2.'):
+            raise AddressNotFoundError(ip)
+        return {'city': f'City of {ip}'}
+
+
+class GeoDataCacheTests(SimpleTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.geo_ip = CountingGeoIP2()
+        self.original_geo_ip = utils._geo_ip
+        utils._geo_ip = self.geo_ip
+        geo_data_cache.clear()
+
+    def tearDown(self) -> None:
+        utils._geo_ip = self.original_geo_ip
+        geo_data_cache.clear()
+        super().tearDown()
+
+    def test_lookups_are_cached_per_address(self) -> None:
+        self.assertEqual(get_geo_data('203.0.113.1'), {'city': 'City of 203.0.113.1'})
+        self.assertEqual(get_geo_data('203.0.113.1'), {'city': 'City of 203.0.113.1'})
+        get_geo_data('203.0.113.2')
+
+        self.assertEqual(self.geo_ip.lookups, ['203.0.113.1', '203.0.113.2'])
+        self.assertEqual((geo_data_cache.hits, geo_data_cache.misses), (1, 2))
+
+    def test_unknown_addresses_are_cached(self) -> None:
+        self.assertIn('errors', get_geo_data('192.0.2.1'))
+        self.assertIn('errors', get_geo_data('192.0.2.1'))
+
+        self.assertEqual(self.geo_ip.lookups, ['192.0.2.1'])
+
+    @override_settings(GEOIP_CACHE_BY_NETWORK=True)
+    def test_lookups_can_be_cached_per_network(self) -> None:
+        get_geo_data('203.0.113.1')
+        get_geo_data('203.0.113.200')
+        get_geo_data('2001:db8:1:2::1')
+        get_geo_data('2001:db8:1:3::1')
+        get_geo_data('198.51.100.1')
+
+        self.assertEqual(self.geo_ip.lookups, ['203.0.113.1', '2001:db8:1:2::1', '198.51.100.1'])
+
+    def test_missing_ip_is_not_looked_up(self) -> None:
+        self.assertEqual(get_geo_data(None), {})
+        self.assertEqual(self.geo_ip.lookups, [])
+
+
+@unittest.skipUnless(settings.GEOIP_PATH, 'Set DJANGO_BASIC_STACK_GEOIP_PATH to a GeoLite2 City database.')
+class GeoDataBenchmarkTests(SimpleTestCase):
+    @benchmark
+    def test_cached_lookups_against_the_database(self) -> None:
+        original_geo_ip = utils._geo_ip
+        utils._geo_ip = open_geo_ip()
+        ips = [f'81.{number % 250}.{number // 250 % 250}.1' for number in range(1000)]
+        try:
+            report('uncached geoip lookups (1000 IPs)', measure(lambda: [lookup_geo_data(ip) for ip in ips], 20))
+            geo_data_cache.clear()
+            report('cached geoip lookups (1000 IPs)', measure(lambda: [get_geo_data(ip) for ip in ips], 20))
+            report('geoip cache', geo_data_cache.stats())
+        finally:
+            utils._geo_ip = original_geo_ip
+            geo_data_cache.clear()
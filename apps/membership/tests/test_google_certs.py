@@ -0,0 +1,249 @@
+import datetime
+import time
+from unittest import mock
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from google.auth import crypt, exceptions, jwt
+from rest_framework.test import APIRequestFactory
+
+from apps.membership import google_certs
+from apps.membership.api_views import LoginGoogleView
+from apps.membership.google_certs import GoogleCertCache, parse_max_age
+from apps.membership.tests.factories import UserFactory
+from apps.utils.tests.http import JSONHTTPStandIn
+
+
+def build_key(key_id: str) -> tuple[crypt.RSASigner, str]:
+    """
+    A signer for tokens and the matching self-signed certificate, as Google publishes them.
+    """
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, key_id)])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    return (
+        crypt.RSASigner.from_string(private_pem, key_id),
+        certificate.public_bytes(serialization.Encoding.PEM).decode(),
+    )
+
+
+def build_token(signer: crypt.RSASigner, email: str = 'user@example.com', **claims) -> str:
+    now = int(time.time())
+    payload = {'iss': 'https://accounts.google.com', 'email': email, 'iat': now, 'exp': now + 3600, **claims}
+    return jwt.encode(signer, payload).decode()
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = time.time()
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class GoogleCertCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.signer, cls.certificate = build_key('key-1')
+        cls.rotated_signer, cls.rotated_certificate = build_key('key-2')
+
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        self.clock = FakeClock()
+        self.server = JSONHTTPStandIn({'key-1': self.certificate}, headers={'Cache-Control': 'public, max-age=600'})
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+
+    def build_cache(self) -> GoogleCertCache:
+        return GoogleCertCache(
+            certs_url=self.server.url,
+            timeout=5,
+            default_max_age=3600,
+            refresh_margin=60,
+            min_refresh_interval=30,
+            clock=self.clock,
+        )
+
+    def test_certs_are_fetched_once(self) -> None:
+        cert_cache = self.build_cache()
+
+        for _ in range(3):
+            self.assertEqual(cert_cache.verify(build_token(self.signer))['email'], 'user@example.com')
+
+        self.assertEqual(self.server.requests, 1)
+        self.assertEqual(cert_cache.fetches, 1)
+
+    def test_max_age_is_honoured(self) -> None:
+        cert_cache = self.build_cache()
+        cert_cache.get_certs()
+
+        self.clock.now += 500
+        cert_cache.get_certs()
+        self.assertIsNone(cert_cache._refresh_thread)
+        self.assertEqual(self.server.requests, 1)
+
+        cache.clear()
+        self.clock.now += 101
+        cert_cache.get_certs()
+        self.assertEqual(self.server.requests, 2)
+
+    def test_parse_max_age(self) -> None:
+        self.assertEqual(parse_max_age({'Cache-Control': 'public, max-age=19800, must-revalidate'}, 5), 19800)
+        self.assertEqual(parse_max_age({'Cache-Control': 'max-age=600', 'Age': '100'}, 5), 500)
+        self.assertEqual(parse_max_age({'Cache-Control': 'max-age=60', 'Age': '100'}, 5), 0)
+        self.assertEqual(parse_max_age({'Cache-Control': 's-maxage=600'}, 5), 5)
+        self.assertEqual(parse_max_age({}, 5), 5)
+
+    def test_certs_are_shared_between_workers(self) -> None:
+        self.build_cache().get_certs()
+
+        other_worker = self.build_cache()
+        other_worker.verify(build_token(self.signer))
+
+        self.assertEqual(self.server.requests, 1)
+        self.assertEqual(other_worker.fetches, 0)
+
+    def test_session_keeps_the_connection_alive(self) -> None:
+        cert_cache = self.build_cache()
+        cert_cache.get_certs()
+        cert_cache.get_certs(force=True)
+        self.clock.now += 31
+        cert_cache.get_certs(force=True)
+
+        self.assertEqual(self.server.requests, 2)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_certs_are_refreshed_in_the_background_before_expiry(self) -> None:
+        cert_cache = self.build_cache()
+        cert_cache.get_certs()
+        self.server.body = {'key-1': self.certificate, 'key-2': self.rotated_certificate}
+        cache.clear()
+
+        self.clock.now += 550
+        certs = cert_cache.get_certs()
+        self.assertNotIn('key-2', certs)
+        cert_cache._refresh_thread.join()
+
+        self.assertEqual(self.server.requests, 2)
+        self.assertIn('key-2', cert_cache.get_certs())
+        self.assertEqual(cert_cache._expires_at, self.clock.now + 600)
+
+    def test_background_refresh_takes_the_shared_certs(self) -> None:
+        cert_cache = self.build_cache()
+        cert_cache.get_certs()
+        self.clock.now += 550
+        cache.set(google_certs.CACHE_KEY, ({'key-2': self.rotated_certificate}, self.clock.now + 600))
+
+        cert_cache.get_certs()
+        cert_cache._refresh_thread.join()
+
+        self.assertEqual(self.server.requests, 1)
+        self.assertIn('key-2', cert_cache.get_certs())
+
+    def test_unknown_key_forces_a_refresh(self) -> None:
+        cert_cache = self.build_cache()
+        cert_cache.get_certs()
+        self.server.body = {'key-2': self.rotated_certificate}
+        cache.clear()
+        self.clock.now += 31
+
+        self.assertEqual(cert_cache.verify(build_token(self.rotated_signer))['email'], 'user@example.com')
+        self.assertEqual(self.server.requests, 2)
+
+        # Tokens with made-up key ids cannot make every request call Google.
+        unknown_signer, _ = build_key('key-3')
+        with self.assertRaises(ValueError):
+            cert_cache.verify(build_token(unknown_signer))
+        with self.assertRaises(ValueError):
+            cert_cache.verify(build_token(unknown_signer))
+        self.assertEqual(self.server.requests, 2)
+
+    def test_invalid_tokens_are_rejected(self) -> None:
+        cert_cache = self.build_cache()
+        forged_signer, _ = build_key('key-1')
+
+        with self.assertRaises(ValueError):
+            cert_cache.verify(build_token(forged_signer))
+        with self.assertRaises(ValueError):
+            cert_cache.verify(build_token(self.signer, iss='https://evil.example.com'))
+        with self.assertRaises(ValueError):
+            cert_cache.verify(build_token(self.signer, exp=int(time.time()) - 3600))
+        with self.assertRaises(ValueError):
+            cert_cache.verify('not-a-token')
+        self.assertEqual(self.server.requests, 1)
+
+    def test_unreachable_server_keeps_the_cached_certs(self) -> None:
+        cert_cache = self.build_cache()
+        cert_cache.get_certs()
+        self.server.status = 500
+        cache.clear()
+        self.clock.now += 601
+
+        self.assertEqual(cert_cache.verify(build_token(self.signer))['email'], 'user@example.com')
+        self.assertEqual(self.server.requests, 2)
+
+    def test_unreachable_server_without_certs_raises(self) -> None:
+        self.server.status = 500
+
+        with self.assertRaises(exceptions.TransportError):
+            self.build_cache().get_certs()
+
+
+class LoginGoogleViewTests(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        self.signer, certificate = build_key('key-1')
+        self.server = JSONHTTPStandIn({'key-1': certificate}, headers={'Cache-Control': 'max-age=600'})
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        settings = override_settings(GOOGLE_OAUTH2_CERTS_URL=self.server.url)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        patcher = mock.patch.object(google_certs, '_cert_cache', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post(self, token: str):
+        request = APIRequestFactory().post('/api/login-google/', {'token': token}, format='json')
+        return LoginGoogleView.as_view()(request)
+
+    def test_existing_user_gets_tokens(self) -> None:
+        user = UserFactory()
+
+        for _ in range(2):
+            response = self.post(build_token(self.signer, email=user.email))
+            self.assertEqual(response.status_code, 200)
+            self.assertIn('access', response.data)
+
+        self.assertEqual(self.server.requests, 1)
+
+    def test_unknown_user_is_rejected(self) -> None:
+        self.assertEqual(self.post(build_token(self.signer, email='nobody@example.com')).status_code, 404)
+
+    def test_invalid_token_is_rejected(self) -> None:
+        self.assertEqual(self.post('not-a-token').status_code, 400)
+
+    def test_unreachable_cert_server_is_reported(self) -> None:
+        self.server.status = 500
+
+        self.assertEqual(self.post(build_token(self.signer)).status_code, 503)
@@ -0,0 +1,171 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import hashers
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.membership import hashing
+from apps.membership.api_views import LoginView, PasswordHashingStatsView
+from apps.membership.exceptions import PasswordHashingBusyException
+from apps.membership.hashing import PasswordHashingPool
+from apps.membership.models import User
+from apps.membership.tests.factories import StaffUserFactory, UserFactory
+from apps.utils.tests.benchmarks import benchmark, measure, report
+
+ARGON2_PREFIX = 'argon2$argon2id$v=19$m=19456,t=2,p=1$'
+
+PASSWORD = 'password123'  # noqa S105
+
+
+class PasswordHashingPoolTests(SimpleTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.pool = PasswordHashingPool(max_workers=1, max_queue=1, queue_timeout=0.05)
+        self.addCleanup(self.pool.shutdown)
+
+    def test_hashing_runs_on_a_pool_thread(self) -> None:
+        self.assertTrue(self.pool.run(lambda: threading.current_thread().name).startswith('password-hashing'))
+        self.assertEqual(self.pool.stats()['completed'], 1)
+
+    def test_full_queue_rejects_new_requests(self) -> None:
+        release = threading.Event()
+        running = self.pool._start(release.wait)
+        self.pool._slots.acquire()
+        queued = self.pool._start(lambda: 'queued')
+        self.pool._slots.acquire()
+
+        self.assertEqual(self.pool.stats()['queued'], 1)
+        with self.assertRaises(PasswordHashingBusyException):
+            self.pool.run(lambda: 'rejected')
+        with self.assertRaises(PasswordHashingBusyException):
+            async_to_sync(self.pool.arun)(lambda: 'rejected')
+
+        release.set()
+        running.result()
+        self.assertEqual(queued.result(), 'queued')
+        stats = self.pool.stats()
+        self.assertEqual(stats['rejected'], 2)
+        self.assertEqual(stats['max_queued'], 1)
+        self.assertEqual(stats['queued'], 0)
+        self.assertEqual(self.pool.run(lambda: 'accepted'), 'accepted')
+
+    def test_arun_is_awaitable(self) -> None:
+        self.assertEqual(async_to_sync(self.pool.arun)(sum, [1, 2]), 3)
+
+
+class PasswordRehashTests(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        patcher = mock.patch.object(hashing, '_pool', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.user = UserFactory()
+        User.objects.filter(pk=self.user.pk).update(password=hashers.make_password(PASSWORD, hasher='pbkdf2_sha256'))
+        self.user.refresh_from_db()
+
+    def test_new_passwords_use_argon2(self) -> None:
+        self.user.set_password(PASSWORD)
+        self.assertTrue(self.user.password.startswith(ARGON2_PREFIX))
+
+    def test_pbkdf2_hash_is_upgraded_on_login(self) -> None:
+        self.assertTrue(self.user.check_password(PASSWORD))
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith(ARGON2_PREFIX))
+        self.assertTrue(self.user.check_password(PASSWORD))
+
+    def test_wrong_password_keeps_the_hash(self) -> None:
+        password = self.user.password
+
+        self.assertFalse(self.user.check_password('wrong'))
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.password, password)
+
+    def test_async_check_upgrades_the_hash(self) -> None:
+        self.assertTrue(async_to_sync(self.user.acheck_password)(PASSWORD))
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith(ARGON2_PREFIX))
+
+    @override_settings(PASSWORD_HASHING_POOL_ENABLED=False)
+    def test_disabled_pool_hashes_inline(self) -> None:
+        self.assertIsNone(hashing.get_password_hashing_pool())
+        self.assertTrue(self.user.check_password(PASSWORD))
+
+    def test_login_view_upgrades_the_hash(self) -> None:
+        cache.clear()
+        request = APIRequestFactory().post(
+            '/api/login/', {'email': self.user.email, 'password': PASSWORD}, format='json'
+        )
+
+        response = LoginView.as_view()(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith(ARGON2_PREFIX))
+        self.assertGreaterEqual(hashing.get_password_hashing_pool().stats()['completed'], 2)
+
+    def test_busy_pool_answers_the_admin_login_with_503(self) -> None:
+        busy = mock.patch.object(PasswordHashingPool, 'run', side_effect=PasswordHashingBusyException)
+        with busy, override_settings(PASSWORD_HASHING_POOL_ENABLED=True):
+            response = self.client.post(reverse('admin:login'), {'username': self.user.email, 'password': PASSWORD})
+
+        self.assertEqual(response.status_code, 503)
+
+    def test_stats_are_visible_to_staff_only(self) -> None:
+        self.user.check_password(PASSWORD)
+        factory = APIRequestFactory()
+
+        request = factory.get('/api/password-hashing-stats/')
+        force_authenticate(request, user=self.user)
+        self.assertEqual(PasswordHashingStatsView.as_view()(request).status_code, 403)
+
+        request = factory.get('/api/password-hashing-stats/')
+        force_authenticate(request, user=StaffUserFactory())
+        response = PasswordHashingStatsView.as_view()(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['enabled'])
+        self.assertEqual(response.data['queued'], 0)
+        self.assertGreater(response.data['completed'], 0)
+
+
+class PasswordHashingBenchmarks(SimpleTestCase):
+    concurrency = 8
+    logins = 64
+
+    def concurrent_logins(self) -> None:
+        users = [User(email=f'user{i}@example.com', password=self.encoded) for i in range(self.logins)]
+        with ThreadPoolExecutor(self.concurrency) as executor:
+            self.assertTrue(all(executor.map(lambda user: user.check_password(PASSWORD), users)))
+
+    def light_request(self) -> None:
+        sum(range(10_000))
+
+    def run_with_logins(self, name: str) -> None:
+        # Latency of a cheap request served while a burst of logins is being hashed.
+        results = {}
+
+        def logins() -> None:
+            results.update(measure(self.concurrent_logins, 1))
+
+        thread = threading.Thread(target=logins)
+        thread.start()
+        latency = measure(self.light_request, 200)
+        thread.join()
+        report(f'{name} logins', {'logins_per_second': self.logins / results['total_s']})
+        report(f'{name} light request during logins', latency)
+
+    @benchmark
+    def test_concurrent_logins(self) -> None:
+        self.encoded = hashers.make_password(PASSWORD)
+
+        with mock.patch.object(hashing, '_pool', None), override_settings(PASSWORD_HASHING_POOL_ENABLED=False):
+            self.run_with_logins('inline hashing')
+        with mock.patch.object(hashing, '_pool', None):
+            self.run_with_logins('pooled hashing')
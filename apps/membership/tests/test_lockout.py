@@ -0,0 +1,84 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.http import HttpRequest
+from django.test import RequestFactory, TestCase, override_settings
+
+from apps.membership.exceptions import TooManyLoginAttemptsException
+from apps.membership.forms import UserLoginForm
+from apps.membership.lockout import get_failed_login_counts, is_locked_out, register_failed_login
+from apps.membership.models import LoginAttempt
+from apps.membership.tests.factories import UserFactory
+from apps.membership.utils import FakeGeoIP2, handle_login_attempt
+
+FIREFOX_USER_AGENT = 'Mozilla/5.0 (X11; Linux x86_64; rv:128.0) Gecko/20100101 Firefox/128.0'
+
+WINDOW = 15 * 60
+
+
+@override_settings(MAX_LOGIN_ATTEMPTS=3, LOGIN_ATTEMPTS_TIMEOUT_MINUTES=15)
+class SlidingWindowLockoutTests(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        self.start = 100 * WINDOW
+
+    def test_ip_and_username_are_counted_separately(self) -> None:
+        for _ in range(3):
+            register_failed_login('10.0.0.1', 'user@example.com', now=self.start)
+
+        self.assertTrue(is_locked_out('10.0.0.1', None, now=self.start))
+        self.assertTrue(is_locked_out('10.0.0.2', 'USER@example.com', now=self.start))
+        self.assertFalse(is_locked_out('10.0.0.2', 'other@example.com', now=self.start))
+
+    def test_previous_bucket_fades_out_over_the_window(self) -> None:
+        for _ in range(3):
+            register_failed_login('10.0.0.1', None, now=self.start + WINDOW - 1)
+
+        self.assertTrue(is_locked_out('10.0.0.1', None, now=self.start + WINDOW))
+        counts = get_failed_login_counts('10.0.0.1', None, now=self.start + WINDOW + WINDOW // 3)
+        self.assertAlmostEqual(counts['ip:10.0.0.1'], 2)
+        self.assertFalse(is_locked_out('10.0.0.1', None, now=self.start + WINDOW + WINDOW // 3))
+        self.assertFalse(is_locked_out('10.0.0.1', None, now=self.start + 2 * WINDOW))
+
+
+@mock.patch('apps.membership.utils._geo_ip', FakeGeoIP2())
+@override_settings(MAX_LOGIN_ATTEMPTS=2, LOGIN_ATTEMPTS_TIMEOUT_MINUTES=15)
+class LoginFormLockoutTests(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        self.user = UserFactory(email='user@example.com', is_active=True)
+
+    def create_request(self) -> HttpRequest:
+        request = RequestFactory().post('/login/', REMOTE_ADDR='10.0.0.1', HTTP_USER_AGENT=FIREFOX_USER_AGENT)
+        return request
+
+    def login(self, password: str) -> UserLoginForm:
+        form = UserLoginForm(data={'username': 'user@example.com', 'password': password}, request=self.create_request())
+        form.is_valid()
+        return form
+
+    def test_lockout_check_makes_no_selects(self) -> None:
+        with self.assertNumQueries(0):
+            handle_login_attempt(self.create_request(), 'user@example.com')
+
+        register_failed_login('10.0.0.1', None)
+        register_failed_login('10.0.0.1', None)
+        with self.assertNumQueries(0), self.assertRaises(TooManyLoginAttemptsException):
+            handle_login_attempt(self.create_request(), 'user@example.com')
+
+    def test_failed_logins_lock_the_user_out(self) -> None:
+        self.login('wrong')
+        self.login('wrong')
+
+        form = self.login('password123')
+
+        self.assertTrue(form.has_error('__all__', 'too_many_attempts'))
+        self.assertEqual(LoginAttempt.objects.count(), 2)
+        self.assertFalse(LoginAttempt.objects.filter(has_logged_in=True).exists())
+
+    def test_successful_login_is_not_counted(self) -> None:
+        self.assertTrue(self.login('password123').is_valid())
+        self.assertTrue(self.login('password123').is_valid())
+        self.assertTrue(self.login('password123').is_valid())
@@ -0,0 +1,135 @@
+import threading
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+
+from apps.membership.forms import UserLoginForm
+from apps.membership.login_attempts import LoginAttemptBuffer, get_login_attempt_buffer
+from apps.membership.models import LoginAttempt
+from apps.membership.tests.factories import UserFactory
+from apps.membership.utils import FakeGeoIP2
+
+FIREFOX_USER_AGENT = 'Mozilla/5.0 (X11; Linux x86_64; rv:128.0) Gecko/20100101 Firefox/128.0'
+
+
+def build_attempt(number: int) -> LoginAttempt:
+    return LoginAttempt(username=f'user-{number}@example.com', attempted_at=timezone.now())
+
+
+class RecordingBuffer(LoginAttemptBuffer):
+    """
+    Buffer saving batches in memory, so the flusher thread does not need a database connection.
+    """
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.batches = []
+        self.written = threading.Event()
+
+    def _write(self, batch: list) -> None:
+        self.batches.append(batch)
+        self.written.set()
+
+
+class LoginAttemptBufferTests(TestCase):
+    def test_flush_saves_batches_with_bulk_create(self) -> None:
+        buffer = LoginAttemptBuffer(batch_size=2, flush_interval=60)
+        for number in range(5):
+            buffer.add(build_attempt(number))
+
+        with self.assertNumQueries(3):
+            self.assertEqual(buffer.flush(), 5)
+
+        self.assertEqual(LoginAttempt.objects.count(), 5)
+        self.assertEqual(len(buffer), 0)
+        buffer.close()
+
+    def test_full_batch_wakes_the_flusher(self) -> None:
+        buffer = RecordingBuffer(batch_size=3, flush_interval=60)
+        for number in range(3):
+            buffer.add(build_attempt(number))
+
+        self.assertTrue(buffer.written.wait(timeout=5))
+        self.assertEqual([len(batch) for batch in buffer.batches], [3])
+        buffer.close()
+
+    def test_flush_interval_saves_partial_batches(self) -> None:
+        buffer = RecordingBuffer(batch_size=100, flush_interval=0.05)
+        buffer.add(build_attempt(0))
+
+        self.assertTrue(buffer.written.wait(timeout=5))
+        self.assertEqual(len(buffer.batches[0]), 1)
+        buffer.close()
+
+    def test_close_flushes_remaining_attempts(self) -> None:
+        buffer = RecordingBuffer(batch_size=100, flush_interval=60)
+        buffer.add(build_attempt(0))
+        buffer.close()
+
+        self.assertEqual(len(buffer.batches), 1)
+
+    def test_close_can_discard_remaining_attempts(self) -> None:
+        buffer = RecordingBuffer(batch_size=100, flush_interval=60, flush_on_shutdown=False)
+        buffer.add(build_attempt(0))
+        buffer.close()
+
+        self.assertEqual(buffer.batches, [])
+        self.assertEqual(len(buffer), 0)
+
+    def test_failed_batch_is_kept_for_the_next_flush(self) -> None:
+        buffer = LoginAttemptBuffer(batch_size=10, flush_interval=60)
+        buffer.add(build_attempt(0))
+        buffer._write = lambda batch: 1 / 0
+
+        with self.assertRaises(ZeroDivisionError):
+            buffer.flush()
+
+        self.assertEqual(len(buffer), 1)
+        del buffer._write
+        buffer.close()
+        self.assertEqual(LoginAttempt.objects.count(), 1)
+
+    def test_oldest_attempts_are_dropped_when_full(self) -> None:
+        buffer = RecordingBuffer(batch_size=100, flush_interval=60, max_size=2)
+        for number in range(3):
+            buffer.add(build_attempt(number))
+        buffer.close()
+
+        self.assertEqual(buffer.dropped, 1)
+        self.assertEqual(
+            [attempt.username for attempt in buffer.batches[0]], ['user-1@example.com', 'user-2@example.com']
+        )
+
+
+@mock.patch('apps.membership.utils._geo_ip', FakeGeoIP2())
+@override_settings(LOGIN_ATTEMPTS_WRITE_BEHIND=True, LOGIN_ATTEMPTS_FLUSH_INTERVAL_SECONDS=60)
+class WriteBehindLoginTests(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        UserFactory(email='user@example.com', is_active=True)
+
+    def tearDown(self) -> None:
+        get_login_attempt_buffer().flush()
+        super().tearDown()
+
+    def login(self, password: str) -> UserLoginForm:
+        request = RequestFactory().post('/login/', REMOTE_ADDR='10.0.0.1', HTTP_USER_AGENT=FIREFOX_USER_AGENT)
+        form = UserLoginForm(data={'username': 'user@example.com', 'password': password}, request=request)
+        form.is_valid()
+        return form
+
+    def test_login_does_not_write_login_attempts(self) -> None:
+        # Only the user is read to authenticate.
+        with self.assertNumQueries(1):
+            self.assertTrue(self.login('password123').is_valid())
+
+        self.login('wrong')
+        get_login_attempt_buffer().flush()
+
+        self.assertEqual(
+            list(LoginAttempt.objects.order_by('id').values_list('has_logged_in', flat=True)), [True, False]
+        )
+        self.assertEqual(LoginAttempt.objects.filter(user__isnull=False).count(), 1)
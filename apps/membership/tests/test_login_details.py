@@ -0,0 +1,112 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.membership.login_attempts import record_login_attempt
+from apps.membership.login_details import lookup_id_cache, resolve_login_attempt_details
+from apps.membership.models import GeoLocation, LoginAttempt, UserAgent
+from apps.membership.tests.factories import StaffUserFactory
+
+WARSAW = {
+    'city': 'Warsaw',
+    'country_code': 'PL',
+    'country_name': 'Poland',
+    'region': '14',
+    'latitude': 52.2,
+    'longitude': 21.0,
+}
+FIREFOX = {'os': {'family': 'Linux', 'os_version': ''}, 'browser': {'family': 'Firefox', 'browser_version': '128'}}
+
+
+def build_attempt(geo_data=None, device_info=None) -> LoginAttempt:
+    login_attempt = LoginAttempt(username='user@example.com', attempted_at=timezone.now())
+    login_attempt.geo_data = geo_data
+    login_attempt.device_info = device_info
+    return login_attempt
+
+
+class LoginAttemptDetailsTests(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        lookup_id_cache.clear()
+
+    def test_details_are_deduplicated(self) -> None:
+        attempts = [build_attempt(WARSAW, FIREFOX) for _ in range(3)] + [build_attempt({'errors': ['x']}, FIREFOX)]
+
+        # An INSERT and a SELECT per lookup table, for the whole batch.
+        with self.assertNumQueries(4):
+            resolve_login_attempt_details(attempts)
+        LoginAttempt.objects.bulk_create(attempts)
+
+        geo_location = GeoLocation.objects.get()
+        self.assertEqual((geo_location.city, geo_location.country, geo_location.latitude), ('Warsaw', 'Poland', 52.2))
+        self.assertEqual(UserAgent.objects.get().browser_family, 'Firefox')
+        self.assertEqual(LoginAttempt.objects.filter(geo_location=geo_location).count(), 3)
+        self.assertEqual(LoginAttempt.objects.filter(user_agent__browser_family='Firefox').count(), 4)
+
+    def test_known_details_are_resolved_from_the_cache(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            resolve_login_attempt_details([build_attempt(WARSAW, FIREFOX)])
+
+        attempt = build_attempt(WARSAW, FIREFOX)
+        with self.assertNumQueries(0):
+            resolve_login_attempt_details([attempt])
+        self.assertEqual(attempt.geo_location_id, GeoLocation.objects.get().pk)
+
+    def test_existing_rows_are_reused(self) -> None:
+        user_agent = UserAgent.objects.create(
+            browser_family='Firefox', browser_version='128', os_family='Linux', os_version=''
+        )
+
+        attempt = build_attempt(device_info=FIREFOX)
+        resolve_login_attempt_details([attempt])
+
+        self.assertEqual(attempt.user_agent_id, user_agent.pk)
+        self.assertIsNone(attempt.geo_location_id)
+        self.assertEqual(UserAgent.objects.count(), 1)
+
+    def test_recorded_attempt_references_its_details(self) -> None:
+        record_login_attempt(build_attempt(WARSAW, FIREFOX))
+
+        login_attempt = LoginAttempt.objects.select_related('geo_location', 'user_agent').get()
+        self.assertEqual(login_attempt.city, 'Warsaw')
+        self.assertEqual(str(login_attempt.user_agent), 'Firefox 128 (Linux)')
+
+
+class LoginAttemptAdminTests(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        lookup_id_cache.clear()
+        attempts = [build_attempt(WARSAW, FIREFOX), build_attempt({**WARSAW, 'city': 'Krakow'}, FIREFOX)]
+        resolve_login_attempt_details(attempts)
+        LoginAttempt.objects.bulk_create(attempts)
+        self.warsaw_attempt, self.krakow_attempt = attempts
+        self.client.force_login(StaffUserFactory(is_superuser=True))
+        self.url = reverse('admin:membership_loginattempt_changelist')
+
+    def listed_attempts(self, **params) -> set[int]:
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return {attempt.pk for attempt in response.context['cl'].result_list}
+
+    def test_filter_choices_come_from_the_lookup_tables(self) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+
+        choice_queries = [query['sql'] for query in queries.captured_queries if 'DISTINCT' in query['sql']]
+        self.assertTrue(any('"city"' in sql for sql in choice_queries))
+        self.assertTrue(any('"browser_family"' in sql for sql in choice_queries))
+        # Only the date hierarchy reads distinct values from the attempts.
+        self.assertEqual(len([sql for sql in choice_queries if 'membership_loginattempt' in sql]), 1)
+        self.assertEqual(self.listed_attempts(city='Warsaw'), {self.warsaw_attempt.pk})
+        self.assertEqual(
+            self.listed_attempts(browser_family='Firefox'), {self.warsaw_attempt.pk, self.krakow_attempt.pk}
+        )
+
+    def test_city_and_browser_family_are_searched_through_the_lookup_tables(self) -> None:
+        self.assertEqual(self.listed_attempts(q='krakow'), {self.krakow_attempt.pk})
+        self.assertEqual(self.listed_attempts(q='firefox'), {self.warsaw_attempt.pk, self.krakow_attempt.pk})
+        self.assertEqual(self.listed_attempts(q='user@example'), {self.warsaw_attempt.pk, self.krakow_attempt.pk})
+        self.assertEqual(self.listed_attempts(q='Gdansk'), set())
@@ -0,0 +1,159 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.membership import outbox
+from apps.membership.models import OutboundEmail
+from apps.membership.outbox import claim_batch, enqueue_email, send_pending_emails
+from apps.utils.tests.smtp import SMTPStandIn
+
+
+@override_settings(OUTBOUND_EMAIL_RETRY_DELAY_SECONDS=60, OUTBOUND_EMAIL_MAX_ATTEMPTS=3)
+class OutboxTests(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.smtp = SMTPStandIn()
+        self.smtp.__enter__()
+        self.addCleanup(self.smtp.__exit__, None, None, None)
+        settings = override_settings(
+            EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+            EMAIL_HOST=self.smtp.host,
+            EMAIL_PORT=self.smtp.port,
+            EMAIL_USE_TLS=False,
+            EMAIL_USE_SSL=False,
+            EMAIL_HOST_USER=None,
+            EMAIL_HOST_PASSWORD=None,
+            EMAIL_TIMEOUT=5,
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def test_enqueue_dispatches_the_task_on_commit(self) -> None:
+        with mock.patch('apps.membership.tasks.send_outbound_emails.delay') as delay:
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                email = enqueue_email('Hello', ['user@example.com'], body='Hi')
+            delay.assert_not_called()
+
+            for callback in callbacks:
+                callback()
+        delay.assert_called_once_with()
+        self.assertEqual(email.status, OutboundEmail.Status.PENDING)
+        self.assertEqual(self.smtp.messages, [])
+
+    def test_dispatch_failure_keeps_the_email_queued(self) -> None:
+        with (
+            mock.patch('apps.membership.tasks.send_outbound_emails.delay', side_effect=ConnectionError),
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            email = enqueue_email('Hello', ['user@example.com'], body='Hi')
+
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboundEmail.Status.PENDING)
+
+    def test_batch_is_sent_over_one_connection(self) -> None:
+        for i in range(5):
+            enqueue_email(f'Hello {i}', [f'user{i}@example.com'], body='Hi')
+
+        self.assertEqual(send_pending_emails(batch_size=10), 5)
+
+        self.assertEqual(self.smtp.connections, 1)
+        self.assertCountEqual(
+            [message['To'] for message in self.smtp.messages], [f'user{i}@example.com' for i in range(5)]
+        )
+        self.assertEqual(OutboundEmail.objects.filter(status=OutboundEmail.Status.SENT).count(), 5)
+        self.assertFalse(OutboundEmail.objects.filter(sent_at__isnull=True).exists())
+
+    def test_template_is_rendered_as_html_alternative(self) -> None:
+        enqueue_email(
+            'Activate',
+            ['user@example.com'],
+            template_name='membership/email/activation_email.html',
+            context={'user': {'username': 'jan'}, 'activation_link': 'https://example.com/activate/'},
+        )
+
+        send_pending_emails()
+
+        [message] = self.smtp.messages
+        parts = {
+            part.get_content_type(): part.get_payload(decode=True).decode()
+            for part in message.walk()
+            if not part.is_multipart()
+        }
+        self.assertIn('Hello jan', parts['text/html'])
+        self.assertIn('https://example.com/activate/', parts['text/plain'])
+        self.assertNotIn('<p>', parts['text/plain'])
+
+    def test_rejected_recipient_is_retried_with_backoff(self) -> None:
+        self.smtp.rejected_recipients.add('bounce@example.com')
+        failing = enqueue_email('Hello', ['bounce@example.com'], body='Hi')
+        delivered = enqueue_email('Hello', ['user@example.com'], body='Hi')
+
+        before = timezone.now()
+        send_pending_emails()
+
+        failing.refresh_from_db()
+        self.assertEqual(failing.status, OutboundEmail.Status.PENDING)
+        self.assertEqual(failing.attempts, 1)
+        self.assertIn('SMTPRecipientsRefused', failing.last_error)
+        self.assertGreaterEqual(failing.next_attempt_at, before + timedelta(seconds=60))
+        delivered.refresh_from_db()
+        self.assertEqual(delivered.status, OutboundEmail.Status.SENT)
+        self.assertEqual(self.smtp.connections, 1)
+
+        # Not due yet, so nothing is claimed until the backoff has passed.
+        self.assertEqual(send_pending_emails(), 0)
+        later = failing.next_attempt_at + timedelta(seconds=1)
+        with mock.patch.object(outbox.timezone, 'now', return_value=later):
+            send_pending_emails()
+        failing.refresh_from_db()
+        self.assertEqual(failing.attempts, 2)
+        self.assertGreaterEqual(failing.next_attempt_at, later + timedelta(seconds=120))
+
+    def test_temporary_failure_is_retried(self) -> None:
+        self.smtp.fail_next = 1
+        email = enqueue_email('Hello', ['user@example.com'], body='Hi')
+
+        send_pending_emails()
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboundEmail.Status.PENDING)
+
+        OutboundEmail.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now())
+        send_pending_emails()
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboundEmail.Status.SENT)
+        self.assertEqual(email.attempts, 2)
+        self.assertEqual(email.last_error, '')
+        self.assertEqual(len(self.smtp.messages), 1)
+
+    def test_email_is_dead_lettered_after_max_attempts(self) -> None:
+        self.smtp.rejected_recipients.add('bounce@example.com')
+        email = enqueue_email('Hello', ['bounce@example.com'], body='Hi')
+
+        for _ in range(3):
+            OutboundEmail.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now())
+            send_pending_emails()
+
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboundEmail.Status.DEAD)
+        self.assertEqual(email.attempts, 3)
+        OutboundEmail.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now())
+        self.assertEqual(send_pending_emails(), 0)
+
+    def test_unreachable_server_retries_the_whole_batch(self) -> None:
+        enqueue_email('Hello', ['user@example.com'], body='Hi')
+        enqueue_email('Hello', ['other@example.com'], body='Hi')
+        self.smtp.__exit__(None, None, None)
+
+        self.assertEqual(send_pending_emails(), 2)
+        self.assertFalse(OutboundEmail.objects.exclude(status=OutboundEmail.Status.PENDING).exists())
+        self.assertFalse(OutboundEmail.objects.exclude(attempts=1).exists())
+
+    def test_claimed_emails_are_leased(self) -> None:
+        enqueue_email('Hello', ['user@example.com'], body='Hi')
+
+        self.assertEqual(len(claim_batch(10)), 1)
+        self.assertEqual(claim_batch(10), [])
+        with override_settings(OUTBOUND_EMAIL_LEASE_SECONDS=300):
+            self.assertEqual(len(claim_batch(10, now=timezone.now() + timedelta(seconds=301))), 1)
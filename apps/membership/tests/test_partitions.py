@@ -0,0 +1,105 @@
+import unittest
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from apps.membership.models import LoginAttempt
+from apps.membership.partitions import (
+    DEFAULT_PARTITION,
+    add_months,
+    create_partitions,
+    delete_before,
+    get_partition_name,
+    get_partitions,
+    is_partitioned,
+    month_start,
+)
+
+
+class PartitionNameTests(SimpleTestCase):
+    def test_months_are_added_across_years(self) -> None:
+        self.assertEqual(add_months(date(2026, 11, 1), 3), date(2027, 2, 1))
+        self.assertEqual(add_months(date(2026, 1, 1), -1), date(2025, 12, 1))
+        self.assertEqual(month_start(date(2026, 10, 18)), date(2026, 10, 1))
+
+    def test_partition_name(self) -> None:
+        self.assertEqual(get_partition_name(date(2026, 3, 1)), 'membership_loginattempt_p2026_03')
+
+
+class LoginAttemptRetentionTests(TestCase):
+    def create_attempts(self, attempted_at: datetime, count: int) -> None:
+        LoginAttempt.objects.bulk_create(
+            LoginAttempt(username='user@example.com', attempted_at=attempted_at) for _ in range(count)
+        )
+
+    def test_expired_attempts_are_deleted_in_batches(self) -> None:
+        cutoff = datetime(2026, 1, 1, tzinfo=dt_timezone.utc)
+        self.create_attempts(cutoff - timedelta(days=1), 5)
+        self.create_attempts(cutoff, 2)
+
+        # A SELECT and a DELETE per batch of two, and a final empty SELECT.
+        with self.assertNumQueries(7):
+            deleted = delete_before(cutoff, batch_size=2)
+
+        self.assertEqual(deleted, 5)
+        self.assertQuerySetEqual(
+            LoginAttempt.objects.values_list('attempted_at', flat=True), [cutoff, cutoff], ordered=False
+        )
+
+    def test_command_deletes_attempts_older_than_the_retention(self) -> None:
+        self.create_attempts(timezone.now() - timedelta(days=40), 3)
+        self.create_attempts(timezone.now() - timedelta(days=10), 1)
+
+        stdout = StringIO()
+        call_command('rotate_login_attempts', retention_days=30, batch_size=2, stdout=stdout)
+
+        self.assertEqual(LoginAttempt.objects.count(), 1)
+        self.assertIn('Deleted 3 login attempts', stdout.getvalue())
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', 'Partitioning needs PostgreSQL.')
+class PartitionedLoginAttemptsTests(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        call_command('partition_login_attempts', months_ahead=0, stdout=StringIO())
+        self.current_month = month_start(timezone.now().astimezone(dt_timezone.utc).date())
+
+    def count_rows(self, table: str) -> int:
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT COUNT(*) FROM {connection.ops.quote_name(table)}')  # noqa S608
+            return cursor.fetchone()[0]
+
+    def test_command_partitions_the_table(self) -> None:
+        self.assertTrue(is_partitioned())
+        self.assertEqual(list(get_partitions()), [self.current_month])
+
+        call_command('partition_login_attempts', revert=True, stdout=StringIO())
+        self.assertFalse(is_partitioned())
+
+    def test_attempts_in_the_default_partition_are_moved_to_new_partitions(self) -> None:
+        later_month = add_months(self.current_month, 2)
+        attempted_at = datetime(later_month.year, later_month.month, 2, tzinfo=dt_timezone.utc)
+        LoginAttempt.objects.bulk_create(
+            LoginAttempt(username='user@example.com', attempted_at=attempted_at) for _ in range(3)
+        )
+        self.assertEqual(self.count_rows(DEFAULT_PARTITION), 3)
+
+        created = create_partitions(self.current_month, later_month)
+
+        self.assertEqual(
+            created, [get_partition_name(add_months(self.current_month, 1)), get_partition_name(later_month)]
+        )
+        self.assertEqual(self.count_rows(DEFAULT_PARTITION), 0)
+        self.assertEqual(self.count_rows(get_partition_name(later_month)), 3)
+        self.assertEqual(LoginAttempt.objects.filter(attempted_at=attempted_at).count(), 3)
+
+
+@unittest.skipIf(connection.vendor == 'postgresql', 'Partitioning is supported on PostgreSQL.')
+class PartitionCommandTests(SimpleTestCase):
+    def test_other_databases_are_rejected(self) -> None:
+        with self.assertRaises(CommandError):
+            call_command('partition_login_attempts', stdout=StringIO())
@@ -0,0 +1,136 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from apps.membership.models import GeoLocation, LoginAttempt, LoginAttemptRollup
+from apps.membership.rollups import (
+    backfill_rollups,
+    build_login_dashboard,
+    get_login_dashboard,
+    refresh_rollups,
+    rollup_range,
+)
+from apps.membership.tests.factories import StaffUserFactory
+
+# 12:00 in Warsaw (TIME_ZONE), two hours ahead of UTC in October.
+NOON = datetime(2026, 10, 14, 10, tzinfo=dt_timezone.utc)
+
+
+class LoginAttemptRollupTests(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        self.warsaw = GeoLocation.objects.create(country_code='PL', city='Warsaw')
+        self.krakow = GeoLocation.objects.create(country_code='PL', city='Krakow')
+
+    def create_attempt(self, attempted_at: datetime, ip: str, has_logged_in: bool = False, geo_location=None) -> None:
+        LoginAttempt.objects.create(
+            username='user@example.com',
+            attempted_at=attempted_at,
+            ip=ip,
+            has_logged_in=has_logged_in,
+            geo_location=geo_location,
+        )
+
+    def get_rollup(self, granularity: str, period_start: datetime) -> LoginAttemptRollup:
+        return LoginAttemptRollup.objects.get(granularity=granularity, period_start=period_start)
+
+    def test_hourly_and_daily_counts(self) -> None:
+        self.create_attempt(NOON, '10.0.0.1', True, self.warsaw)
+        self.create_attempt(NOON + timedelta(minutes=5), '10.0.0.1', geo_location=self.warsaw)
+        self.create_attempt(NOON + timedelta(minutes=10), '10.0.0.2', geo_location=self.krakow)
+        self.create_attempt(NOON + timedelta(hours=1), '10.0.0.3')
+
+        rollup_range(NOON, NOON + timedelta(hours=2))
+
+        noon = self.get_rollup('hour', NOON)
+        self.assertEqual((noon.attempts, noon.successes, noon.failures, noon.unique_ips), (3, 1, 2, 2))
+        self.assertEqual(noon.top_cities, [['Warsaw', 2], ['Krakow', 1]])
+        self.assertEqual(self.get_rollup('hour', NOON + timedelta(hours=1)).attempts, 1)
+
+        # The local day starts at 22:00 UTC of the previous day.
+        day = self.get_rollup('day', datetime(2026, 10, 13, 22, tzinfo=dt_timezone.utc))
+        self.assertEqual((day.attempts, day.successes, day.failures, day.unique_ips), (4, 1, 3, 3))
+
+    def test_refresh_recomputes_the_latest_hours(self) -> None:
+        self.create_attempt(NOON, '10.0.0.1')
+        refresh_rollups(now=NOON + timedelta(minutes=30))
+        self.assertEqual(self.get_rollup('hour', NOON).attempts, 1)
+
+        # Saved late by a write-behind buffer, after the rollup of its hour.
+        self.create_attempt(NOON + timedelta(minutes=20), '10.0.0.2')
+        self.create_attempt(NOON + timedelta(hours=1), '10.0.0.2')
+        refresh_rollups(now=NOON + timedelta(hours=1, minutes=5))
+
+        self.assertEqual(self.get_rollup('hour', NOON).attempts, 2)
+        self.assertEqual(self.get_rollup('hour', NOON + timedelta(hours=1)).attempts, 1)
+        self.assertEqual(LoginAttemptRollup.objects.filter(granularity='day').get().attempts, 3)
+
+    def test_refresh_after_quiet_hours_starts_from_the_previous_refresh(self) -> None:
+        self.create_attempt(NOON, '10.0.0.1')
+        refresh_rollups(now=NOON + timedelta(minutes=30))
+        # Quiet hours: no attempts, so no hourly rollup after noon.
+        refresh_rollups(now=NOON + timedelta(hours=5))
+
+        with mock.patch('apps.membership.rollups.rollup_range', return_value=0) as rollup_range_mock:
+            refresh_rollups(now=NOON + timedelta(hours=5, minutes=5))
+
+        rollup_range_mock.assert_called_once_with(NOON + timedelta(hours=4), NOON + timedelta(hours=5, minutes=5))
+
+    def test_backfill_matches_a_single_pass(self) -> None:
+        for day in range(4):
+            for hour in range(0, 24, 5):
+                self.create_attempt(NOON - timedelta(days=day, hours=hour), f'10.0.{day}.{hour}', hour % 2 == 0)
+        end = NOON + timedelta(hours=1)
+
+        rollup_range(NOON - timedelta(days=5), end)
+        expected = list(
+            LoginAttemptRollup.objects.order_by('granularity', 'period_start').values(
+                'granularity', 'period_start', 'attempts', 'successes', 'unique_ips'
+            )
+        )
+        LoginAttemptRollup.objects.all().delete()
+
+        self.assertEqual(backfill_rollups(end=end, chunk_days=1), len(expected))
+        self.assertEqual(
+            list(
+                LoginAttemptRollup.objects.order_by('granularity', 'period_start').values(
+                    'granularity', 'period_start', 'attempts', 'successes', 'unique_ips'
+                )
+            ),
+            expected,
+        )
+
+    def test_dashboard_totals(self) -> None:
+        self.create_attempt(NOON, '10.0.0.1', True, self.warsaw)
+        self.create_attempt(NOON - timedelta(days=1), '10.0.0.2', geo_location=self.warsaw)
+        self.create_attempt(NOON - timedelta(days=1), '10.0.0.2', geo_location=self.krakow)
+        rollup_range(NOON - timedelta(days=1), NOON + timedelta(hours=1))
+
+        dashboard = build_login_dashboard(now=NOON + timedelta(minutes=30))
+
+        self.assertEqual(dashboard['totals'], {'attempts': 3, 'successes': 1, 'failures': 2})
+        self.assertEqual(dashboard['top_cities'], [('Warsaw', 2), ('Krakow', 1)])
+        self.assertEqual([row['attempts'] for row in dashboard['days']], [1, 2])
+        self.assertEqual([row['attempts'] for row in dashboard['hours']], [1])
+
+    def test_dashboard_is_cached_until_the_rollups_are_refreshed(self) -> None:
+        get_login_dashboard()
+        with self.assertNumQueries(0):
+            get_login_dashboard()
+
+        refresh_rollups()
+        with self.assertNumQueries(2):
+            get_login_dashboard()
+
+    def test_dashboard_view(self) -> None:
+        self.client.force_login(StaffUserFactory(is_superuser=True))
+        refresh_rollups()
+
+        response = self.client.get(reverse('admin:membership_loginattemptrollup_dashboard'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Login dashboard')
@@ -0,0 +1,148 @@
+import multiprocessing
+import os
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import redis
+from django.core.cache import cache
+from django.core.cache.backends.redis import RedisCache
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from apps.membership import throttling
+from apps.membership.throttling import CacheGCRAStore, LoginRateThrottle, RedisGCRAStore
+
+# A Redis server to run the cross-process test against, e.g. redis://localhost:6379/15.
+TEST_REDIS_URL = os.environ.get('DJANGO_BASIC_STACK_TEST_REDIS_URL')
+
+
+def acquire_in_process(url: str, key: str, attempts: int) -> int:
+    store = RedisGCRAStore(RedisCache(url, {}), redis.Redis.from_url(url))
+    return sum(store.acquire(key, 10, 60)[0] for _ in range(attempts))
+
+
+class CacheGCRAStoreTests(SimpleTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        self.now = 1000.0
+        self.store = CacheGCRAStore(cache, clock=lambda: self.now)
+
+    def test_burst_then_one_request_per_interval(self) -> None:
+        self.assertEqual([self.store.acquire('key', 3, 60)[0] for _ in range(4)], [True, True, True, False])
+        self.assertEqual(self.store.acquire('key', 3, 60), (False, 20))
+
+        self.now += 20
+        self.assertEqual(self.store.acquire('key', 3, 60), (True, 0))
+        self.assertFalse(self.store.acquire('key', 3, 60)[0])
+
+    def test_idle_key_regains_the_full_burst(self) -> None:
+        for _ in range(3):
+            self.store.acquire('key', 3, 60)
+
+        self.now += 60
+        self.assertEqual([self.store.acquire('key', 3, 60)[0] for _ in range(4)], [True, True, True, False])
+
+    def test_limit_holds_across_threads(self) -> None:
+        store = CacheGCRAStore(cache)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            allowed = list(executor.map(lambda _: store.acquire('key', 10, 60)[0], range(80)))
+        self.assertEqual(sum(allowed), 10)
+
+    def test_lock_of_another_worker_is_waited_for_and_kept(self) -> None:
+        cache.add('key:lock', 'other-worker', 60)
+
+        with mock.patch.object(throttling, 'LOCK_WAIT_SECONDS', 0.01):
+            self.assertEqual(self.store.acquire('key', 3, 60), (False, throttling.LOCK_TIMEOUT_SECONDS))
+
+        self.assertEqual(cache.get('key:lock'), 'other-worker')
+        self.assertIsNone(cache.get('key'))
+
+    def test_lock_is_released(self) -> None:
+        self.store.acquire('key', 3, 60)
+
+        self.assertIsNone(cache.get('key:lock'))
+
+
+class RedisGCRAStoreCallTests(SimpleTestCase):
+    """
+    The Lua script itself needs a Redis server (see `RedisGCRAStoreTests`); this checks what is passed to it.
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.client = mock.Mock()
+        self.script = self.client.register_script.return_value
+        self.cache = RedisCache('redis://localhost:6379/0', {'KEY_PREFIX': 'site'})
+        self.store = RedisGCRAStore(self.cache, self.client)
+
+    def test_rate_is_passed_in_microseconds(self) -> None:
+        self.script.return_value = [1, 0]
+
+        self.assertEqual(self.store.acquire('key', 10, 60), (True, 0))
+
+        self.client.register_script.assert_called_once_with(throttling.GCRA_SCRIPT)
+        self.script.assert_called_once_with(
+            keys=[self.cache.make_and_validate_key('key')], args=[6_000_000, 60_000_000]
+        )
+
+    def test_wait_is_returned_in_seconds(self) -> None:
+        self.script.return_value = [0, 2_500_000]
+
+        self.assertEqual(self.store.acquire('key', 10, 60), (False, 2.5))
+
+    def test_client_is_built_from_the_cache_location(self) -> None:
+        caches = {
+            'default': {
+                'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+                'LOCATION': 'redis://a:6379/1,redis://b:6379/1',
+            }
+        }
+        with override_settings(CACHES=caches), mock.patch.object(redis.Redis, 'from_url') as from_url:
+            RedisGCRAStore.from_cache_settings()
+
+        from_url.assert_called_once_with('redis://a:6379/1')
+
+
+@unittest.skipUnless(TEST_REDIS_URL, 'Set DJANGO_BASIC_STACK_TEST_REDIS_URL to run the Redis throttle tests.')
+class RedisGCRAStoreTests(SimpleTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.cache = RedisCache(TEST_REDIS_URL, {})
+        self.store = RedisGCRAStore(self.cache, redis.Redis.from_url(TEST_REDIS_URL))
+        self.key = f'throttle-test-{os.getpid()}'
+        self.cache.delete(self.key)
+        self.addCleanup(self.cache.delete, self.key)
+
+    def test_burst_then_wait(self) -> None:
+        self.assertEqual([self.store.acquire(self.key, 3, 60)[0] for _ in range(4)], [True, True, True, False])
+        self.assertAlmostEqual(self.store.acquire(self.key, 3, 60)[1], 20, delta=1)
+
+    def test_limit_holds_across_processes(self) -> None:
+        with multiprocessing.get_context('fork').Pool(4) as pool:
+            allowed = pool.starmap(acquire_in_process, [(TEST_REDIS_URL, self.key, 25)] * 4)
+        self.assertEqual(sum(allowed), 10)
+
+
+class LoginRateThrottleTests(SimpleTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+
+    def test_login_rate_is_enforced_per_ip(self) -> None:
+        factory = RequestFactory()
+        request = factory.post('/', REMOTE_ADDR='10.0.0.1')
+        request.user = mock.Mock(is_authenticated=False)
+
+        with mock.patch.object(throttling, '_store', None):
+            results = [LoginRateThrottle().allow_request(request, None) for _ in range(11)]
+            throttle = LoginRateThrottle()
+            self.assertFalse(throttle.allow_request(request, None))
+            self.assertGreater(throttle.wait(), 0)
+
+            other_request = factory.post('/', REMOTE_ADDR='10.0.0.2')
+            other_request.user = request.user
+            self.assertTrue(LoginRateThrottle().allow_request(other_request, None))
+
+        # 10/minute in DEFAULT_THROTTLE_RATES.
+        self.assertEqual(results, [True] * 10 + [False])
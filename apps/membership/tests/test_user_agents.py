@@ -0,0 +1,77 @@
+from django.test import SimpleTestCase
+
+from apps.membership.user_agents import ParsedUserAgent, _parse_user_agent, parse_user_agent, user_agent_cache
+from apps.utils.tests.benchmarks import benchmark, measure, report
+
+# fmt: off
+USER_AGENTS = {
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36':
+        ParsedUserAgent('Chrome', '126.0.0', 'Windows', '10'),
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36 '
+    'Edg/126.0.2592.87':
+        ParsedUserAgent('Edge', '126.0.2592', 'Windows', '10'),
+    'Mozilla/5.0 (Windows NT 6.1; WOW64; Trident/7.0; rv:11.0) like Gecko':
+        ParsedUserAgent('IE', '11.0', 'Windows', '7'),
+    'Mozilla/5.0 (X11; Linux x86_64; rv:128.0) Gecko/20100101 Firefox/128.0':
+        ParsedUserAgent('Firefox', '128.0', 'Linux', ''),
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.5 '
+    'Safari/605.1.15':
+        ParsedUserAgent('Safari', '17.5', 'Mac OS X', '10.15.7'),
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 '
+    'Safari/537.36 OPR/111.0.0.0':
+        ParsedUserAgent('Opera', '111.0.0', 'Mac OS X', '10.15.7'),
+    'Mozilla/5.0 (iPhone; CPU iPhone OS 17_5_1 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.5 '
+    'Mobile/15E148 Safari/604.1':
+        ParsedUserAgent('Mobile Safari', '17.5', 'iOS', '17.5.1'),
+    'Mozilla/5.0 (iPad; CPU OS 16_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) CriOS/126.0.6478.54 '
+    'Mobile/15E148 Safari/604.1':
+        ParsedUserAgent('Chrome', '126.0.6478', 'iOS', '16.6'),
+    'Mozilla/5.0 (Linux; Android 14; SM-S918B) AppleWebKit/537.36 (KHTML, like Gecko) SamsungBrowser/25.0 '
+    'Chrome/121.0.0.0 Mobile Safari/537.36':
+        ParsedUserAgent('Samsung Internet', '25.0', 'Android', '14'),
+    'Mozilla/5.0 (Linux; Android 10; K) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Mobile Safari/537.36':
+        ParsedUserAgent('Chrome', '126.0.0', 'Android', '10'),
+    'Mozilla/5.0 (X11; CrOS x86_64 14541.0.0) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36':
+        ParsedUserAgent('Chrome', '126.0.0', 'Chrome OS', '14541.0.0'),
+    'Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)':
+        ParsedUserAgent('Googlebot', '2.1', 'Other', ''),
+    'curl/8.5.0':
+        ParsedUserAgent('curl', '8.5.0', 'Other', ''),
+    'python-requests/2.32.3':
+        ParsedUserAgent('python-requests', '2.32.3', 'Other', ''),
+}
+# fmt: on
+
+
+class ParseUserAgentTests(SimpleTestCase):
+    def test_real_user_agents_are_parsed(self) -> None:
+        for user_agent, expected in USER_AGENTS.items():
+            with self.subTest(user_agent=user_agent):
+                self.assertEqual(parse_user_agent(user_agent), expected)
+
+    def test_unknown_or_missing_header(self) -> None:
+        self.assertEqual(parse_user_agent(None), ParsedUserAgent('Other', '', 'Other', ''))
+        self.assertEqual(parse_user_agent('SomethingElse'), ParsedUserAgent('Other', '', 'Other', ''))
+
+    def test_repeated_headers_are_cached(self) -> None:
+        user_agent_cache.clear()
+        user_agent = next(iter(USER_AGENTS))
+
+        parse_user_agent(user_agent)
+        parse_user_agent(user_agent)
+
+        self.assertEqual((user_agent_cache.hits, user_agent_cache.misses), (1, 1))
+
+    @benchmark
+    def test_parsing_latency(self) -> None:
+        corpus = list(USER_AGENTS) * 100
+
+        def parse_uncached() -> None:
+            for user_agent in corpus:
+                _parse_user_agent(user_agent)
+
+        report(f'uncached user agent parsing ({len(corpus)} headers)', measure(parse_uncached, iterations=20))
+        report(
+            f'cached user agent parsing ({len(corpus)} headers)',
+            measure(lambda: [parse_user_agent(user_agent) for user_agent in corpus], iterations=20),
+        )
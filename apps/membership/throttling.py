@@ -1,9 +1,151 @@
+import math
+import threading
+import time
+import uuid
+from typing import Optional
+
+import redis
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
 from rest_framework.throttling import UserRateThrottle
 
+# GCRA (generic cell rate algorithm): the key holds a single number, the theoretical arrival time (TAT)
+# of the next request in microseconds. Redis' own clock is used, so every worker and node agrees on "now".
+GCRA_SCRIPT = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) * 1000000 + tonumber(now[2])
+local interval = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+local new_tat = tat + interval
+local allow_at = new_tat - period
+if now < allow_at then
+    return {0, allow_at - now}
+end
+redis.call('SET', KEYS[1], string.format('%.0f', new_tat), 'PX', math.ceil((new_tat - now) / 1000))
+return {1, 0}
+"""
+
+LOCK_TIMEOUT_SECONDS = 1
+
+# Longer than the lock timeout, so the lock of a holder that died expires while it is waited for.
+LOCK_WAIT_SECONDS = 2
+
+LOCK_RETRY_SECONDS = 0.001
+
+
+class RedisGCRAStore:
+    """
+    Runs the GCRA check and update as one Lua script, i.e. a single atomic round trip to Redis.
+    """
+
+    def __init__(self, cache_backend: RedisCache, client: redis.Redis) -> None:
+        # The cache only builds the keys, so throttle keys share its prefix and version.
+        self.cache = cache_backend
+        self._script = client.register_script(GCRA_SCRIPT)
+
+    @classmethod
+    def from_cache_settings(cls, alias: str = 'default') -> 'RedisGCRAStore':
+        location = settings.CACHES[alias]['LOCATION']
+        servers = location.split(',') if isinstance(location, str) else location
+        # Like Django's RedisCache, writes go to the first server.
+        return cls(caches[alias], redis.Redis.from_url(servers[0]))
+
+    def acquire(self, key: str, num_requests: int, duration: int) -> tuple[bool, float]:
+        period = duration * 1_000_000
+        allowed, wait = self._script(
+            keys=[self.cache.make_and_validate_key(key)], args=[period // num_requests, period]
+        )
+        return bool(allowed), wait / 1_000_000
+
+
+class CacheGCRAStore:
+    """
+    GCRA on any Django cache backend, for setups without Redis.
+
+    The read and update of a key are serialized with a lock taken with `cache.add`, so limits are shared
+    as widely as the cache itself, at the cost of a few round trips per request.
+    """
+
+    def __init__(self, cache_backend, clock=time.time) -> None:
+        self.cache = cache_backend
+        self.clock = clock
+
+    def acquire(self, key: str, num_requests: int, duration: int) -> tuple[bool, float]:
+        """
+        Fails closed: a request that cannot get the lock in time is throttled, so contention on a key,
+        e.g. a flood of logins, never lets requests through unchecked.
+        """
+        lock_key = f'{key}:lock'
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + LOCK_WAIT_SECONDS
+        while not self.cache.add(lock_key, token, LOCK_TIMEOUT_SECONDS):
+            if time.monotonic() > deadline:
+                return False, float(LOCK_TIMEOUT_SECONDS)
+            time.sleep(LOCK_RETRY_SECONDS)
+        try:
+            now = self.clock()
+            tat = max(self.cache.get(key, now), now)
+            new_tat = tat + duration / num_requests
+            allow_at = new_tat - duration
+            if now < allow_at:
+                return False, allow_at - now
+            self.cache.set(key, new_tat, math.ceil(new_tat - now))
+            return True, 0.0
+        finally:
+            # Only a lock still holding our token is released, not one taken over after ours expired.
+            # Django caches have no compare-and-delete, which leaves a tiny window between the two calls.
+            if self.cache.get(lock_key) == token:
+                self.cache.delete(lock_key)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_throttle_store():
+    """
+    The GCRA store of the default cache: a Lua script on Redis, `CacheGCRAStore` on other backends.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            cache = caches['default']
+            _store = RedisGCRAStore.from_cache_settings() if isinstance(cache, RedisCache) else CacheGCRAStore(cache)
+        return _store
+
+
+class GCRAThrottleMixin:
+    """
+    Replaces the timestamp history of DRF's `SimpleRateThrottle` with GCRA in the shared cache.
+
+    A key costs one number, whatever the rate, and the limit is the same for every worker.
+    `num_requests` requests can be made in a burst, after which one is allowed every
+    `duration / num_requests` seconds.
+    """
+
+    def allow_request(self, request, view) -> bool:
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        allowed, self._wait = get_throttle_store().acquire(self.key, self.num_requests, self.duration)
+        return allowed
+
+    def wait(self) -> Optional[float]:
+        return self._wait or None
+
 
-class LoginRateThrottle(UserRateThrottle):
+class LoginRateThrottle(GCRAThrottleMixin, UserRateThrottle):
     scope = 'login'
 
 
-class RegisterRateThrottle(UserRateThrottle):
+class RegisterRateThrottle(GCRAThrottleMixin, UserRateThrottle):
     scope = 'register'
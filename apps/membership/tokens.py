@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.membership.blacklist import get_token_blacklist
+
+
+class UserClaimsRefreshToken(RefreshToken):
+    """
+    Refresh token embedding the claims `TokenUser` reads, so stateless endpoints need no user lookup.
+
+    Access tokens derived from it, including refreshed ones, copy the claims. The blacklist is checked
+    through the Bloom filter of `apps.membership.blacklist` when `JWT_BLACKLIST_BLOOM_ENABLED` is set.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token['username'] = user.get_username()
+        token['is_staff'] = user.is_staff
+        token['is_superuser'] = user.is_superuser
+        return token
+
+    def check_blacklist(self) -> None:
+        if not settings.JWT_BLACKLIST_BLOOM_ENABLED:
+            return super().check_blacklist()
+        if get_token_blacklist().is_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_('Token is blacklisted'))
@@ -9,6 +9,7 @@ from apps.membership.api_views import (
     LoginGoogleView,
     LoginView,
     LogoutView,
+    PasswordHashingStatsView,
     ResetPasswordView,
     UserInfoView,
     UserRegistrationView,
@@ -62,4 +63,5 @@ urlpatterns = [
     ),
     path('reset-password/', ResetPasswordView.as_view(), name='reset-password'),
     path('confirm-reset-password/', ConfirmResetPasswordView.as_view(), name='confirm-reset-password'),
+    path('password-hashing-stats/', PasswordHashingStatsView.as_view(), name='password-hashing-stats'),
 ]
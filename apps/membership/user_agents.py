@@ -0,0 +1,103 @@
+import re
+from typing import NamedTuple, Optional
+
+from django.conf import settings
+
+from apps.utils.cache import LRUCache
+
+# Longer headers are truncated, so a crafted header cannot make parsing or the cache arbitrarily expensive.
+MAX_USER_AGENT_LENGTH = 512
+
+# Checked in order, the first match wins: most browsers also claim to be Chrome, Safari or Mozilla.
+BROWSER_PATTERNS = [
+    (re.compile(r'(Googlebot|bingbot|DuckDuckBot|YandexBot|Baiduspider|facebookexternalhit)/(\d[\w.]*)'), None),
+    (re.compile(r'^(curl|Wget|python-requests|PostmanRuntime|okhttp|Go-http-client)/(\d[\w.]*)'), None),
+    (re.compile(r'Edg(?:e|A|iOS)?/(\d[\d.]*)'), 'Edge'),
+    (re.compile(r'(?:OPR|Opera)/(\d[\d.]*)'), 'Opera'),
+    (re.compile(r'SamsungBrowser/(\d[\d.]*)'), 'Samsung Internet'),
+    (re.compile(r'(?:Firefox|FxiOS)/(\d[\d.]*)'), 'Firefox'),
+    (re.compile(r'(?:Chrome|CriOS)/(\d[\d.]*)'), 'Chrome'),
+    (re.compile(r'Version/(\d[\d.]*).*Mobile.*Safari/'), 'Mobile Safari'),
+    (re.compile(r'Version/(\d[\d.]*).*Safari/'), 'Safari'),
+    (re.compile(r'MSIE (\d[\d.]*)'), 'IE'),
+    (re.compile(r'Trident/.*rv:(\d[\d.]*)'), 'IE'),
+]
+
+WINDOWS_VERSIONS = {
+    '10.0': '10',
+    '6.3': '8.1',
+    '6.2': '8',
+    '6.1': '7',
+    '6.0': 'Vista',
+    '5.1': 'XP',
+}
+
+OS_PATTERNS = [
+    (re.compile(r'Windows NT (\d[\d.]*)'), 'Windows'),
+    (re.compile(r'(?:iPhone|iPad|iPod).*? OS (\d[\d_]*)'), 'iOS'),
+    (re.compile(r'Mac OS X (\d[\d_.]*)'), 'Mac OS X'),
+    (re.compile(r'Android (\d[\d.]*)'), 'Android'),
+    (re.compile(r'CrOS \S+ (\d[\d.]*)'), 'Chrome OS'),
+    (re.compile(r'Linux'), 'Linux'),
+]
+
+
+class ParsedUserAgent(NamedTuple):
+    browser_family: str
+    browser_version: str
+    os_family: str
+    os_version: str
+
+
+def _format_version(version: Optional[str]) -> str:
+    # At most major.minor.patch, so e.g. Chrome builds do not multiply the stored user agents.
+    if not version:
+        return ''
+    return '.'.join(version.replace('_', '.').split('.')[:3])
+
+
+def _parse_browser(user_agent: str) -> tuple[str, str]:
+    for pattern, family in BROWSER_PATTERNS:
+        match = pattern.search(user_agent)
+        if match is None:
+            continue
+        if family is None:
+            return match.group(1), _format_version(match.group(2))
+        return family, _format_version(match.group(1))
+    return 'Other', ''
+
+
+def _parse_os(user_agent: str) -> tuple[str, str]:
+    for pattern, family in OS_PATTERNS:
+        match = pattern.search(user_agent)
+        if match is None:
+            continue
+        version = match.group(1) if pattern.groups else ''
+        if family == 'Windows':
+            return family, WINDOWS_VERSIONS.get(version, version)
+        return family, _format_version(version)
+    return 'Other', ''
+
+
+user_agent_cache = LRUCache(max_size=settings.USER_AGENT_CACHE_SIZE)
+
+
+def _parse_user_agent(user_agent: str) -> ParsedUserAgent:
+    return ParsedUserAgent(*_parse_browser(user_agent), *_parse_os(user_agent))
+
+
+def parse_user_agent(user_agent: Optional[str]) -> ParsedUserAgent:
+    """
+    Parses the browser and operating system from a `User-Agent` header.
+
+    Results are kept in `user_agent_cache`, keyed on the raw header, so a repeated header costs a dict lookup;
+    `user_agent_cache.stats()` reports the hits and misses.
+
+    Args:
+      user_agent (str, optional): The raw header value.
+
+    Returns:
+      ParsedUserAgent: Browser and operating system families and versions, 'Other' when unknown.
+    """
+    user_agent = (user_agent or '')[:MAX_USER_AGENT_LENGTH]
+    return user_agent_cache.get_or_set(user_agent, lambda: _parse_user_agent(user_agent))
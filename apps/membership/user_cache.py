@@ -0,0 +1,70 @@
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+
+CACHE_KEY_PREFIX = 'user-cache'
+
+
+def _version_key(user_id) -> str:
+    return f'{CACHE_KEY_PREFIX}:version:{user_id}'
+
+
+def _user_key(user_id) -> str:
+    return f'{CACHE_KEY_PREFIX}:user:{user_id}'
+
+
+def _new_version() -> int:
+    # Not a counter restarting at 1, so an evicted version never matches an entry cached before it.
+    return time.time_ns()
+
+
+def bump_user_cache_version(user_id) -> None:
+    """
+    Invalidates the cached user by moving its version on; an entry of an older version is never returned.
+    """
+    try:
+        cache.incr(_version_key(user_id))
+    except ValueError:
+        cache.add(_version_key(user_id), _new_version(), None)
+
+
+def invalidate_cached_user(user_id) -> None:
+    """
+    Bumps the version now and again once the current transaction commits, so a request reading
+    the old row before the commit cannot cache it under the new version.
+    """
+    bump_user_cache_version(user_id)
+    transaction.on_commit(lambda: bump_user_cache_version(user_id))
+
+
+def get_cached_user(user_id) -> Optional[object]:
+    """
+    Returns the user with the given id, read from the cache while its version is current.
+
+    The version and the cached user are read with one `get_many` call, so a cached user costs a single
+    cache round trip and no database queries.
+
+    Returns:
+      User: The user, or None when it does not exist.
+    """
+    version_key, user_key = _version_key(user_id), _user_key(user_id)
+    values = cache.get_many([version_key, user_key])
+    version = values.get(version_key)
+    cached = values.get(user_key)
+    if version is not None and cached is not None and cached[0] == version:
+        return cached[1]
+
+    if version is None:
+        cache.add(version_key, _new_version(), None)
+        version = cache.get(version_key)
+
+    # The version is read before the row, so a change saved in between makes this entry stale at once.
+    user_model = get_user_model()
+    user = user_model.objects.filter(pk=user_id).first()
+    if user is not None and version is not None:
+        cache.set(user_key, (version, user), settings.USER_CACHE_TIMEOUT)
+    return user
@@ -1,31 +1,95 @@
+import ipaddress
+import threading
+
 from django.conf import settings
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
+from django.contrib.gis.geoip2 import GeoIP2, GeoIP2Exception
 from django.utils import timezone
 from django.utils.translation import gettext as _
 from geoip2.errors import AddressNotFoundError
 from ipware.ip import get_client_ip
 
-try:
-    from django.contrib.gis.geoip2 import GeoIP2, GeoIP2Exception
+from apps.utils.cache import LRUCache
+from .lockout import is_locked_out, register_failed_login
+from .user_agents import parse_user_agent
+
+
+class FakeGeoIP2:
+    @staticmethod
+    def city(*args, **kwargs):
+        return {'errors': ['GeoIP2Exception']}
 
-    geo_ip = GeoIP2()
-except GeoIP2Exception:
 
-    class FakeGeoIP2:
-        @staticmethod
-        def city(*args, **kwargs):
-            return {'errors': ['GeoIP2Exception']}
+_geo_ip = None
+_geo_ip_lock = threading.Lock()
 
-    if not settings.DEBUG:
-        raise
+geo_data_cache = LRUCache(max_size=settings.GEOIP_CACHE_SIZE, ttl=settings.GEOIP_CACHE_TTL_SECONDS)
+
+
+def open_geo_ip():
+    """
+    Opens the GeoIP2 database memory-mapped, so every worker process shares its pages through the page cache.
 
-    geo_ip = FakeGeoIP2()
+    Returns:
+        GeoIP2: The database reader, or a fake one in DEBUG mode when the database is missing.
+    """
+    try:
+        try:
+            return GeoIP2(cache=GeoIP2.MODE_MMAP_EXT)
+        except ValueError:
+            # The C extension of maxminddb is not installed, the pure Python reader maps the file as well.
+            return GeoIP2(cache=GeoIP2.MODE_MMAP)
+    except GeoIP2Exception:
+        if not settings.DEBUG:
+            raise
+        return FakeGeoIP2()
+
+
+def get_geo_ip():
+    """
+    Returns the GeoIP2 reader, opening it on first use instead of at import time.
+    """
+    global _geo_ip
+    if _geo_ip is None:
+        with _geo_ip_lock:
+            if _geo_ip is None:
+                _geo_ip = open_geo_ip()
+    return _geo_ip
+
+
+def get_geo_cache_key(ip):
+    """
+    Returns the key of an IP address in `geo_data_cache`: the address itself or, with `GEOIP_CACHE_BY_NETWORK`,
+    its /24 (IPv4) or /48 (IPv6) network, which nearly always shares one location.
+    """
+    if not settings.GEOIP_CACHE_BY_NETWORK:
+        return ip
+    try:
+        address = ipaddress.ip_address(ip)
+    except ValueError:
+        return ip
+    prefix_length = 24 if address.version == 4 else 48
+    return str(ipaddress.ip_network(f'{address}/{prefix_length}', strict=False))
+
+
+def lookup_geo_data(ip):
+    """
+    Looks up the geolocation of an IP address in the GeoIP2 database, bypassing the cache.
+    """
+    try:
+        data = get_geo_ip().city(ip)
+    except AddressNotFoundError:
+        data = {'errors': [_('Address not found.')]}
+    return data
 
 
 def get_geo_data(ip=None):
     """
     Retrieves geolocation data based on an IP address.
 
+    Lookups, including addresses missing from the database, are cached in `geo_data_cache`
+    for `GEOIP_CACHE_TTL_SECONDS`.
+
     Args:
         ip (str, optional): The IP address for which geolocation data is fetched.
 
@@ -34,11 +98,7 @@ def get_geo_data(ip=None):
     """
     if ip is None:
         return {}
-    try:
-        data = geo_ip.city(ip)
-    except AddressNotFoundError:
-        data = {'errors': [_('Address not found.')]}
-    return data
+    return geo_data_cache.get_or_set(get_geo_cache_key(ip), lambda: lookup_geo_data(ip))
 
 
 def get_device_info(request):
@@ -51,9 +111,10 @@ def get_device_info(request):
     Returns:
         dict: Information about the operating system and browser of the user's device.
     """
+    user_agent = parse_user_agent(request.META.get('HTTP_USER_AGENT'))
     return {
-        'os': {'family': request.user_agent.os[0], 'os_version': request.user_agent.os[2]},
-        'browser': {'family': request.user_agent.browser[0], 'browser_version': request.user_agent.browser[2]},
+        'os': {'family': user_agent.os_family, 'os_version': user_agent.os_version},
+        'browser': {'family': user_agent.browser_family, 'browser_version': user_agent.browser_version},
     }
 
 
@@ -61,42 +122,52 @@ def handle_login_attempt(request, username):
     """
     Handles login attempts and locks out a user after too many failed attempts.
 
+    The lockout is decided by the failed login counters in the cache (see `apps.membership.lockout`),
+    so no query is made. The returned `LoginAttempt` is not saved yet: it is an audit log entry passed
+    to `record_login_attempt` once the outcome of the login is known.
+
     Args:
         request (HttpRequest): HTTP request object.
         username (str): Username of the person attempting to log in.
 
     Raises:
-        TooManyLoginAttemptsException: If the user exceeds the maximum allowed login attempts.
+        TooManyLoginAttemptsException: If the IP or the username exceeds the maximum allowed login attempts.
 
     Returns:
-        LoginAttempt: The created LoginAttempt object.
+        LoginAttempt: The unsaved LoginAttempt object.
     """
     from .exceptions import TooManyLoginAttemptsException
     from .models import LoginAttempt
 
     ip, _ = get_client_ip(request)
-    attempts_count = LoginAttempt.objects.filter(
-        ip=ip,
-        has_logged_in=False,
-        attempted_at__gte=timezone.now() - timezone.timedelta(minutes=settings.LOGIN_ATTEMPTS_TIMEOUT_MINUTES),
-    ).count()
-
-    if attempts_count >= settings.MAX_LOGIN_ATTEMPTS:
+    if is_locked_out(ip, username):
         raise TooManyLoginAttemptsException
 
-    login_attempt = LoginAttempt.objects.create(
+    login_attempt = LoginAttempt(
         username=username,
         ip=ip,
         user=None,
-        browser=get_device_info(request),
         attempted_at=timezone.now(),
-        geolocation=get_geo_data(ip),
         has_logged_in=False,
     )
+    login_attempt.device_info = get_device_info(request)
+    login_attempt.geo_data = get_geo_data(ip)
 
     return login_attempt
 
 
+def handle_failed_login(request, username):
+    """
+    Counts a failed login against the client IP and the username.
+
+    Args:
+        request (HttpRequest): HTTP request object.
+        username (str): Username of the person attempting to log in.
+    """
+    ip, _ = get_client_ip(request)
+    register_failed_login(ip, username)
+
+
 class AccountActivationTokenGenerator(PasswordResetTokenGenerator):
     """
     Token generator for account activation.
@@ -1,15 +1,13 @@
 from django.contrib import messages
 from django.contrib.auth.views import LoginView
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
 from django.urls import reverse_lazy
 from django.utils.encoding import force_bytes
-from django.utils.html import strip_tags
 from django.utils.http import urlsafe_base64_encode
 from django.utils.translation import gettext as _
 from django.views.generic import FormView
 
 from apps.membership.forms import UserLoginForm, UserRegisterForm
+from apps.membership.outbox import enqueue_email
 from apps.membership.utils import activation_token
 
 
@@ -61,12 +59,13 @@ class RegisterFormView(FormView):
             reverse_lazy('activate', kwargs={'uidb64': uid, 'token': token})
         )
         subject = _('Activate Your Account')
-        message = render_to_string(
-            'membership/email/activation_email.html',
-            {
-                'user': user,
+        enqueue_email(
+            subject,
+            [user.email],
+            template_name='membership/email/activation_email.html',
+            context={
+                'user': {'username': user.get_username()},
                 'activation_link': activation_link,
             },
+            from_email='youremail@example.com',
         )
-        plain_message = strip_tags(message)
-        send_mail(subject, plain_message, 'youremail@example.com', [user.email], html_message=message)
@@ -12,6 +12,7 @@ class ProductAdmin(admin.ModelAdmin):
         'price',
         'category',
     ]
+    list_select_related = ['category']
 
 
 @admin.register(Category)
@@ -20,7 +21,10 @@ class CategoryAdmin(admin.ModelAdmin):
         'id',
         'name',
         'description',
+        'parent',
     ]
+    list_select_related = ['parent']
+    ordering = ['path']
 
 
 @admin.register(Order)
@@ -30,6 +34,7 @@ class OrderAdmin(admin.ModelAdmin):
         'user',
         'date_ordered',
     ]
+    list_select_related = ['user']
 
 
 @admin.register(OrderItem)
@@ -40,3 +45,4 @@ class OrderItemAdmin(admin.ModelAdmin):
         'order',
         'quantity',
     ]
+    list_select_related = ['product', 'order']
@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Category
+
+CATEGORY_TREE_CACHE_KEY = 'shop:category-tree'
+
+
+def build_category_tree() -> list[dict]:
+    """
+    Nested `id`, `name`, `children` dicts of all categories, read with a single query.
+
+    Ordering by path lists every parent before its children, so one pass is enough.
+    """
+    nodes: dict[int, dict] = {}
+    roots = []
+    for pk, name, parent_id in Category.objects.order_by('path').values_list('pk', 'name', 'parent_id'):
+        node = nodes[pk] = {'id': pk, 'name': name, 'children': []}
+        if parent_id is None:
+            roots.append(node)
+        else:
+            nodes[parent_id]['children'].append(node)
+    return roots
+
+
+def get_category_tree() -> list[dict]:
+    """
+    The category tree from the cache, rebuilt after it is invalidated by a category change.
+    """
+    tree = cache.get(CATEGORY_TREE_CACHE_KEY)
+    if tree is None:
+        tree = build_category_tree()
+        cache.set(CATEGORY_TREE_CACHE_KEY, tree, settings.SHOP_CATEGORY_TREE_CACHE_TIMEOUT)
+    return tree
+
+
+def invalidate_category_tree() -> None:
+    cache.delete(CATEGORY_TREE_CACHE_KEY)
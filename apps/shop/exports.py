@@ -0,0 +1,114 @@
+import csv
+import json
+from datetime import datetime
+from typing import Iterable, Iterator, Optional
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import QuerySet
+
+from .models import Order, OrderItem, Product
+
+EXPORT_RESOURCES = {
+    'orders': {
+        'model': Order,
+        'fields': ['id', 'user_id', 'date_ordered'],
+        'date_field': 'date_ordered',
+    },
+    'order-items': {
+        'model': OrderItem,
+        'fields': ['id', 'order_id', 'product_id', 'quantity', 'order__date_ordered'],
+        'date_field': 'order__date_ordered',
+    },
+    'products': {
+        'model': Product,
+        'fields': ['id', 'name', 'description', 'price', 'category_id'],
+        'date_field': None,
+    },
+}
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+def get_export_queryset(
+    resource: str,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    after: Optional[int] = None,
+) -> QuerySet:
+    """
+    Build the queryset of rows exported for a resource, ordered by primary key.
+
+    Args:
+      resource (str): One of `EXPORT_RESOURCES`.
+      date_from (datetime, optional): Export only rows ordered at or after this moment.
+      date_to (datetime, optional): Export only rows ordered before this moment.
+      after (int, optional): Resume the export after the row with this id.
+
+    Returns:
+      QuerySet: Values queryset with the exported columns.
+    """
+    config = EXPORT_RESOURCES[resource]
+    queryset = config['model'].objects.order_by('id')
+
+    date_field = config['date_field']
+    if date_field and date_from:
+        queryset = queryset.filter(**{f'{date_field}__gte': date_from})
+    if date_field and date_to:
+        queryset = queryset.filter(**{f'{date_field}__lt': date_to})
+    if after is not None:
+        queryset = queryset.filter(id__gt=after)
+
+    return queryset.values(*config['fields'])
+
+
+def iter_rows(queryset: QuerySet, chunk_size: Optional[int] = None) -> Iterator[dict]:
+    """
+    Iterate over the queryset with a server-side cursor, so memory use does not depend on the row count.
+    """
+    return queryset.iterator(chunk_size=chunk_size or settings.SHOP_EXPORT_CHUNK_SIZE)
+
+
+def iter_ndjson(rows: Iterable[dict]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder) + '\n'
+
+
+class _EchoBuffer:
+    """
+    A file-like object returning written values instead of storing them.
+    """
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def iter_csv(rows: Iterable[dict], fields: list[str]) -> Iterator[str]:
+    writer = csv.writer(_EchoBuffer())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow([row[field] for field in fields])
+
+
+def iter_export(
+    resource: str,
+    export_format: str,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    after: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+) -> Iterator[str]:
+    """
+    Stream the export of a resource line by line.
+
+    Every line carries the row `id`; the last received id can be passed as `after`
+    to resume an interrupted export.
+    """
+    queryset = get_export_queryset(resource, date_from=date_from, date_to=date_to, after=after)
+    rows = iter_rows(queryset, chunk_size)
+    if export_format == 'csv':
+        return iter_csv(rows, EXPORT_RESOURCES[resource]['fields'])
+    return iter_ndjson(rows)
@@ -0,0 +1,78 @@
+from decimal import Decimal
+
+import django_filters
+from django.conf import settings
+from django.db.models import Case, Count, IntegerField, QuerySet, Value, When
+
+from .models import Category, Product
+
+
+class ProductFilter(django_filters.FilterSet):
+    category = django_filters.ModelMultipleChoiceFilter(queryset=Category.objects.all())
+    category_tree = django_filters.ModelChoiceFilter(queryset=Category.objects.all(), method='filter_category_tree')
+    min_price = django_filters.NumberFilter(field_name='price', lookup_expr='gte')
+    max_price = django_filters.NumberFilter(field_name='price', lookup_expr='lte')
+    name = django_filters.CharFilter(field_name='name', lookup_expr='icontains')
+
+    class Meta:
+        model = Product
+        fields = ('category', 'category_tree', 'min_price', 'max_price', 'name')
+
+    def filter_category_tree(self, queryset: QuerySet, name: str, value: Category) -> QuerySet:
+        # Products of the category and all of its descendants: a range scan of the category path index.
+        return queryset.filter(category__path__startswith=value.path)
+
+
+def get_price_bucket_expression() -> Case:
+    """
+    Number of the `SHOP_PRICE_FACET_BUCKETS` bucket a product's price falls into.
+    """
+    edges = settings.SHOP_PRICE_FACET_BUCKETS
+    return Case(
+        *[When(price__lt=edge, then=Value(index)) for index, edge in enumerate(edges[1:])],
+        default=Value(len(edges) - 1),
+        output_field=IntegerField(),
+    )
+
+
+def get_product_facets(queryset: QuerySet) -> dict[str, list[dict]]:
+    """
+    Count products per category and per price bucket of an already filtered queryset.
+
+    Both facets come from one `GROUP BY category, bucket` query, which returns at most
+    categories x buckets rows and is folded into the two facets here.
+
+    Args:
+      queryset (QuerySet): The filtered products.
+
+    Returns:
+      dict: Category counts (by name) and price buckets (`min`, `max`, `count`), empty buckets included.
+    """
+    edges = settings.SHOP_PRICE_FACET_BUCKETS
+    rows = (
+        queryset.order_by()
+        .annotate(price_bucket=get_price_bucket_expression())
+        .values('category_id', 'category__name', 'price_bucket')
+        .annotate(count=Count('pk'))
+    )
+
+    categories: dict[int, dict] = {}
+    bucket_counts = [0] * len(edges)
+    for row in rows:
+        category = categories.setdefault(
+            row['category_id'], {'id': row['category_id'], 'name': row['category__name'], 'count': 0}
+        )
+        category['count'] += row['count']
+        bucket_counts[row['price_bucket']] += row['count']
+
+    return {
+        'categories': sorted(categories.values(), key=lambda category: (-category['count'], category['id'])),
+        'price': [
+            {
+                'min': Decimal(edge),
+                'max': Decimal(edges[index + 1]) if index + 1 < len(edges) else None,
+                'count': bucket_counts[index],
+            }
+            for index, edge in enumerate(edges)
+        ],
+    }
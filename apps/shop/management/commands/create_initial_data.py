@@ -1,16 +1,49 @@
-from django.core.management.base import BaseCommand
+import time
 
-from apps.shop.factories import CategoryFactory, OrderFactory, OrderItemFactory, ProductFactory, UserFactory
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.shop.search import get_search_backend
+from apps.shop.search.autocomplete import get_autocomplete_backend
+from apps.shop.seeding import SeedDataGenerator
 
 
 class Command(BaseCommand):
+    help = 'Generates a deterministic shop dataset of the requested size.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=5)
+        parser.add_argument('--categories', type=int, default=3)
+        parser.add_argument('--products', type=int, default=10)
+        parser.add_argument('--orders', type=int, default=5)
+        parser.add_argument('--items-per-order', type=int, default=3)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=5000)
+
     def handle(self, *args, **options):
-        users = [UserFactory() for _ in range(5)]
-        categories = [CategoryFactory() for _ in range(3)]
-        products = [ProductFactory(category=categories[i % 3]) for i in range(10)]
+        if any(options[name] < 0 for name in ('users', 'categories', 'products', 'orders', 'items_per_order')):
+            raise CommandError('Counts cannot be negative.')
+        if options['products'] and not options['categories']:
+            raise CommandError('Products need at least one category.')
+        if options['orders'] and not (options['users'] and options['products']):
+            raise CommandError('Orders need at least one user, category and product.')
 
-        for user in users:
-            order = OrderFactory(user=user)
-            [OrderItemFactory(product=products[i % 10], order=order) for i in range(3)]
+        generator = SeedDataGenerator(seed=options['seed'], batch_size=options['batch_size'], report=self.report)
+        user_ids = generator.create_users(options['users'])
+        category_ids = generator.create_categories(options['categories'])
+        product_ids = generator.create_products(options['products'], category_ids)
+        generator.create_orders(options['orders'], user_ids, product_ids, options['items_per_order'])
+        if product_ids:
+            # `bulk_create` sends no `post_save`, so the seeded products are indexed here.
+            self.rebuild_search_indexes()
 
         self.stdout.write(self.style.SUCCESS('Data created successfully'))
+
+    def rebuild_search_indexes(self):
+        started_at = time.perf_counter()
+        get_search_backend().rebuild()
+        get_autocomplete_backend().rebuild()
+        self.stdout.write(f'Rebuilt the search indexes in {time.perf_counter() - started_at:.2f}s')
+
+    def report(self, name, rows, seconds):
+        rate = rows / seconds if seconds else 0
+        self.stdout.write(f'Created {rows} {name} in {seconds:.2f}s ({rate:.0f} rows/s)')
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from apps.shop.exports import EXPORT_FORMATS, EXPORT_RESOURCES, iter_export
+
+
+class Command(BaseCommand):
+    help = 'Streams orders, order items or products to a file (or stdout) as NDJSON or CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('resource', choices=sorted(EXPORT_RESOURCES))
+        parser.add_argument('--format', dest='export_format', choices=sorted(EXPORT_FORMATS), default='ndjson')
+        parser.add_argument('--date-from', help='ISO datetime, inclusive.')
+        parser.add_argument('--date-to', help='ISO datetime, exclusive.')
+        parser.add_argument('--after', type=int, help='Resume after the row with this id.')
+        parser.add_argument('--chunk-size', type=int)
+        parser.add_argument('--output', help='Output file path. Defaults to stdout.')
+
+    def handle(self, *args, **options):
+        lines = iter_export(
+            options['resource'],
+            options['export_format'],
+            date_from=self.parse_date(options['date_from']),
+            date_to=self.parse_date(options['date_to']),
+            after=options['after'],
+            chunk_size=options['chunk_size'],
+        )
+
+        if options['output'] is None:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+
+        with open(options['output'], 'w', encoding='utf-8', newline='') as output:
+            output.writelines(lines)
+        self.stderr.write(self.style.SUCCESS(f'Exported {options["resource"]} to {options["output"]}'))
+
+    @staticmethod
+    def parse_date(value):
+        if value is None:
+            return None
+        parsed = parse_datetime(value)
+        if parsed is None:
+            raise CommandError(f'Invalid datetime: {value}')
+        return parsed
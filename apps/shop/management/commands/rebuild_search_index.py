@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from apps.shop.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the product search index of the configured search backend.'
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Search index rebuilt with {backend.__class__.__name__}'))
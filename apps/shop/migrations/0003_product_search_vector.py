@@ -0,0 +1,40 @@
+# Generated by Django 5.0.7 on 2026-10-18 12:37
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    # The GIN index and the tsvector backfill only exist on PostgreSQL; other databases use the in-memory backend.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE INDEX shop_product_search_vector_idx ON shop_product USING gin (search_vector)')
+    schema_editor.execute(
+        "UPDATE shop_product SET search_vector = "
+        "setweight(to_tsvector('simple', coalesce(shop_product.name, '')), 'A') "
+        "|| setweight(to_tsvector('simple', coalesce(shop_category.name, '')), 'B') "
+        "|| setweight(to_tsvector('simple', coalesce(shop_product.description, '')), 'C') "
+        "FROM shop_category WHERE shop_category.id = shop_product.category_id"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS shop_product_search_vector_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0002_order_date_ordered_id_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.7 on 2026-10-18 12:52
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+def create_autocomplete_indexes(apps, schema_editor):
+    # Only PostgreSQL answers autocomplete from indexes; other databases use the in-memory prefix index.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE INDEX shop_product_name_prefix_idx ON shop_product ((UPPER(name) COLLATE "C"), id)')
+    schema_editor.execute(
+        'CREATE INDEX shop_product_name_trgm_idx ON shop_product USING gin (UPPER(name) gin_trgm_ops)'
+    )
+
+
+def drop_autocomplete_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS shop_product_name_prefix_idx')
+    schema_editor.execute('DROP INDEX IF EXISTS shop_product_name_trgm_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0003_product_search_vector'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_autocomplete_indexes, drop_autocomplete_indexes),
+    ]
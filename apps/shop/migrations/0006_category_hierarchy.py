@@ -0,0 +1,54 @@
+# Generated by Django 5.0.7 on 2026-10-18 12:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+PATH_ALPHABET = '0123456789abcdefghijklmnopqrstuvwxyz'
+PATH_SEGMENT_LENGTH = 6
+
+
+def get_path_segment(pk):
+    segment = ''
+    while pk:
+        pk, remainder = divmod(pk, 36)
+        segment = PATH_ALPHABET[remainder] + segment
+    return segment.rjust(PATH_SEGMENT_LENGTH, '0')
+
+
+def set_category_paths(apps, schema_editor):
+    # Every existing category becomes a top-level one.
+    Category = apps.get_model('shop', 'Category')
+    categories = []
+    for category in Category.objects.only('pk').iterator(chunk_size=1000):
+        category.path = get_path_segment(category.pk)
+        categories.append(category)
+    Category.objects.bulk_update(categories, ['path'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0005_product_category_price_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='parent',
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name='children',
+                to='shop.category',
+                verbose_name='parent',
+            ),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='path',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=255, verbose_name='path'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(set_category_paths, migrations.RunPython.noop),
+    ]
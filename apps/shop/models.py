@@ -1,7 +1,17 @@
+from typing import Optional
+
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.contrib.postgres.search import SearchVectorField
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models import Value
+from django.db.models.functions import Concat, Substr
 from django.utils.translation import gettext as _
 
+from apps.utils.models import DirtyFieldsMixin
+
+PATH_ALPHABET = '0123456789abcdefghijklmnopqrstuvwxyz'
+
 
 class Product(models.Model):
     """
@@ -27,6 +37,10 @@ class Product(models.Model):
         on_delete=models.CASCADE,
         verbose_name=_('category'),
     )
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+    )
 
     def __str__(self):
         return self.name
@@ -34,14 +48,36 @@ class Product(models.Model):
     class Meta:
         verbose_name = _('product')
         verbose_name_plural = _('products')
+        indexes = [
+            models.Index(
+                fields=['category', 'price'],
+                name='shop_product_cat_price_idx',
+            ),
+        ]
+
+
+def get_path_segment(pk: int) -> str:
+    """
+    Fixed-width base 36 segment of a category path, so sorting by path gives a depth-first walk.
+    """
+    segment = ''
+    while pk:
+        pk, remainder = divmod(pk, 36)
+        segment = PATH_ALPHABET[remainder] + segment
+    return segment.rjust(Category.PATH_SEGMENT_LENGTH, '0')
 
 
-class Category(models.Model):
+class Category(DirtyFieldsMixin, models.Model):
     """
     This represents a category to which products are associated.
-    Each category has a name and description.
+    Each category has a name and description, and may be nested under a parent category.
+
+    The `path` is the materialized path: segments of every ancestor followed by the category's own,
+    so a whole subtree is matched by one indexed `path LIKE 'prefix%'` range query.
     """
 
+    PATH_SEGMENT_LENGTH = 6
+
     name = models.CharField(
         max_length=255,
         verbose_name=_('name'),
@@ -49,10 +85,73 @@ class Category(models.Model):
     description = models.TextField(
         verbose_name=_('description'),
     )
+    parent = models.ForeignKey(
+        'self',
+        null=True,
+        blank=True,
+        related_name='children',
+        on_delete=models.CASCADE,
+        verbose_name=_('parent'),
+    )
+    path = models.CharField(
+        max_length=255,
+        db_index=True,
+        editable=False,
+        verbose_name=_('path'),
+    )
 
     def __str__(self):
         return self.name
 
+    @property
+    def depth(self) -> int:
+        return len(self.path) // self.PATH_SEGMENT_LENGTH - 1
+
+    def get_descendants(self, include_self: bool = False) -> models.QuerySet:
+        categories = Category.objects.filter(path__startswith=self.path)
+        if not include_self:
+            categories = categories.exclude(pk=self.pk)
+        return categories
+
+    def build_path(self) -> str:
+        parent_path = self.parent.path if self.parent_id else ''
+        return parent_path + get_path_segment(self.pk)
+
+    def clean(self):
+        if self.pk and self.path and self.parent_id and self.parent.path.startswith(self.path):
+            raise ValidationError({'parent': _('A category cannot be moved under itself or its descendants.')})
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            path = self.build_path()
+            if path != self.path:
+                self._update_subtree_path(path)
+
+    def move_to(self, parent: Optional['Category']) -> None:
+        """
+        Moves the category with all of its descendants under `parent` (or to the top level).
+
+        The paths of the whole subtree are rewritten by a single `UPDATE`; other loaded
+        instances of the descendants keep their old `path` until refreshed.
+        """
+        self.parent = parent
+        self.save()
+
+    def _update_subtree_path(self, path: str) -> None:
+        old_path = self.path
+        if not old_path:
+            Category.objects.filter(pk=self.pk).update(path=path)
+        elif path.startswith(old_path):
+            raise ValidationError({'parent': _('A category cannot be moved under itself or its descendants.')})
+        else:
+            Category.objects.filter(path__startswith=old_path).update(
+                path=Concat(Value(path), Substr('path', len(old_path) + 1), output_field=models.CharField())
+            )
+        self.path = path
+        # Already written, so not to be saved again as a change.
+        self._snapshot_fields(['path'])
+
     class Meta:
         verbose_name = _('category')
         verbose_name_plural = _('categories')
@@ -80,6 +179,12 @@ class Order(models.Model):
     class Meta:
         verbose_name = _('order')
         verbose_name_plural = _('orders')
+        indexes = [
+            models.Index(
+                fields=['date_ordered', 'id'],
+                name='shop_order_date_ordered_id_idx',
+            ),
+        ]
 
 
 class OrderItem(models.Model):
@@ -0,0 +1,21 @@
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .base import BaseSearchBackend, SearchHit, SearchResults
+
+
+@lru_cache
+def _load_search_backend(backend_path: str) -> BaseSearchBackend:
+    return import_string(backend_path)()
+
+
+def get_search_backend() -> BaseSearchBackend:
+    """
+    Returns the product search backend configured by the `SHOP_SEARCH_BACKEND` setting.
+    """
+    return _load_search_backend(settings.SHOP_SEARCH_BACKEND)
+
+
+__all__ = ['BaseSearchBackend', 'SearchHit', 'SearchResults', 'get_search_backend']
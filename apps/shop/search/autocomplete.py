@@ -0,0 +1,220 @@
+import bisect
+import math
+import threading
+from collections import defaultdict
+from functools import lru_cache
+from typing import Iterable
+
+from django.conf import settings
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import connection
+from django.db.models.functions import Collate, Upper
+from django.utils.module_loading import import_string
+
+from apps.shop.models import Product
+
+# Minimum share of common trigrams for a fuzzy match, the same default as pg_trgm.similarity_threshold
+SIMILARITY_THRESHOLD = 0.3
+
+
+def normalize(text: str) -> str:
+    return ' '.join(text.casefold().split())
+
+
+def trigrams(text: str) -> set[str]:
+    """
+    Trigrams of every word padded like pg_trgm does, so both backends agree on fuzzy matches.
+    """
+    result = set()
+    for word in normalize(text).split():
+        padded = f'  {word} '
+        result.update(padded[index : index + 3] for index in range(len(padded) - 2))
+    return result
+
+
+class BaseAutocompleteBackend:
+    """
+    Interface of the product name autocomplete backends.
+
+    Prefix matches come first (alphabetically), then fuzzy (trigram) matches by similarity.
+    """
+
+    def complete(self, query: str, limit: int = 10) -> list[tuple[int, str]]:
+        raise NotImplementedError
+
+    def index_products(self, product_ids: Iterable[int]) -> None:
+        raise NotImplementedError
+
+    def remove_products(self, product_ids: Iterable[int]) -> None:
+        raise NotImplementedError
+
+    def rebuild(self) -> None:
+        raise NotImplementedError
+
+
+class TrigramAutocompleteBackend(BaseAutocompleteBackend):
+    """
+    Autocomplete answered by PostgreSQL indexes on `UPPER(name)`: a "C"-collated btree for
+    prefix matches and a `pg_trgm` GIN index for fuzzy matches. The indexes maintain themselves.
+    """
+
+    def complete(self, query: str, limit: int = 10) -> list[tuple[int, str]]:
+        query = normalize(query).upper()
+        if not query:
+            return []
+
+        prefix_matches = list(
+            Product.objects.annotate(name_key=Collate(Upper('name'), 'C'))
+            .filter(name_key__startswith=query)
+            .order_by('name_key', 'pk')
+            .values_list('pk', 'name')[:limit]
+        )
+        if len(prefix_matches) >= limit:
+            return prefix_matches
+
+        seen_ids = [product_id for product_id, _ in prefix_matches]
+        fuzzy_matches = (
+            Product.objects.annotate(name_upper=Upper('name'), similarity=TrigramSimilarity(Upper('name'), query))
+            .filter(name_upper__trigram_similar=query)
+            .exclude(pk__in=seen_ids)
+            .order_by('-similarity', 'pk')
+            .values_list('pk', 'name')[: limit - len(prefix_matches)]
+        )
+        return prefix_matches + list(fuzzy_matches)
+
+    def index_products(self, product_ids: Iterable[int]) -> None:
+        pass
+
+    def remove_products(self, product_ids: Iterable[int]) -> None:
+        pass
+
+    def rebuild(self) -> None:
+        pass
+
+
+class PrefixIndexAutocompleteBackend(BaseAutocompleteBackend):
+    """
+    An in-process autocomplete index for databases without `pg_trgm`.
+
+    Names are kept in a sorted list searched with `bisect` for prefixes, next to an inverted
+    trigram index for fuzzy matches. The index is built on first use and updated per product.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._sorted_keys: list[tuple[str, int]] = []
+        self._names: dict[int, str] = {}
+        self._trigram_counts: dict[int, int] = {}
+        self._trigrams: dict[str, set[int]] = defaultdict(set)
+        self._built = False
+
+    def _index_trigrams(self, product_id: int, name: str) -> None:
+        name_trigrams = trigrams(name)
+        self._trigram_counts[product_id] = len(name_trigrams)
+        for trigram in name_trigrams:
+            self._trigrams[trigram].add(product_id)
+
+    def _add(self, product_id: int, name: str) -> None:
+        self._remove(product_id)
+        bisect.insort(self._sorted_keys, (normalize(name), product_id))
+        self._names[product_id] = name
+        self._index_trigrams(product_id, name)
+
+    def _remove(self, product_id: int) -> None:
+        name = self._names.pop(product_id, None)
+        if name is None:
+            return
+        del self._trigram_counts[product_id]
+        key = (normalize(name), product_id)
+        index = bisect.bisect_left(self._sorted_keys, key)
+        if index < len(self._sorted_keys) and self._sorted_keys[index] == key:
+            del self._sorted_keys[index]
+        for trigram in trigrams(name):
+            product_ids = self._trigrams.get(trigram)
+            if product_ids is not None:
+                product_ids.discard(product_id)
+                if not product_ids:
+                    del self._trigrams[trigram]
+
+    def rebuild(self) -> None:
+        with self._lock:
+            self._sorted_keys = []
+            self._names = {}
+            self._trigram_counts = {}
+            self._trigrams = defaultdict(set)
+            rows = Product.objects.values_list('pk', 'name').iterator(chunk_size=settings.SHOP_SEARCH_CHUNK_SIZE)
+            for product_id, name in rows:
+                self._names[product_id] = name
+                self._sorted_keys.append((normalize(name), product_id))
+                self._index_trigrams(product_id, name)
+            self._sorted_keys.sort()
+            self._built = True
+
+    def index_products(self, product_ids: Iterable[int]) -> None:
+        with self._lock:
+            if not self._built:
+                return
+            for product_id, name in Product.objects.filter(pk__in=list(product_ids)).values_list('pk', 'name'):
+                self._add(product_id, name)
+
+    def remove_products(self, product_ids: Iterable[int]) -> None:
+        with self._lock:
+            for product_id in product_ids:
+                self._remove(product_id)
+
+    def complete(self, query: str, limit: int = 10) -> list[tuple[int, str]]:
+        query = normalize(query)
+        if not query:
+            return []
+
+        with self._lock:
+            if not self._built:
+                self.rebuild()
+
+            results = []
+            index = bisect.bisect_left(self._sorted_keys, (query,))
+            while len(results) < limit and index < len(self._sorted_keys):
+                key, product_id = self._sorted_keys[index]
+                if not key.startswith(query):
+                    break
+                results.append((product_id, self._names[product_id]))
+                index += 1
+            if len(results) >= limit or len(query) < 3:
+                # Fuzzy matching of one or two characters would score most of the catalogue.
+                return results
+
+            # A match shares at least `min_common` trigrams with the query, so it must appear in one of the
+            # `len(postings) - min_common + 1` shortest postings; only those are scanned for candidates.
+            query_trigrams = trigrams(query)
+            postings = sorted((self._trigrams.get(trigram, set()) for trigram in query_trigrams), key=len)
+            min_common = max(1, math.ceil(SIMILARITY_THRESHOLD * len(query_trigrams)))
+            candidates = set().union(*postings[: len(postings) - min_common + 1])
+            candidates.difference_update(product_id for product_id, _ in results)
+
+            scored = []
+            for product_id in candidates:
+                common = sum(1 for posting in postings if product_id in posting)
+                similarity = common / (len(query_trigrams) + self._trigram_counts[product_id] - common)
+                if similarity >= SIMILARITY_THRESHOLD:
+                    scored.append((-similarity, product_id))
+            scored.sort()
+            results += [(product_id, self._names[product_id]) for _, product_id in scored[: limit - len(results)]]
+            return results
+
+
+@lru_cache
+def _load_autocomplete_backend(backend_path: str) -> BaseAutocompleteBackend:
+    return import_string(backend_path)()
+
+
+def get_autocomplete_backend() -> BaseAutocompleteBackend:
+    """
+    Returns the backend from `SHOP_AUTOCOMPLETE_BACKEND`, or picks one for the database in use.
+    """
+    backend_path = settings.SHOP_AUTOCOMPLETE_BACKEND
+    if backend_path is None:
+        backend_class = (
+            TrigramAutocompleteBackend if connection.vendor == 'postgresql' else PrefixIndexAutocompleteBackend
+        )
+        backend_path = f'{backend_class.__module__}.{backend_class.__name__}'
+    return _load_autocomplete_backend(backend_path)
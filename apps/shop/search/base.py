@@ -0,0 +1,77 @@
+from typing import Iterable, Iterator, NamedTuple
+
+from django.conf import settings
+
+from apps.shop.models import Product
+
+FIELD_WEIGHTS = {
+    'name': 3.0,
+    'category_name': 2.0,
+    'description': 1.0,
+}
+
+
+class SearchHit(NamedTuple):
+    product_id: int
+    score: float
+
+
+class SearchResults(NamedTuple):
+    total: int
+    hits: list[SearchHit]
+
+
+def iter_product_documents(product_ids: Iterable[int] = None) -> Iterator[dict]:
+    """
+    Yields the searchable representation of products, reading them with a server-side cursor.
+
+    Args:
+      product_ids (Iterable[int], optional): Limit the documents to these products.
+
+    Returns:
+      Iterator[dict]: Documents with `id`, `name`, `description` and `category_name` keys.
+    """
+    queryset = Product.objects.order_by('id')
+    if product_ids is not None:
+        queryset = queryset.filter(pk__in=list(product_ids))
+    rows = queryset.values_list('id', 'name', 'description', 'category__name')
+    for product_id, name, description, category_name in rows.iterator(chunk_size=settings.SHOP_SEARCH_CHUNK_SIZE):
+        yield {
+            'id': product_id,
+            'name': name,
+            'description': description,
+            'category_name': category_name,
+        }
+
+
+class BaseSearchBackend:
+    """
+    Interface of the product search backends.
+
+    Backends index the product `name`, `description` and the category name. They are
+    refreshed by the shop signal handlers whenever products or categories change.
+    """
+
+    def index_products(self, product_ids: Iterable[int]) -> None:
+        """
+        (Re)indexes the given products from the database.
+        """
+        raise NotImplementedError
+
+    def remove_products(self, product_ids: Iterable[int]) -> None:
+        """
+        Removes the given products from the index.
+        """
+        raise NotImplementedError
+
+    def rebuild(self) -> None:
+        """
+        Rebuilds the whole index from the database.
+        """
+        raise NotImplementedError
+
+    def search(self, query: str, offset: int = 0, limit: int = 20) -> SearchResults:
+        """
+        Returns a page of products matching all terms of the query, best matches first.
+        """
+        raise NotImplementedError
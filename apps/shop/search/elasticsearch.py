@@ -0,0 +1,92 @@
+import json
+from itertools import islice
+from typing import Iterable, Iterator
+
+import requests
+from django.conf import settings
+
+from .base import FIELD_WEIGHTS, BaseSearchBackend, SearchHit, SearchResults, iter_product_documents
+
+INDEX_MAPPING = {
+    'mappings': {
+        'properties': {
+            'id': {'type': 'long'},
+            'name': {'type': 'text'},
+            'description': {'type': 'text'},
+            'category_name': {'type': 'text'},
+        },
+    },
+}
+
+
+class ElasticsearchError(Exception):
+    pass
+
+
+class ElasticsearchSearchBackend(BaseSearchBackend):
+    """
+    Adapter to the Elasticsearch service from `docker-compose.yml`.
+
+    Products are sent through the `_bulk` API in chunks of `SHOP_SEARCH_CHUNK_SIZE` documents,
+    reusing one pooled HTTP session.
+    """
+
+    def __init__(self) -> None:
+        self.url = settings.SHOP_SEARCH_ELASTICSEARCH['URL'].rstrip('/')
+        self.index = settings.SHOP_SEARCH_ELASTICSEARCH['INDEX']
+        self.timeout = settings.SHOP_SEARCH_ELASTICSEARCH.get('TIMEOUT', 10)
+        self.session = requests.Session()
+
+    def _request(self, method: str, path: str, **kwargs) -> dict:
+        response = self.session.request(method, f'{self.url}/{path}', timeout=self.timeout, **kwargs)
+        if response.status_code >= 400 and not (method == 'DELETE' and response.status_code == 404):
+            raise ElasticsearchError(f'{method} {path} failed with {response.status_code}: {response.text}')
+        return response.json()
+
+    def _bulk(self, actions: Iterator[list[dict]]) -> None:
+        chunk_size = settings.SHOP_SEARCH_CHUNK_SIZE
+        while True:
+            chunk = list(islice(actions, chunk_size))
+            if not chunk:
+                return
+            body = ''.join(json.dumps(line) + '\n' for action in chunk for line in action)
+            result = self._request(
+                'POST', f'{self.index}/_bulk', data=body, headers={'Content-Type': 'application/x-ndjson'}
+            )
+            if result.get('errors'):
+                raise ElasticsearchError(f'Bulk request failed: {result["items"]}')
+
+    def _index_actions(self, documents: Iterable[dict]) -> Iterator[list[dict]]:
+        for document in documents:
+            yield [{'index': {'_id': document['id']}}, document]
+
+    def index_products(self, product_ids: Iterable[int]) -> None:
+        self._bulk(self._index_actions(iter_product_documents(product_ids)))
+
+    def remove_products(self, product_ids: Iterable[int]) -> None:
+        self._bulk([{'delete': {'_id': product_id}}] for product_id in product_ids)
+
+    def rebuild(self) -> None:
+        self._request('DELETE', self.index)
+        self._request('PUT', self.index, json=INDEX_MAPPING)
+        self._bulk(self._index_actions(iter_product_documents()))
+        self._request('POST', f'{self.index}/_refresh')
+
+    def search(self, query: str, offset: int = 0, limit: int = 20) -> SearchResults:
+        body = {
+            'query': {
+                'multi_match': {
+                    'query': query,
+                    'fields': [f'{field}^{weight:g}' for field, weight in FIELD_WEIGHTS.items()],
+                    'operator': 'and',
+                },
+            },
+            'sort': ['_score', {'id': 'asc'}],
+            'from': offset,
+            'size': limit,
+            'track_total_hits': True,
+            '_source': False,
+        }
+        result = self._request('POST', f'{self.index}/_search', json=body)
+        hits = [SearchHit(int(hit['_id']), hit['_score']) for hit in result['hits']['hits']]
+        return SearchResults(total=result['hits']['total']['value'], hits=hits)
@@ -0,0 +1,97 @@
+import math
+import re
+import threading
+from collections import defaultdict
+from typing import Iterable
+
+from .base import FIELD_WEIGHTS, BaseSearchBackend, SearchHit, SearchResults, iter_product_documents
+
+TOKEN_RE = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_RE.findall((text or '').lower())
+
+
+class InMemorySearchBackend(BaseSearchBackend):
+    """
+    An in-process inverted index, usable in tests and on databases without full-text search.
+
+    The index is built lazily on the first search and kept up to date incrementally.
+    Documents are ranked with a TF-IDF score weighted by the field the term was found in.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._postings: dict[str, dict[int, float]] = defaultdict(dict)
+        self._document_tokens: dict[int, set[str]] = {}
+        self._built = False
+
+    def _add_document(self, document: dict) -> None:
+        product_id = document['id']
+        self._remove_document(product_id)
+
+        weights: dict[str, float] = defaultdict(float)
+        for field, field_weight in FIELD_WEIGHTS.items():
+            for token in tokenize(document[field]):
+                weights[token] += field_weight
+
+        for token, weight in weights.items():
+            self._postings[token][product_id] = weight
+        self._document_tokens[product_id] = set(weights)
+
+    def _remove_document(self, product_id: int) -> None:
+        for token in self._document_tokens.pop(product_id, ()):
+            postings = self._postings[token]
+            postings.pop(product_id, None)
+            if not postings:
+                del self._postings[token]
+
+    def index_products(self, product_ids: Iterable[int]) -> None:
+        with self._lock:
+            if not self._built:
+                # Not built yet; the products are picked up by the lazy rebuild.
+                return
+            product_ids = list(product_ids)
+            for product_id in product_ids:
+                self._remove_document(product_id)
+            for document in iter_product_documents(product_ids):
+                self._add_document(document)
+
+    def remove_products(self, product_ids: Iterable[int]) -> None:
+        with self._lock:
+            for product_id in product_ids:
+                self._remove_document(product_id)
+
+    def rebuild(self) -> None:
+        with self._lock:
+            self._postings.clear()
+            self._document_tokens.clear()
+            for document in iter_product_documents():
+                self._add_document(document)
+            self._built = True
+
+    def search(self, query: str, offset: int = 0, limit: int = 20) -> SearchResults:
+        tokens = set(tokenize(query))
+        if not tokens:
+            return SearchResults(total=0, hits=[])
+
+        with self._lock:
+            if not self._built:
+                self.rebuild()
+
+            postings = [self._postings.get(token, {}) for token in tokens]
+            postings.sort(key=len)
+            matches = set(postings[0]).intersection(*postings[1:])
+
+            documents_count = len(self._document_tokens)
+            scores = {
+                product_id: sum(
+                    posting[product_id] * math.log(1 + documents_count / len(posting)) for posting in postings
+                )
+                for product_id in matches
+            }
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        hits = [SearchHit(product_id, score) for product_id, score in ranked[offset : offset + limit]]
+        return SearchResults(total=len(ranked), hits=hits)
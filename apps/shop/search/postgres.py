@@ -0,0 +1,59 @@
+from typing import Iterable
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db.models import F, OuterRef, Subquery
+
+from apps.shop.models import Category, Product
+from .base import BaseSearchBackend, SearchHit, SearchResults
+
+SEARCH_CONFIG = 'simple'
+
+
+def get_search_vector() -> SearchVector:
+    """
+    The weighted vector stored in `Product.search_vector` and covered by its GIN index.
+    """
+    category_name = Subquery(Category.objects.filter(pk=OuterRef('category_id')).values('name')[:1])
+    return (
+        SearchVector('name', weight='A', config=SEARCH_CONFIG)
+        + SearchVector(category_name, weight='B', config=SEARCH_CONFIG)
+        + SearchVector('description', weight='C', config=SEARCH_CONFIG)
+    )
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """
+    Full-text search using the `Product.search_vector` column and its GIN index.
+    """
+
+    def index_products(self, product_ids: Iterable[int]) -> None:
+        Product.objects.filter(pk__in=list(product_ids)).update(search_vector=get_search_vector())
+
+    def remove_products(self, product_ids: Iterable[int]) -> None:
+        # Deleted rows take their search vector with them.
+        pass
+
+    def rebuild(self) -> None:
+        chunk_size = settings.SHOP_SEARCH_CHUNK_SIZE
+        last_id = 0
+        while True:
+            product_ids = list(
+                Product.objects.filter(pk__gt=last_id).order_by('pk').values_list('pk', flat=True)[:chunk_size]
+            )
+            if not product_ids:
+                return
+            self.index_products(product_ids)
+            last_id = product_ids[-1]
+
+    def search(self, query: str, offset: int = 0, limit: int = 20) -> SearchResults:
+        search_query = SearchQuery(query, search_type='websearch', config=SEARCH_CONFIG)
+        queryset = Product.objects.filter(search_vector=search_query)
+
+        total = queryset.count()
+        rows = (
+            queryset.annotate(rank=SearchRank(F('search_vector'), search_query))
+            .order_by('-rank', 'pk')
+            .values_list('pk', 'rank')[offset : offset + limit]
+        )
+        return SearchResults(total=total, hits=[SearchHit(product_id, rank) for product_id, rank in rows])
@@ -0,0 +1,135 @@
+import random
+import time
+from decimal import Decimal
+from typing import Callable, Iterator, Optional
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Category, Order, OrderItem, Product, get_path_segment
+
+# fmt: off
+WORDS = (
+    'alpha', 'amber', 'arctic', 'aurora', 'basic', 'bold', 'breeze', 'bright', 'cedar', 'classic',
+    'cloud', 'coral', 'crisp', 'delta', 'eco', 'ember', 'forest', 'fresh', 'glow', 'granite',
+    'harbor', 'lunar', 'maple', 'meadow', 'nova', 'ocean', 'onyx', 'pixel', 'prime', 'pulse',
+    'quartz', 'rapid', 'river', 'solar', 'spark', 'stone', 'summit', 'swift', 'terra', 'urban',
+    'velvet', 'vivid', 'wave', 'wild', 'zen',
+)
+# fmt: on
+
+
+class SeedDataGenerator:
+    """
+    Generates a deterministic shop dataset with batched `bulk_create` calls.
+
+    The same `seed` always produces the same rows, so a production-sized dataset
+    can be reproduced locally. Every `create_*` method reports its rows/second
+    through the `report` callback.
+    """
+
+    def __init__(
+        self, seed: int = 0, batch_size: int = 5000, report: Optional[Callable[[str, int, float], None]] = None
+    ) -> None:
+        self.seed = seed
+        self.batch_size = batch_size
+        self.random = random.Random(seed)  # noqa S311
+        self.report = report or (lambda name, rows, seconds: None)
+
+    def _batches(self, count: int) -> Iterator[range]:
+        for start in range(0, count, self.batch_size):
+            yield range(start, min(start + self.batch_size, count))
+
+    def _name(self, words: int = 2) -> str:
+        return ' '.join(self.random.choice(WORDS) for _ in range(words)).capitalize()
+
+    def _timed(self, name: str, create: Callable[[], list[int]]) -> list[int]:
+        started_at = time.perf_counter()
+        ids = create()
+        self.report(name, len(ids), time.perf_counter() - started_at)
+        return ids
+
+    def create_users(self, count: int) -> list[int]:
+        # Hashing once keeps generation fast; every seeded user logs in with the same password.
+        password = make_password('password123')
+        now = timezone.now()
+        user_model = get_user_model()
+
+        def create() -> list[int]:
+            ids = []
+            for batch in self._batches(count):
+                users = [
+                    user_model(
+                        email=f'user-{self.seed}-{number}@example.com',
+                        password=password,
+                        is_active=True,
+                        activation_date=now,
+                    )
+                    for number in batch
+                ]
+                ids += [user.pk for user in user_model.objects.bulk_create(users)]
+            return ids
+
+        return self._timed('users', create)
+
+    def create_categories(self, count: int) -> list[int]:
+        def create() -> list[int]:
+            categories = Category.objects.bulk_create(
+                [Category(name=self._name(1), description=self._name(6)) for _ in range(count)],
+                batch_size=self.batch_size,
+            )
+            # `bulk_create` skips `save()`, so the top-level paths are filled in afterwards.
+            for category in categories:
+                category.path = get_path_segment(category.pk)
+            Category.objects.bulk_update(categories, ['path'], batch_size=self.batch_size)
+            return [category.pk for category in categories]
+
+        return self._timed('categories', create)
+
+    def create_products(self, count: int, category_ids: list[int]) -> list[int]:
+        def create() -> list[int]:
+            ids = []
+            for batch in self._batches(count):
+                products = [
+                    Product(
+                        name=self._name(),
+                        description=self._name(8),
+                        price=Decimal(self.random.randint(100, 99999)) / 100,
+                        category_id=self.random.choice(category_ids),
+                    )
+                    for _ in batch
+                ]
+                ids += [product.pk for product in Product.objects.bulk_create(products)]
+            return ids
+
+        return self._timed('products', create)
+
+    def create_orders(self, count: int, user_ids: list[int], product_ids: list[int], items_per_order: int) -> list[int]:
+        items_count = 0
+
+        def create() -> list[int]:
+            nonlocal items_count
+            ids = []
+            for batch in self._batches(count):
+                with transaction.atomic():
+                    orders = Order.objects.bulk_create([Order(user_id=self.random.choice(user_ids)) for _ in batch])
+                    items = [
+                        OrderItem(
+                            order_id=order.pk,
+                            product_id=self.random.choice(product_ids),
+                            quantity=self.random.randint(1, 5),
+                        )
+                        for order in orders
+                        for _ in range(items_per_order)
+                    ]
+                    OrderItem.objects.bulk_create(items, batch_size=self.batch_size)
+                items_count += len(items)
+                ids += [order.pk for order in orders]
+            return ids
+
+        started_at = time.perf_counter()
+        ids = self._timed('orders', create)
+        self.report('order items', items_count, time.perf_counter() - started_at)
+        return ids
@@ -1,3 +1,5 @@
+from django.db import transaction
+from django.utils.translation import gettext as _
 from rest_framework import serializers
 
 from .models import Category, Order, OrderItem, Product
@@ -22,8 +24,14 @@ class CategorySerializer(serializers.ModelSerializer):
             'id',
             'name',
             'description',
+            'parent',
         ]
 
+    def validate_parent(self, parent):
+        if self.instance is not None and parent is not None and parent.path.startswith(self.instance.path):
+            raise serializers.ValidationError(_('A category cannot be moved under itself or its descendants.'))
+        return parent
+
 
 class OrderItemSerializer(serializers.ModelSerializer):
     class Meta:
@@ -47,3 +55,77 @@ class OrderSerializer(serializers.ModelSerializer):
             'date_ordered',
             'items',
         ]
+
+
+class CheckoutItemSerializer(serializers.ModelSerializer):
+    product = serializers.IntegerField(source='product_id')
+
+    class Meta:
+        model = OrderItem
+        fields = [
+            'id',
+            'product',
+            'quantity',
+        ]
+        extra_kwargs = {'quantity': {'min_value': 1}}
+
+
+class CheckoutSerializer(serializers.ModelSerializer):
+    """
+    Serializer placing an order together with all of its items in a single transaction.
+    """
+
+    items = CheckoutItemSerializer(many=True, allow_empty=False, source='checkout_items')
+    total = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
+
+    class Meta:
+        model = Order
+        fields = [
+            'id',
+            'user',
+            'date_ordered',
+            'items',
+            'total',
+        ]
+        read_only_fields = ['user']
+
+    def validate_items(self, items):
+        """
+        Resolves every referenced product with a single query.
+        """
+        product_ids = {item['product_id'] for item in items}
+        products = Product.objects.only('id', 'price').in_bulk(product_ids)
+        missing_ids = sorted(product_ids - products.keys())
+        if missing_ids:
+            raise serializers.ValidationError(
+                _('Products do not exist: {ids}.').format(ids=', '.join(map(str, missing_ids)))
+            )
+
+        for item in items:
+            item['product'] = products[item.pop('product_id')]
+        return items
+
+    def create(self, validated_data):
+        items = validated_data.pop('checkout_items')
+        with transaction.atomic():
+            order = Order.objects.create(**validated_data)
+            order.checkout_items = OrderItem.objects.bulk_create([OrderItem(order=order, **item) for item in items])
+        order.total = sum(item.product.price * item.quantity for item in order.checkout_items)
+        return order
+
+
+class ExportQuerySerializer(serializers.Serializer):
+    date_from = serializers.DateTimeField(required=False)
+    date_to = serializers.DateTimeField(required=False)
+    after = serializers.IntegerField(required=False, min_value=0)
+
+
+class ProductSearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField()
+    page = serializers.IntegerField(min_value=1, default=1)
+    page_size = serializers.IntegerField(min_value=1, max_value=100, default=20)
+
+
+class ProductAutocompleteQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(trim_whitespace=False)
+    limit = serializers.IntegerField(min_value=1, max_value=20, default=10)
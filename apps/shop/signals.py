@@ -0,0 +1,73 @@
+import logging
+from typing import Callable
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .categories import invalidate_category_tree
+from .models import Category, Product
+from .search import get_search_backend
+from .search.autocomplete import get_autocomplete_backend
+
+logger = logging.getLogger(__name__)
+
+
+def update_index_on_commit(update: Callable[[], None]) -> None:
+    """
+    Runs the index update once the transaction commits.
+
+    The rows are already written by then, so a failing search backend (e.g. Elasticsearch being down)
+    is only logged; the index is repaired by the `rebuild_search_index` command.
+    """
+
+    def run() -> None:
+        try:
+            update()
+        except Exception:
+            logger.exception('Could not update the product search index.')
+
+    transaction.on_commit(run)
+
+
+@receiver(post_save, sender=Product)
+def index_product(sender, instance, **kwargs):
+    product_id = instance.pk
+    update_index_on_commit(lambda: get_search_backend().index_products([product_id]))
+    update_index_on_commit(lambda: get_autocomplete_backend().index_products([product_id]))
+
+
+@receiver(post_delete, sender=Product)
+def remove_product_from_index(sender, instance, **kwargs):
+    product_id = instance.pk
+    update_index_on_commit(lambda: get_search_backend().remove_products([product_id]))
+    update_index_on_commit(lambda: get_autocomplete_backend().remove_products([product_id]))
+
+
+def index_category_products_in_chunks(category_id: int) -> None:
+    """
+    Reindexes the products of a category in chunks of `SHOP_SEARCH_CHUNK_SIZE`, as `rebuild()` does,
+    so a large category is never read or sent to the backend in one go.
+    """
+    backend = get_search_backend()
+    products = Product.objects.filter(category_id=category_id).order_by('pk').values_list('pk', flat=True)
+    last_id = 0
+    while product_ids := list(products.filter(pk__gt=last_id)[: settings.SHOP_SEARCH_CHUNK_SIZE]):
+        backend.index_products(product_ids)
+        last_id = product_ids[-1]
+
+
+@receiver(post_save, sender=Category)
+def index_category_products(sender, instance, created, update_fields, **kwargs):
+    # Only the name of a category is indexed with its products; `DirtyFieldsMixin` passes the changed fields.
+    if created or (update_fields is not None and 'name' not in update_fields):
+        return
+    category_id = instance.pk
+    update_index_on_commit(lambda: index_category_products_in_chunks(category_id))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def refresh_category_tree(sender, **kwargs):
+    transaction.on_commit(invalidate_category_tree)
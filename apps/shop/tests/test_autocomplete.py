@@ -0,0 +1,79 @@
+import os
+
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory
+
+from apps.shop.factories import CategoryFactory, ProductFactory
+from apps.shop.search.autocomplete import PrefixIndexAutocompleteBackend, get_autocomplete_backend
+from apps.shop.seeding import SeedDataGenerator
+from apps.shop.views import ProductViewSet
+from apps.utils.tests.benchmarks import benchmark, measure, report
+
+
+class PrefixIndexAutocompleteBackendTests(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.backend = PrefixIndexAutocompleteBackend()
+        category = CategoryFactory()
+        self.chair = ProductFactory(name='Chair', category=category)
+        self.charger = ProductFactory(name='Charger', category=category)
+        self.armchair = ProductFactory(name='Armchair', category=category)
+
+    def complete(self, query: str, limit: int = 10) -> list[int]:
+        return [product_id for product_id, _ in self.backend.complete(query, limit=limit)]
+
+    def test_prefix_matches_are_sorted_and_case_insensitive(self) -> None:
+        self.assertEqual(self.complete('CHA'), [self.chair.pk, self.charger.pk])
+
+    def test_limit_is_respected(self) -> None:
+        self.assertEqual(self.complete('cha', limit=1), [self.chair.pk])
+
+    def test_fuzzy_matches_follow_prefix_matches(self) -> None:
+        self.assertEqual(self.complete('chairr'), [self.chair.pk])
+        self.assertEqual(self.complete('chair'), [self.chair.pk, self.armchair.pk])
+
+    def test_index_is_updated_incrementally(self) -> None:
+        self.backend.rebuild()
+
+        self.armchair.name = 'Chaise longue'
+        self.armchair.save()
+        self.backend.index_products([self.armchair.pk])
+        self.assertEqual(self.complete('chai', limit=2), [self.chair.pk, self.armchair.pk])
+
+        self.backend.remove_products([self.chair.pk])
+        self.assertEqual(self.complete('chai', limit=1), [self.armchair.pk])
+
+
+class ProductAutocompleteViewTests(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.request_factory = APIRequestFactory()
+        self.product = ProductFactory(name='Lantern')
+        get_autocomplete_backend().rebuild()
+
+    def autocomplete(self, query: str):
+        request = self.request_factory.get('/products/autocomplete/', {'q': query})
+        return ProductViewSet.as_view({'get': 'autocomplete'})(request)
+
+    def test_autocomplete_returns_ids_and_names(self) -> None:
+        response = self.autocomplete('lan')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, [{'id': self.product.pk, 'name': 'Lantern'}])
+
+    def test_saved_products_are_suggested(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            ProductFactory(name='Lamp')
+
+        self.assertEqual([item['name'] for item in self.autocomplete('la').data], ['Lamp', 'Lantern'])
+
+    @benchmark
+    def test_autocomplete_latency(self) -> None:
+        generator = SeedDataGenerator(seed=1)
+        generator.create_products(int(os.environ.get('BENCHMARK_PRODUCTS', 100000)), generator.create_categories(10))
+        backend = get_autocomplete_backend()
+        backend.rebuild()
+
+        queries = ['so', 'sola', 'solar wa', 'slar', 'velvte', 'oce']
+        results = measure(lambda: [backend.complete(query) for query in queries], iterations=200)
+        report(f'autocomplete ({len(queries)} queries per iteration)', results)
@@ -0,0 +1,98 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.shop.factories import CategoryFactory, ProductFactory
+from apps.shop.views import CategoryViewSet, ProductViewSet
+
+
+class CategoryHierarchyTests(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.home = CategoryFactory(name='Home')
+        self.kitchen = CategoryFactory(name='Kitchen', parent=self.home)
+        self.cutlery = CategoryFactory(name='Cutlery', parent=self.kitchen)
+        self.garden = CategoryFactory(name='Garden')
+
+    def test_path_contains_every_ancestor(self) -> None:
+        self.assertEqual(self.cutlery.path, self.home.path + self.kitchen.path[-6:] + self.cutlery.path[-6:])
+        self.assertEqual([self.home.depth, self.kitchen.depth, self.cutlery.depth], [0, 1, 2])
+
+    def test_descendants_are_read_with_one_query(self) -> None:
+        with self.assertNumQueries(1):
+            descendants = list(self.home.get_descendants().order_by('path'))
+
+        self.assertEqual(descendants, [self.kitchen, self.cutlery])
+        self.assertEqual(list(self.home.get_descendants(include_self=True)), [self.home, self.kitchen, self.cutlery])
+
+    def test_move_rewrites_the_whole_subtree(self) -> None:
+        self.kitchen.move_to(self.garden)
+
+        self.cutlery.refresh_from_db()
+        self.assertEqual(list(self.garden.get_descendants().order_by('path')), [self.kitchen, self.cutlery])
+        self.assertEqual(list(self.home.get_descendants()), [])
+        self.assertEqual(self.cutlery.depth, 2)
+
+        self.kitchen.move_to(None)
+        self.cutlery.refresh_from_db()
+        self.assertEqual([self.kitchen.depth, self.cutlery.depth], [0, 1])
+
+    def test_category_cannot_be_moved_under_its_descendant(self) -> None:
+        with self.assertRaises(ValidationError):
+            self.home.move_to(self.cutlery)
+
+        self.home.refresh_from_db()
+        self.assertIsNone(self.home.parent_id)
+
+
+class CategoryViewTests(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        self.request_factory = APIRequestFactory()
+        self.user = get_user_model().objects.create(email='user@example.com')
+        self.home = CategoryFactory(name='Home')
+        self.kitchen = CategoryFactory(name='Kitchen', parent=self.home)
+        self.garden = CategoryFactory(name='Garden')
+
+    def tree(self):
+        request = self.request_factory.get('/categories/tree/')
+        force_authenticate(request, user=self.user)
+        return CategoryViewSet.as_view({'get': 'tree'})(request)
+
+    def test_tree_is_nested_and_cached(self) -> None:
+        with self.assertNumQueries(1):
+            response = self.tree()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.tree().data, response.data)
+
+        self.assertEqual(
+            response.data,
+            [
+                {
+                    'id': self.home.pk,
+                    'name': 'Home',
+                    'children': [{'id': self.kitchen.pk, 'name': 'Kitchen', 'children': []}],
+                },
+                {'id': self.garden.pk, 'name': 'Garden', 'children': []},
+            ],
+        )
+
+    def test_tree_is_invalidated_by_changes(self) -> None:
+        self.tree()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.kitchen.move_to(self.garden)
+
+        self.assertEqual(self.tree().data[1]['children'][0]['id'], self.kitchen.pk)
+
+    def test_products_can_be_filtered_by_subtree(self) -> None:
+        chair = ProductFactory(category=self.home)
+        kettle = ProductFactory(category=self.kitchen)
+        ProductFactory(category=self.garden)
+
+        request = self.request_factory.get('/products/', {'category_tree': self.home.pk})
+        response = ProductViewSet.as_view({'get': 'list'})(request)
+
+        self.assertEqual(sorted(product['id'] for product in response.data['results']), [chair.pk, kettle.pk])
@@ -0,0 +1,63 @@
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.shop.factories import CategoryFactory, ProductFactory, UserFactory
+from apps.shop.models import Order, OrderItem
+from apps.shop.views import CheckoutView
+from apps.utils.tests.benchmarks import benchmark, measure, report
+
+
+class CheckoutViewTests(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.request_factory = APIRequestFactory()
+        self.user = UserFactory()
+        self.products = ProductFactory.create_batch(20, category=CategoryFactory(), price=Decimal('2.50'))
+
+    def post(self, payload: dict):
+        request = self.request_factory.post('/checkout/', payload, format='json')
+        force_authenticate(request, user=self.user)
+        return CheckoutView.as_view()(request)
+
+    def checkout(self, products, quantity: int = 2):
+        return self.post({'items': [{'product': product.pk, 'quantity': quantity} for product in products]})
+
+    def test_checkout_creates_order_with_items(self) -> None:
+        response = self.checkout(self.products[:3])
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Decimal(response.data['total']), Decimal('15.00'))
+        self.assertEqual(len(response.data['items']), 3)
+        order = Order.objects.get(pk=response.data['id'])
+        self.assertEqual(order.user, self.user)
+        self.assertEqual(order.items.count(), 3)
+
+    def test_checkout_query_count_does_not_depend_on_item_count(self) -> None:
+        with CaptureQueriesContext(connection) as single_item:
+            self.checkout(self.products[:1])
+        with CaptureQueriesContext(connection) as many_items:
+            self.checkout(self.products)
+
+        self.assertEqual(len(single_item), len(many_items))
+
+    def test_checkout_with_missing_product_writes_nothing(self) -> None:
+        response = self.post(
+            {'items': [{'product': self.products[0].pk, 'quantity': 1}, {'product': 0, 'quantity': 1}]},
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Order.objects.exists())
+        self.assertFalse(OrderItem.objects.exists())
+
+    def test_checkout_requires_items(self) -> None:
+        response = self.post({'items': []})
+
+        self.assertEqual(response.status_code, 400)
+
+    @benchmark
+    def test_checkout_throughput(self) -> None:
+        report('checkout (20 items)', measure(lambda: self.checkout(self.products), iterations=200))
@@ -0,0 +1,65 @@
+import json
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.shop.factories import OrderFactory, OrderItemFactory, UserFactory
+from apps.shop.models import Order
+from apps.shop.views import ExportView
+
+
+class ExportViewTests(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.request_factory = APIRequestFactory()
+        self.staff_user = UserFactory(is_staff=True)
+        self.orders = OrderFactory.create_batch(3)
+        for order in self.orders:
+            OrderItemFactory(order=order)
+
+    def export(self, resource: str, export_format: str, **params):
+        request = self.request_factory.get(f'/export/{resource}.{export_format}', params)
+        force_authenticate(request, user=self.staff_user)
+        return ExportView.as_view()(request, resource=resource, export_format=export_format)
+
+    def read_ndjson(self, response) -> list[dict]:
+        return [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+
+    def test_ndjson_export_streams_all_rows(self) -> None:
+        response = self.export('orders', 'ndjson')
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual([row['id'] for row in self.read_ndjson(response)], [order.pk for order in self.orders])
+
+    def test_csv_export_has_header(self) -> None:
+        response = self.export('order-items', 'csv')
+
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], 'id,order_id,product_id,quantity,order__date_ordered')
+        self.assertEqual(len(lines), 4)
+
+    def test_export_resumes_after_cursor(self) -> None:
+        response = self.export('orders', 'ndjson', after=self.orders[0].pk)
+
+        self.assertEqual([row['id'] for row in self.read_ndjson(response)], [order.pk for order in self.orders[1:]])
+
+    def test_export_filters_by_date_range(self) -> None:
+        Order.objects.filter(pk=self.orders[0].pk).update(date_ordered=timezone.now() - timedelta(days=10))
+
+        response = self.export('orders', 'ndjson', date_from=(timezone.now() - timedelta(days=1)).isoformat())
+
+        self.assertEqual([row['id'] for row in self.read_ndjson(response)], [order.pk for order in self.orders[1:]])
+
+    def test_unknown_resource_returns_404(self) -> None:
+        self.assertEqual(self.export('users', 'ndjson').status_code, 404)
+
+    def test_export_command_writes_to_stdout(self) -> None:
+        stdout = StringIO()
+        call_command('export_shop_data', 'products', '--format', 'csv', stdout=stdout)
+
+        self.assertEqual(len(stdout.getvalue().splitlines()), 4)
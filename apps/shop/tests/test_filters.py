@@ -0,0 +1,72 @@
+import os
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from rest_framework.test import APIRequestFactory
+
+from apps.shop.factories import CategoryFactory, ProductFactory
+from apps.shop.filters import get_product_facets
+from apps.shop.models import Product
+from apps.shop.seeding import SeedDataGenerator
+from apps.shop.views import ProductViewSet
+from apps.utils.tests.benchmarks import benchmark, measure, report
+
+
+@override_settings(SHOP_PRICE_FACET_BUCKETS=(0, 10, 100))
+class ProductFilterTests(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.request_factory = APIRequestFactory()
+        self.garden = CategoryFactory(name='Garden')
+        self.home = CategoryFactory(name='Home')
+        self.lamp = ProductFactory(name='Solar lamp', price=Decimal('5.00'), category=self.garden)
+        self.hose = ProductFactory(name='Hose', price=Decimal('40.00'), category=self.garden)
+        self.kettle = ProductFactory(name='Kettle', price=Decimal('150.00'), category=self.home)
+
+    def list_products(self, params: dict):
+        request = self.request_factory.get('/products/', params)
+        response = ProductViewSet.as_view({'get': 'list'})(request)
+        response.render()
+        return response
+
+    def result_ids(self, params: dict) -> list[int]:
+        return sorted(product['id'] for product in self.list_products(params).data['results'])
+
+    def test_filters_by_category_price_and_name(self) -> None:
+        self.assertEqual(self.result_ids({'category': self.garden.pk}), [self.lamp.pk, self.hose.pk])
+        self.assertEqual(
+            self.result_ids({'category': [self.garden.pk, self.home.pk]}),
+            sorted([self.lamp.pk, self.hose.pk, self.kettle.pk]),
+        )
+        self.assertEqual(self.result_ids({'min_price': 10, 'max_price': 150}), [self.hose.pk, self.kettle.pk])
+        self.assertEqual(self.result_ids({'name': 'LAMP'}), [self.lamp.pk])
+
+    def test_facets_are_opt_in(self) -> None:
+        self.assertNotIn('facets', self.list_products({}).data)
+
+    def test_facets_are_computed_in_one_query(self) -> None:
+        # The page and the facets, one query each.
+        with self.assertNumQueries(2):
+            response = self.list_products({'facets': 'true', 'max_price': 100})
+
+        self.assertEqual(
+            response.data['facets'],
+            {
+                'categories': [{'id': self.garden.pk, 'name': 'Garden', 'count': 2}],
+                'price': [
+                    {'min': Decimal(0), 'max': Decimal(10), 'count': 1},
+                    {'min': Decimal(10), 'max': Decimal(100), 'count': 1},
+                    {'min': Decimal(100), 'max': None, 'count': 0},
+                ],
+            },
+        )
+
+    @benchmark
+    def test_facet_latency(self) -> None:
+        generator = SeedDataGenerator(seed=1)
+        generator.create_products(int(os.environ.get('BENCHMARK_PRODUCTS', 100000)), generator.create_categories(50))
+        queryset = Product.objects.all()
+
+        with override_settings(SHOP_PRICE_FACET_BUCKETS=(0, 50, 100, 250, 500, 1000)):
+            results = measure(lambda: get_product_facets(queryset), iterations=20)
+        report(f'product facets ({queryset.count()} products)', results)
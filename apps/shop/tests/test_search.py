@@ -0,0 +1,129 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from rest_framework.test import APIRequestFactory
+
+from apps.shop.factories import CategoryFactory, ProductFactory
+from apps.shop.models import Product
+from apps.shop.search import get_search_backend
+from apps.shop.search.memory import InMemorySearchBackend
+from apps.shop.views import ProductViewSet
+
+
+class InMemorySearchBackendTests(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.backend = InMemorySearchBackend()
+        self.category = CategoryFactory(name='Garden')
+        self.lamp = ProductFactory(name='Solar lamp', description='Outdoor light', category=self.category)
+        self.charger = ProductFactory(name='Charger', description='A solar charger', category=self.category)
+        self.kettle = ProductFactory(
+            name='Kettle', description='Electric kettle', category=CategoryFactory(name='Home')
+        )
+
+    def search_ids(self, query: str, **kwargs) -> list[int]:
+        return [hit.product_id for hit in self.backend.search(query, **kwargs).hits]
+
+    def test_name_matches_rank_above_description_matches(self) -> None:
+        self.assertEqual(self.search_ids('solar'), [self.lamp.pk, self.charger.pk])
+
+    def test_every_query_term_must_match(self) -> None:
+        self.assertEqual(self.search_ids('solar outdoor'), [self.lamp.pk])
+        self.assertEqual(self.search_ids('solar kettle'), [])
+
+    def test_category_name_is_searchable(self) -> None:
+        self.assertEqual(sorted(self.search_ids('garden')), sorted([self.lamp.pk, self.charger.pk]))
+
+    def test_results_are_paginated(self) -> None:
+        results = self.backend.search('solar', offset=1, limit=1)
+
+        self.assertEqual(results.total, 2)
+        self.assertEqual([hit.product_id for hit in results.hits], [self.charger.pk])
+
+    def test_index_is_refreshed_incrementally(self) -> None:
+        self.backend.rebuild()
+
+        self.kettle.name = 'Solar kettle'
+        self.kettle.save()
+        self.backend.index_products([self.kettle.pk])
+        self.assertIn(self.kettle.pk, self.search_ids('solar'))
+
+        self.backend.remove_products([self.lamp.pk])
+        self.assertNotIn(self.lamp.pk, self.search_ids('solar'))
+
+
+class ProductSearchViewTests(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.request_factory = APIRequestFactory()
+        self.product = ProductFactory(name='Velvet chair', description='Comfortable')
+        ProductFactory(name='Oak table', description='Solid wood')
+        get_search_backend().rebuild()
+
+    def search(self, query: str):
+        request = self.request_factory.get('/products/search/', {'q': query})
+        return ProductViewSet.as_view({'get': 'search'})(request)
+
+    def test_search_returns_matching_products(self) -> None:
+        response = self.search('velvet')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['results'][0]['id'], self.product.pk)
+        self.assertGreater(response.data['results'][0]['score'], 0)
+
+    def test_saved_products_are_indexed(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            ProductFactory(name='Velvet sofa', description='Soft')
+
+        self.assertEqual(self.search('velvet').data['count'], 2)
+
+    def test_search_backend_errors_do_not_fail_the_save(self) -> None:
+        backend = get_search_backend()
+        with (
+            mock.patch.object(backend, 'index_products', side_effect=ConnectionError('search is down')),
+            self.assertLogs('apps.shop.signals', 'ERROR'),
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            product = ProductFactory(name='Velvet sofa', description='Soft')
+
+        self.assertTrue(Product.objects.filter(pk=product.pk).exists())
+
+    def test_renamed_category_reindexes_its_products(self) -> None:
+        category = self.product.category
+        category.name = 'Zebra'
+
+        with self.captureOnCommitCallbacks(execute=True):
+            category.save()
+
+        self.assertEqual(self.search('zebra').data['count'], 1)
+
+    def test_other_category_saves_do_not_reindex(self) -> None:
+        category = self.product.category
+        with (
+            mock.patch.object(get_search_backend(), 'index_products') as index_products,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            category.description = 'Chairs and tables'
+            category.save()
+            category.move_to(CategoryFactory())
+            category.save()
+
+        index_products.assert_not_called()
+
+    @override_settings(SHOP_SEARCH_CHUNK_SIZE=2)
+    def test_category_products_are_reindexed_in_chunks(self) -> None:
+        category = self.product.category
+        ProductFactory.create_batch(4, category=category)
+        category.name = 'Zebra'
+
+        with (
+            mock.patch.object(get_search_backend(), 'index_products') as index_products,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            category.save()
+
+        self.assertEqual([len(call.args[0]) for call in index_products.call_args_list], [2, 2, 1])
+
+    def test_query_is_required(self) -> None:
+        self.assertEqual(self.search('').status_code, 400)
@@ -0,0 +1,54 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from apps.shop.models import Order, OrderItem, Product
+from apps.shop.seeding import SeedDataGenerator
+
+
+class CreateInitialDataCommandTests(TestCase):
+    def test_command_creates_requested_rows(self) -> None:
+        stdout = StringIO()
+        call_command(
+            'create_initial_data',
+            '--users=4',
+            '--products=30',
+            '--orders=25',
+            '--items-per-order=2',
+            '--batch-size=7',
+            stdout=stdout,
+        )
+
+        self.assertEqual(Product.objects.count(), 30)
+        self.assertEqual(Order.objects.count(), 25)
+        self.assertEqual(OrderItem.objects.count(), 50)
+        self.assertIn('rows/s', stdout.getvalue())
+
+    def test_seeded_products_are_indexed(self) -> None:
+        command = 'apps.shop.management.commands.create_initial_data'
+        with (
+            mock.patch(f'{command}.get_search_backend') as search_backend,
+            mock.patch(f'{command}.get_autocomplete_backend') as autocomplete_backend,
+        ):
+            call_command('create_initial_data', '--products=5', '--orders=0', stdout=StringIO())
+
+        search_backend.return_value.rebuild.assert_called_once_with()
+        autocomplete_backend.return_value.rebuild.assert_called_once_with()
+
+    def test_missing_dependencies_are_rejected(self) -> None:
+        for arguments in (['--categories=0', '--products=5'], ['--users=0', '--orders=5']):
+            with self.subTest(arguments=arguments), self.assertRaises(CommandError):
+                call_command('create_initial_data', *arguments, stdout=StringIO())
+        self.assertFalse(Product.objects.exists())
+
+    def test_generator_output_is_deterministic(self) -> None:
+        def generate() -> list[tuple]:
+            generator = SeedDataGenerator(seed=42)
+            generator.create_products(10, generator.create_categories(2))
+            products = list(Product.objects.order_by('id').values_list('name', 'description', 'price'))
+            Product.objects.all().delete()
+            return products
+
+        self.assertEqual(generate(), generate())
@@ -0,0 +1,92 @@
+from django.conf import settings
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.shop.factories import CategoryFactory, ProductFactory, UserFactory
+from apps.shop.models import Order, OrderItem
+from apps.shop.views import OrderItemViewSet, OrderViewSet
+from apps.utils.pagination import ESTIMATED_COUNT_HEADER
+
+
+class ShopViewSetQueryCountTests(TestCase):
+    items_per_order: int = 3
+    page_size: int = settings.REST_FRAMEWORK['PAGE_SIZE']
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.request_factory = APIRequestFactory()
+        self.user = UserFactory()
+        self.products = ProductFactory.create_batch(self.items_per_order, category=CategoryFactory())
+
+    def create_orders(self, count: int) -> None:
+        orders = Order.objects.bulk_create([Order(user=self.user) for _ in range(count)])
+        OrderItem.objects.bulk_create(
+            [OrderItem(order=order, product=product, quantity=1) for order in orders for product in self.products]
+        )
+
+    def list(self, view_class, path: str):
+        request = self.request_factory.get(path)
+        force_authenticate(request, user=self.user)
+        return view_class.as_view({'get': 'list'})(request)
+
+    def test_order_list_query_count_is_constant(self) -> None:
+        for count in (1, 100, 1000):
+            with self.subTest(orders=count):
+                Order.objects.all().delete()
+                self.create_orders(count)
+
+                # One query for the orders and one prefetch for all of their items.
+                with self.assertNumQueries(2):
+                    response = self.list(OrderViewSet, '/orders/')
+                    response.render()
+
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.data['results']), min(count, self.page_size))
+                self.assertEqual(len(response.data['results'][0]['items']), self.items_per_order)
+
+    def test_order_item_list_query_count_is_constant(self) -> None:
+        for count in (1, 100, 1000):
+            with self.subTest(orders=count):
+                Order.objects.all().delete()
+                self.create_orders(count)
+
+                with self.assertNumQueries(1):
+                    response = self.list(OrderItemViewSet, '/order-items/')
+                    response.render()
+
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.data['results']), min(count * self.items_per_order, self.page_size))
+
+
+class ShopViewSetPaginationTests(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.request_factory = APIRequestFactory()
+        self.user = UserFactory()
+        Order.objects.bulk_create([Order(user=self.user) for _ in range(25)])
+
+    def list(self, path: str):
+        request = self.request_factory.get(path)
+        force_authenticate(request, user=self.user)
+        response = OrderViewSet.as_view({'get': 'list'})(request)
+        response.render()
+        return response
+
+    def test_cursor_walks_every_order_once(self) -> None:
+        seen_ids = []
+        url = '/orders/?page_size=10'
+        while url:
+            with self.assertNumQueries(2):
+                response = self.list(url)
+            seen_ids += [order['id'] for order in response.data['results']]
+            url = response.data['next']
+
+        expected_ids = list(Order.objects.order_by('-date_ordered', '-id').values_list('id', flat=True))
+        self.assertEqual(seen_ids, expected_ids)
+
+    def test_estimated_count_header_is_opt_in(self) -> None:
+        response = self.list('/orders/')
+        self.assertNotIn(ESTIMATED_COUNT_HEADER, response)
+
+        response = self.list('/orders/?estimated_count=true')
+        self.assertEqual(response[ESTIMATED_COUNT_HEADER], '25')
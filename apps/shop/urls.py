@@ -1,7 +1,7 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import CategoryViewSet, OrderItemViewSet, OrderViewSet, ProductViewSet
+from .views import CategoryViewSet, CheckoutView, ExportView, OrderItemViewSet, OrderViewSet, ProductViewSet
 
 router = DefaultRouter()
 router.register(r'products', ProductViewSet, basename='products')
@@ -10,5 +10,7 @@ router.register(r'orders', OrderViewSet, basename='orders')
 router.register(r'order-items', OrderItemViewSet, basename='order-items')
 
 urlpatterns = [
+    path('checkout/', CheckoutView.as_view(), name='checkout'),
+    path('export/<slug:resource>.<slug:export_format>', ExportView.as_view(), name='export'),
     path('', include(router.urls)),
 ]
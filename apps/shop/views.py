@@ -1,26 +1,132 @@
-from rest_framework import viewsets
-from rest_framework.permissions import AllowAny
+from django.http import StreamingHttpResponse
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import generics, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import AllowAny, IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
+from apps.utils.views import QuerysetOptimizerMixin
+from .categories import get_category_tree
+from .exports import EXPORT_FORMATS, EXPORT_RESOURCES, iter_export
+from .filters import ProductFilter, get_product_facets
 from .models import Category, Order, OrderItem, Product
-from .serializers import CategorySerializer, OrderItemSerializer, OrderSerializer, ProductSerializer
+from .search import get_search_backend
+from .search.autocomplete import get_autocomplete_backend
+from .serializers import (
+    CategorySerializer,
+    CheckoutSerializer,
+    ExportQuerySerializer,
+    OrderItemSerializer,
+    OrderSerializer,
+    ProductAutocompleteQuerySerializer,
+    ProductSearchQuerySerializer,
+    ProductSerializer,
+)
 
 
-class ProductViewSet(viewsets.ModelViewSet):
+class ProductViewSet(QuerysetOptimizerMixin, viewsets.ModelViewSet):
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
     permission_classes = (AllowAny,)
+    filter_backends = (DjangoFilterBackend,)
+    filterset_class = ProductFilter
+    facets_query_param = 'facets'
 
+    def list(self, request, *args, **kwargs):
+        """
+        Filtered products; `?facets=true` adds category and price bucket counts of all matching products.
+        """
+        response = super().list(request, *args, **kwargs)
+        if request.query_params.get(self.facets_query_param) in ('1', 'true'):
+            response.data['facets'] = get_product_facets(self.filter_queryset(self.get_queryset()))
+        return response
 
-class CategoryViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """
+        Full-text search over product names, descriptions and category names, best matches first.
+        """
+        query_serializer = ProductSearchQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        page_size = query_serializer.validated_data['page_size']
+        offset = (query_serializer.validated_data['page'] - 1) * page_size
+
+        results = get_search_backend().search(query_serializer.validated_data['q'], offset=offset, limit=page_size)
+        products = self.get_queryset().in_bulk([hit.product_id for hit in results.hits])
+        data = [
+            {**self.get_serializer(products[hit.product_id]).data, 'score': hit.score}
+            for hit in results.hits
+            if hit.product_id in products
+        ]
+        return Response({'count': results.total, 'results': data})
+
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """
+        Product name suggestions for a search box: prefix matches first, then fuzzy matches.
+        """
+        query_serializer = ProductAutocompleteQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+
+        matches = get_autocomplete_backend().complete(
+            query_serializer.validated_data['q'], limit=query_serializer.validated_data['limit']
+        )
+        return Response([{'id': product_id, 'name': name} for product_id, name in matches])
+
+
+class CategoryViewSet(QuerysetOptimizerMixin, viewsets.ModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
 
+    @action(detail=False, methods=['get'])
+    def tree(self, request):
+        """
+        All categories nested under their parents, served from the cache.
+        """
+        return Response(get_category_tree())
+
 
-class OrderViewSet(viewsets.ModelViewSet):
+class OrderViewSet(QuerysetOptimizerMixin, viewsets.ModelViewSet):
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
+    pagination_ordering = ('-date_ordered', '-id')
 
 
-class OrderItemViewSet(viewsets.ModelViewSet):
+class OrderItemViewSet(QuerysetOptimizerMixin, viewsets.ModelViewSet):
     queryset = OrderItem.objects.all()
     serializer_class = OrderItemSerializer
+
+
+class CheckoutView(generics.CreateAPIView):
+    """
+    Places an order with all of its items in a single request and transaction.
+    """
+
+    serializer_class = CheckoutSerializer
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+
+class ExportView(APIView):
+    """
+    Streams orders, order items or products as NDJSON or CSV with constant memory use.
+    """
+
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request, resource, export_format):
+        if resource not in EXPORT_RESOURCES or export_format not in EXPORT_FORMATS:
+            raise NotFound()
+
+        query_serializer = ExportQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+
+        response = StreamingHttpResponse(
+            iter_export(resource, export_format, **query_serializer.validated_data),
+            content_type=EXPORT_FORMATS[export_format],
+        )
+        response['Content-Disposition'] = f'attachment; filename="{resource}.{export_format}"'
+        return response
@@ -3,3 +3,35 @@ from django.contrib import admin
 
 class SearchableRelatedFieldListFilter(admin.RelatedFieldListFilter):
     template = 'admin/searchable_related_field_list_filter.html'
+
+
+class LookupValueListFilter(admin.SimpleListFilter):
+    """
+    Filters by a value of a small lookup table referenced by `field_name` (e.g. the city of a location).
+
+    The choices are read from the lookup table and the rows are filtered by the ids of the matching
+    lookup rows, so neither the choices nor the filter scan or join the (large) listed table.
+    """
+
+    field_name: str
+    lookup_field: str
+
+    def _lookup_queryset(self, model):
+        related_model = model._meta.get_field(self.field_name).related_model
+        return related_model._default_manager.all()
+
+    def lookups(self, request, model_admin):
+        values = (
+            self._lookup_queryset(model_admin.model)
+            .exclude(**{self.lookup_field: ''})
+            .order_by(self.lookup_field)
+            .values_list(self.lookup_field, flat=True)
+            .distinct()
+        )
+        return [(value, value) for value in values]
+
+    def queryset(self, request, queryset):
+        if self.value() is None:
+            return queryset
+        lookup_ids = self._lookup_queryset(queryset.model).filter(**{self.lookup_field: self.value()}).values('pk')
+        return queryset.filter(**{f'{self.field_name}__in': lookup_ids})
@@ -1,9 +1,21 @@
+from typing import Iterable, Optional
+
 from django.db import models
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import DirtyFieldsMixin
 
 
-class ActiveManager(models.Manager):
+class ActiveQuerySet(models.QuerySet):
     """
-    A manager that allows you to filter the queryset by an active model
+    A queryset for `ActiveMixin` models whose bulk operations keep the semantics of `ActiveMixin.save`
+    and of the `auto_now` fields (e.g. `TimeStampMixin.updated_at`), which `update()` and `bulk_update()`
+    skip as they do not call `save()`.
+
+    Every operation is a single UPDATE statement (per batch for `bulk_update`); no signals are sent.
+    Querysets overriding `update()` may add queries of their own, e.g. `UserQuerySet` reads the ids
+    of the updated users first to invalidate their cache entries.
     """
 
     def active(self):
@@ -11,3 +23,73 @@ class ActiveManager(models.Manager):
 
     def inactive(self):
         return self.filter(is_active=False)
+
+    def _auto_now_fields(self) -> list[str]:
+        return [field.name for field in self.model._meta.concrete_fields if getattr(field, 'auto_now', False)]
+
+    def touch(self, **kwargs) -> int:
+        """
+        Updates the rows with `kwargs` and sets their `auto_now` fields to now.
+
+        Returns:
+          int: Number of updated rows.
+        """
+        now = timezone.now()
+        return self.update(**{name: now for name in self._auto_now_fields()}, **kwargs)
+
+    def activate(self) -> int:
+        """
+        Activates the inactive rows; the activation date is set unless they were activated before.
+
+        Returns:
+          int: Number of activated rows.
+        """
+        now = timezone.now()
+        return self.inactive().touch(
+            is_active=True,
+            activation_date=Coalesce('activation_date', models.Value(now)),
+            deactivation_date=None,
+        )
+
+    def deactivate(self) -> int:
+        """
+        Deactivates the active rows and sets their deactivation date.
+
+        Returns:
+          int: Number of deactivated rows.
+        """
+        return self.active().touch(is_active=False, deactivation_date=timezone.now())
+
+    def bulk_update(self, objs: Iterable[models.Model], fields: Iterable[str], batch_size: Optional[int] = None) -> int:
+        """
+        `bulk_update` also writing the activation dates of objects whose `is_active` is updated,
+        and the `auto_now` fields, as `save()` would.
+        """
+        objs, fields, now = list(objs), list(fields), timezone.now()
+        if 'is_active' in fields:
+            for obj in objs:
+                if obj.is_active:
+                    if not obj.activation_date:
+                        obj.activation_date = now
+                    obj.deactivation_date = None
+                elif not obj.deactivation_date:
+                    obj.deactivation_date = now
+            fields += [name for name in ('activation_date', 'deactivation_date') if name not in fields]
+        for name in self._auto_now_fields():
+            for obj in objs:
+                setattr(obj, name, now)
+            if name not in fields:
+                fields.append(name)
+        updated = super().bulk_update(objs, fields, batch_size=batch_size)
+        attnames = [self.model._meta.get_field(name).attname for name in fields]
+        for obj in objs:
+            if isinstance(obj, DirtyFieldsMixin):
+                obj._snapshot_fields(attnames)
+        return updated
+
+
+class ActiveManager(models.Manager.from_queryset(ActiveQuerySet)):
+    """
+    A manager that allows you to filter the queryset by an active model
+    and to activate or deactivate rows in bulk (see `ActiveQuerySet`)
+    """
@@ -1,9 +1,10 @@
+import copy
 import uuid
-from typing import Any, Type
+from typing import Any, Iterable, Optional, Type
 
 from django.conf import settings
-from django.db import models
-from django.db.models import Model
+from django.db import models, router
+from django.db.models import Model, signals
 from django.utils import timezone
 from django.utils.text import slugify
 
@@ -60,13 +61,104 @@ class ActiveMixin(models.Model):
         if self.is_active:
             if not self.activation_date:
                 self.activation_date = timezone.now()
-            self.deactivation_date = None
+            if self.deactivation_date:
+                self.deactivation_date = None
         else:
-            if self.pk:
+            if self.pk and not self.deactivation_date:
                 self.deactivation_date = timezone.now()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'is_active' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'activation_date', 'deactivation_date'}
         super().save(*args, **kwargs)
 
 
+class DirtyFieldsMixin(models.Model):
+    """
+    Mixin śledzący zmienione pola modelu, aby `save()` aktualizował tylko zmienione kolumny.
+    - Wartości pól są zapamiętywane przy wczytaniu obiektu z bazy (również przez `refresh_from_db`)
+      i po każdym zapisie.
+    - `save()` bez `update_fields` zapisuje jedynie zmienione pola oraz pola `auto_now` (np. `updated_at`);
+      zapis bez żadnych zmian nie wykonuje zapytania do bazy, ale nadal wysyła `pre_save` i `post_save`
+      (z pustym `update_fields`), więc odbiorcy sygnałów (np. unieważnianie cache użytkowników) działają jak wcześniej.
+    - Jak przy każdym zapisie z `update_fields`, obiekt usunięty w międzyczasie z bazy nie jest wstawiany ponownie:
+      zapis zmian kończy się błędem `DatabaseError`, a zapis bez zmian nie robi nic.
+    - Jawnie podane `update_fields`, `force_insert` oraz nowe obiekty zapisywane są jak dotychczas.
+
+    Uwaga: mixin musi znajdować się w MRO za mixinami ustawiającymi pola w `save()` (np. `ActiveMixin`),
+    aby zmiany dat aktywacji trafiły do zapisywanych pól.
+
+    Mixin ten jest oznaczony jako abstrakcyjny.
+    """
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db: Optional[str], field_names: list[str], values: list[Any]) -> Model:
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_fields()
+        return instance
+
+    def _snapshot_fields(self, attnames: Optional[Iterable[str]] = None) -> None:
+        loaded_values = self.__dict__.setdefault('_loaded_values', {})
+        if attnames is None:
+            attnames = [field.attname for field in self._meta.concrete_fields]
+        for attname in attnames:
+            if attname in self.__dict__:
+                loaded_values[attname] = copy.deepcopy(self.__dict__[attname])
+
+    def get_dirty_fields(self) -> list[str]:
+        """
+        Zwraca nazwy (`attname`) pól zmienionych od wczytania lub ostatniego zapisu obiektu.
+        """
+        loaded_values = self.__dict__.get('_loaded_values', {})
+        return [
+            field.attname
+            for field in self._meta.concrete_fields
+            if not field.primary_key
+            and field.attname in self.__dict__
+            and (field.attname not in loaded_values or loaded_values[field.attname] != self.__dict__[field.attname])
+        ]
+
+    def is_dirty(self) -> bool:
+        return bool(self.get_dirty_fields())
+
+    def refresh_from_db(
+        self, using: Optional[str] = None, fields: Optional[Iterable[str]] = None, **kwargs: Any
+    ) -> None:
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        if fields is None:
+            self._snapshot_fields()
+        else:
+            self._snapshot_fields(self._meta.get_field(name).attname for name in fields)
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        update_fields = kwargs.get('update_fields')
+        if self._state.adding or args or kwargs.get('force_insert') or update_fields is not None:
+            super().save(*args, **kwargs)
+            self._snapshot_fields(
+                None if update_fields is None else (self._meta.get_field(name).attname for name in update_fields)
+            )
+            return
+
+        dirty_fields = self.get_dirty_fields()
+        if not dirty_fields:
+            self._send_save_signals(kwargs.get('using'))
+            return
+        auto_now_fields = [field.attname for field in self._meta.concrete_fields if getattr(field, 'auto_now', False)]
+        kwargs['update_fields'] = {*dirty_fields, *auto_now_fields}
+        super().save(*args, **kwargs)
+        self._snapshot_fields(kwargs['update_fields'])
+
+    def _send_save_signals(self, using: Optional[str]) -> None:
+        using = using or router.db_for_write(self.__class__, instance=self)
+        update_fields = frozenset()
+        signals.pre_save.send(sender=self.__class__, instance=self, raw=False, using=using, update_fields=update_fields)
+        signals.post_save.send(
+            sender=self.__class__, instance=self, created=False, raw=False, using=using, update_fields=update_fields
+        )
+
+
 class OrderableMixin(models.Model):
     """
     Mixin dodający możliwość porządkowania obiektów na podstawie pola `position`.
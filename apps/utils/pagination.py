@@ -0,0 +1,71 @@
+import json
+from typing import Any, Optional
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import QuerySet
+from rest_framework import pagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+ESTIMATED_COUNT_HEADER = 'X-Estimated-Count'
+
+
+def estimate_count(queryset: QuerySet) -> int:
+    """
+    Estimate the number of rows returned by a queryset.
+
+    On PostgreSQL the planner's row estimate is used, so no `COUNT(*)` is executed.
+    When the estimate is below `ESTIMATED_COUNT_THRESHOLD` the exact count is cheap and used instead.
+    Other databases always fall back to the exact count.
+
+    Args:
+      queryset (QuerySet): The queryset to count.
+
+    Returns:
+      int: Estimated number of rows.
+    """
+    queryset = queryset.order_by()
+    if connections[queryset.db].vendor != 'postgresql':
+        return queryset.count()
+
+    plan = json.loads(queryset.explain(format='json'))
+    estimate = int(plan[0]['Plan']['Plan Rows'])
+    if estimate < settings.ESTIMATED_COUNT_THRESHOLD:
+        return queryset.count()
+    return estimate
+
+
+class CursorPagination(pagination.CursorPagination):
+    """
+    Keyset pagination which costs the same for every page.
+
+    The ordering is taken from the `pagination_ordering` view attribute and must start with
+    an indexed, unchanging column. Clients may opt in to an estimated total row count
+    returned in the `X-Estimated-Count` header by passing `?estimated_count=true`.
+    """
+
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    ordering = '-id'
+    estimated_count_query_param = 'estimated_count'
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view: Any = None) -> Optional[list]:
+        self.estimated_count: Optional[int] = None
+        if request.query_params.get(self.estimated_count_query_param) in ('1', 'true'):
+            self.estimated_count = estimate_count(queryset)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_ordering(self, request: Request, queryset: QuerySet, view: Any) -> tuple:
+        ordering = getattr(view, 'pagination_ordering', None)
+        if ordering is None:
+            return super().get_ordering(request, queryset, view)
+        if isinstance(ordering, str):
+            return (ordering,)
+        return tuple(ordering)
+
+    def get_paginated_response(self, data: Any) -> Response:
+        response = super().get_paginated_response(data)
+        if self.estimated_count is not None:
+            response[ESTIMATED_COUNT_HEADER] = str(self.estimated_count)
+        return response
@@ -0,0 +1,45 @@
+import os
+import sys
+import time
+import unittest
+from typing import Callable
+
+RUN_BENCHMARKS: bool = os.environ.get('RUN_BENCHMARKS') == '1'
+
+benchmark = unittest.skipUnless(RUN_BENCHMARKS, 'Set RUN_BENCHMARKS=1 to run benchmarks.')
+
+
+def measure(func: Callable[[], object], iterations: int) -> dict[str, float]:
+    """
+    Runs `func` the given number of times and returns timing statistics.
+
+    Args:
+      func (Callable): The measured call.
+      iterations (int): How many times to call it.
+
+    Returns:
+      dict: Total time, throughput and latency percentiles (in milliseconds).
+    """
+    timings = []
+    started_at = time.perf_counter()
+    for _ in range(iterations):
+        call_started_at = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - call_started_at)
+    total = time.perf_counter() - started_at
+
+    timings.sort()
+    return {
+        'total_s': total,
+        'per_second': iterations / total,
+        'p50_ms': timings[len(timings) // 2] * 1000,
+        'p99_ms': timings[min(len(timings) - 1, int(len(timings) * 0.99))] * 1000,
+    }
+
+
+def report(name: str, results: dict[str, float]) -> None:
+    """
+    Prints benchmark results on stderr so they are visible in the test output.
+    """
+    formatted = ', '.join(f'{key}={value:.3f}' for key, value in results.items())
+    sys.stderr.write(f'\n[benchmark] {name}: {formatted}\n')
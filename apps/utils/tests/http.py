@@ -0,0 +1,70 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+
+class JSONHTTPStandIn:
+    """
+    Local HTTP/1.1 server answering every GET with a configurable JSON document, for tests of HTTP clients.
+
+    `body`, `headers` and `status` can be changed between requests. Requests are counted in `requests`
+    and TCP connections in `connections`, so keep-alive reuse by a pooled session can be checked.
+
+    Usage:
+      with JSONHTTPStandIn({'key': 'value'}, headers={'Cache-Control': 'max-age=60'}) as server:
+          requests.get(server.url)
+    """
+
+    def __init__(self, body: Any = None, headers: dict[str, str] = None, status: int = 200) -> None:
+        self.body = body if body is not None else {}
+        self.headers = headers or {}
+        self.status = status
+        self.requests = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._build_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}/'
+
+    def __enter__(self) -> 'JSONHTTPStandIn':
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _build_handler(self) -> type:
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self) -> None:
+                super().setup()
+                with stand_in._lock:
+                    stand_in.connections += 1
+
+            def do_GET(self) -> None:
+                with stand_in._lock:
+                    stand_in.requests += 1
+                    status, headers, body = stand_in.status, dict(stand_in.headers), stand_in.body
+                content = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(content)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        return Handler
@@ -0,0 +1,101 @@
+import socketserver
+import threading
+from email import message_from_bytes
+from email.message import Message
+
+
+class SMTPStandIn:
+    """
+    Local SMTP server for tests, speaking just enough SMTP for `smtplib` and Django's SMTP backend.
+
+    Delivered messages are collected in `messages` and every accepted TCP connection is counted in
+    `connections`. Recipients listed in `rejected_recipients` are refused with a permanent 550 error,
+    and `fail_next` makes that many DATA commands fail with a temporary 451 error.
+
+    Usage:
+      with SMTPStandIn() as smtp:
+          with override_settings(EMAIL_HOST=smtp.host, EMAIL_PORT=smtp.port, ...):
+              ...
+    """
+
+    def __init__(self) -> None:
+        self.messages: list[Message] = []
+        self.connections = 0
+        self.rejected_recipients: set[str] = set()
+        self.fail_next = 0
+        self._lock = threading.Lock()
+        self._server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), self._build_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def host(self) -> str:
+        return self._server.server_address[0]
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def __enter__(self) -> 'SMTPStandIn':
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _build_handler(self) -> type:
+        stand_in = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def reply(self, line: str) -> None:
+                self.wfile.write(f'{line}\r\n'.encode())
+
+            def handle(self) -> None:
+                with stand_in._lock:
+                    stand_in.connections += 1
+                self.reply('220 localhost SMTP stand-in')
+                recipients: list[str] = []
+                while line := self.rfile.readline():
+                    command = line.decode().strip()
+                    verb = command.split(' ', 1)[0].upper()
+                    if verb == 'EHLO':
+                        self.reply('250-localhost')
+                        self.reply('250 8BITMIME')
+                    elif verb in ('HELO', 'NOOP'):
+                        self.reply('250 OK')
+                    elif verb == 'MAIL':
+                        recipients = []
+                        self.reply('250 OK')
+                    elif verb == 'RCPT':
+                        address = command.split(':', 1)[1].strip().strip('<>')
+                        if address in stand_in.rejected_recipients:
+                            self.reply('550 Mailbox unavailable')
+                        else:
+                            recipients.append(address)
+                            self.reply('250 OK')
+                    elif verb == 'RSET':
+                        recipients = []
+                        self.reply('250 OK')
+                    elif verb == 'DATA':
+                        self.receive_data()
+                    elif verb == 'QUIT':
+                        self.reply('221 Bye')
+                        return
+                    else:
+                        self.reply('502 Command not implemented')
+
+            def receive_data(self) -> None:
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                lines = []
+                while (line := self.rfile.readline()) not in (b'.\r\n', b''):
+                    lines.append(line[1:] if line.startswith(b'..') else line)
+                with stand_in._lock:
+                    if stand_in.fail_next:
+                        stand_in.fail_next -= 1
+                        self.reply('451 Temporary failure')
+                        return
+                    stand_in.messages.append(message_from_bytes(b''.join(lines)))
+                self.reply('250 OK')
+
+        return Handler
@@ -0,0 +1,26 @@
+from django.test import SimpleTestCase
+
+from apps.utils.bloom import BloomFilter
+
+
+class BloomFilterTests(SimpleTestCase):
+    def test_added_items_are_always_found(self) -> None:
+        bloom = BloomFilter(capacity=1000)
+        items = [f'item-{i}' for i in range(1000)]
+        for item in items:
+            bloom.add(item)
+
+        self.assertTrue(all(item in bloom for item in items))
+        self.assertEqual(len(bloom), 1000)
+
+    def test_false_positive_rate_is_near_the_target(self) -> None:
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f'item-{i}')
+
+        false_positives = sum(f'other-{i}' in bloom for i in range(10000))
+        self.assertLess(false_positives / 10000, 0.02)
+
+    def test_size_follows_capacity_and_error_rate(self) -> None:
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        self.assertEqual((bloom.size, bloom.hash_count), (9586, 7))
@@ -0,0 +1,55 @@
+from django.test import SimpleTestCase
+
+from apps.utils.cache import LRUCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class LRUCacheTests(SimpleTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.clock = FakeClock()
+        self.cache = LRUCache(max_size=2, ttl=10, clock=self.clock)
+
+    def test_hits_and_misses_are_counted(self) -> None:
+        self.assertIsNone(self.cache.get('a'))
+        self.cache.set('a', 1)
+        self.assertEqual(self.cache.get('a'), 1)
+
+        self.assertEqual(self.cache.stats(), {'hits': 1, 'misses': 1, 'size': 1, 'max_size': 2})
+
+    def test_least_recently_used_entry_is_evicted(self) -> None:
+        self.cache.set('a', 1)
+        self.cache.set('b', 2)
+        self.cache.get('a')
+        self.cache.set('c', 3)
+
+        self.assertEqual(self.cache.get('a'), 1)
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(len(self.cache), 2)
+
+    def test_entries_expire_after_ttl(self) -> None:
+        self.cache.set('a', 1)
+        self.clock.now = 9.9
+        self.assertEqual(self.cache.get('a'), 1)
+
+        self.clock.now = 10
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_get_or_set_computes_only_on_miss(self) -> None:
+        calls = []
+
+        def compute() -> int:
+            calls.append(1)
+            return 42
+
+        self.assertEqual(self.cache.get_or_set('a', compute), 42)
+        self.assertEqual(self.cache.get_or_set('a', compute), 42)
+        self.assertEqual(len(calls), 1)
@@ -0,0 +1,135 @@
+from typing import Any, Optional
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Model, Prefetch, QuerySet
+from rest_framework import serializers
+
+
+class _QuerysetPlan:
+    """
+    Collects the `select_related`/`prefetch_related`/`only()` arguments needed to serialize a model.
+    """
+
+    def __init__(self) -> None:
+        self.select_related: list[str] = []
+        self.prefetch_related: list[Prefetch] = []
+        self.only: Optional[set[str]] = set()
+
+    def add_only(self, *field_names: str) -> None:
+        if self.only is not None:
+            self.only.update(field_names)
+
+    def disable_only(self) -> None:
+        # A field we cannot resolve (method field, property, dotted source) may read any column.
+        self.only = None
+
+    def apply(self, queryset: QuerySet) -> QuerySet:
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        if self.only is not None:
+            queryset = queryset.only(*sorted(self.only))
+        return queryset
+
+
+def _get_model_field(model: type[Model], name: str) -> Any:
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+
+
+def _build_plan(
+    serializer: serializers.BaseSerializer, model: type[Model], plan: _QuerysetPlan, prefix: str = ''
+) -> None:
+    """
+    Walks the serializer field tree and records the relations and columns it reads.
+
+    Args:
+      serializer (BaseSerializer): Serializer whose fields are inspected.
+      model (type[Model]): Model instance type the serializer reads from.
+      plan (_QuerysetPlan): Plan the discovered lookups are added to.
+      prefix (str): Lookup prefix of `model` relative to the root queryset model.
+    """
+    plan.add_only(f'{prefix}{model._meta.pk.name}')
+
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+
+        if field.source == '*':
+            if isinstance(field, serializers.Serializer):
+                _build_plan(field, model, plan, prefix)
+            else:
+                plan.disable_only()
+            continue
+
+        model_field = _get_model_field(model, field.source_attrs[0])
+        if model_field is None or len(field.source_attrs) > 1:
+            plan.disable_only()
+            continue
+
+        lookup = f'{prefix}{model_field.name}'
+
+        if model_field.one_to_many or model_field.many_to_many:
+            child = getattr(field, 'child', None) or getattr(field, 'child_relation', None)
+            plan.prefetch_related.append(Prefetch(lookup, queryset=_get_prefetch_queryset(model_field, child)))
+            continue
+
+        if model_field.is_relation:
+            if isinstance(field, serializers.Serializer):
+                plan.select_related.append(lookup)
+                plan.add_only(lookup)
+                _build_plan(field, model_field.related_model, plan, f'{lookup}__')
+                continue
+            if not (isinstance(field, serializers.RelatedField) and field.use_pk_only_optimization()):
+                # e.g. StringRelatedField or SlugRelatedField need the related object itself.
+                plan.select_related.append(lookup)
+
+        plan.add_only(lookup)
+
+
+def _get_prefetch_queryset(model_field: Any, child: Optional[serializers.Field]) -> QuerySet:
+    related_model = model_field.related_model
+    queryset = related_model._default_manager.all()
+    if not isinstance(child, serializers.Serializer):
+        return queryset
+
+    plan = _QuerysetPlan()
+    _build_plan(child, related_model, plan)
+    if model_field.one_to_many:
+        # Prefetching a reverse foreign key joins the rows back using the remote column.
+        plan.add_only(model_field.field.name)
+    return plan.apply(queryset)
+
+
+def optimize_queryset(queryset: QuerySet, serializer: serializers.BaseSerializer) -> QuerySet:
+    """
+    Applies `select_related`, `prefetch_related` and `only()` required by the serializer.
+
+    Args:
+      queryset (QuerySet): The queryset to optimize.
+      serializer (BaseSerializer): Serializer (or list serializer) used to render the queryset.
+
+    Returns:
+      QuerySet: The queryset which serializes with a constant number of queries.
+    """
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    if not isinstance(serializer, serializers.Serializer):
+        return queryset
+
+    plan = _QuerysetPlan()
+    _build_plan(serializer, queryset.model, plan)
+    return plan.apply(queryset)
+
+
+class QuerysetOptimizerMixin:
+    """
+    A viewset mixin that optimizes the queryset according to the serializer field tree
+    """
+
+    def get_queryset(self) -> QuerySet:
+        queryset = super().get_queryset()
+        return optimize_queryset(queryset, self.get_serializer())
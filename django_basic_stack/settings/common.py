@@ -46,10 +46,12 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.sites',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework_simplejwt.token_blacklist',
     'rest_framework_simplejwt',
     'drf_spectacular',
+    'django_filters',
     'corsheaders',
     'allauth',
     'allauth.account',
@@ -70,6 +72,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'allauth.account.middleware.AccountMiddleware',
+    'apps.membership.middleware.PasswordHashingBusyMiddleware',
 ]
 
 AUTHENTICATION_BACKENDS = [
@@ -86,6 +89,23 @@ SOCIALACCOUNT_PROVIDERS = {
     }
 }
 
+# Signing certificates of Google ID tokens, verified by LoginGoogleView
+GOOGLE_OAUTH2_CERTS_URL = os.environ.get(
+    'DJANGO_BASIC_STACK_GOOGLE_OAUTH2_CERTS_URL', 'https://www.googleapis.com/oauth2/v1/certs'
+)
+
+# Timeout of the certificates request
+GOOGLE_CERTS_TIMEOUT_SECONDS = 5
+
+# Seconds to keep the certificates when Google's response has no Cache-Control max-age
+GOOGLE_CERTS_DEFAULT_MAX_AGE_SECONDS = 60 * 60
+
+# Seconds before the certificates expire at which they are refreshed in the background
+GOOGLE_CERTS_REFRESH_MARGIN_SECONDS = 5 * 60
+
+# Minimum seconds between fetches triggered by tokens signed with an unknown key
+GOOGLE_CERTS_MIN_REFRESH_INTERVAL_SECONDS = 60
+
 ACCOUNT_AUTHENTICATION_METHOD = 'email'
 
 ACCOUNT_USERNAME_REQUIRED = False
@@ -134,6 +154,17 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('DJANGO_BASIC_STACK_CACHE_URL', 'redis://django-basic-stack-redis:6379/1'),
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -152,6 +183,26 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# New passwords are hashed with Argon2, older PBKDF2 hashes are rehashed on the next successful login.
+PASSWORD_HASHERS = [
+    'apps.membership.hashing.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+# Hash and verify passwords in a bounded thread pool (a sync worker still waits for the hash; use gthread or ASGI)
+PASSWORD_HASHING_POOL_ENABLED = literal_eval(os.environ.get('DJANGO_BASIC_STACK_PASSWORD_HASHING_POOL_ENABLED', 'True'))
+
+# Passwords hashed at the same time; hashing is CPU-bound, so keep it at or below the available cores
+PASSWORD_HASHING_WORKERS = int(os.environ.get('DJANGO_BASIC_STACK_PASSWORD_HASHING_WORKERS', 1))
+
+# Hashing requests allowed to wait for a worker before new ones are rejected
+PASSWORD_HASHING_MAX_QUEUE = 32
+
+# Seconds a hashing request waits for a place in the queue before it is rejected
+PASSWORD_HASHING_QUEUE_TIMEOUT_SECONDS = 5
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
@@ -203,6 +254,20 @@ EMAIL_USE_SSL = literal_eval(os.environ.get('DJANGO_BASIC_STACK_EMAIL_USE_SSL',
 
 DEFAULT_FROM_EMAIL = os.environ.get('DJANGO_BASIC_STACK_DEFAULT_FROM_EMAIL')
 
+# Queued emails are sent by the `send_outbound_emails` Celery task, triggered when the enqueuing transaction commits
+OUTBOUND_EMAIL_DISPATCH_ON_COMMIT = True
+
+# Emails sent over one SMTP connection
+OUTBOUND_EMAIL_BATCH_SIZE = 50
+
+# Failed emails are retried after this delay, doubled on every attempt, and dead-lettered after the last attempt
+OUTBOUND_EMAIL_RETRY_DELAY_SECONDS = 60
+
+OUTBOUND_EMAIL_MAX_ATTEMPTS = 5
+
+# Emails claimed by a worker that dies are retried after this many seconds
+OUTBOUND_EMAIL_LEASE_SECONDS = 5 * 60
+
 
 # Rest Framework
 
@@ -214,12 +279,102 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_PAGINATION_CLASS': 'apps.utils.pagination.CursorPagination',
+    'PAGE_SIZE': 50,
     'DEFAULT_THROTTLE_RATES': {
         'login': '10/minute',
         'register': '10/minute',
     },
 }
 
+# Login lockout
+
+# Failed logins allowed per IP address and per username within the sliding window
+MAX_LOGIN_ATTEMPTS = 5
+
+LOGIN_ATTEMPTS_TIMEOUT_MINUTES = 15
+
+# Login attempts are buffered in each process and saved in batches by a background thread
+LOGIN_ATTEMPTS_WRITE_BEHIND = True
+
+LOGIN_ATTEMPTS_BATCH_SIZE = 100
+
+LOGIN_ATTEMPTS_FLUSH_INTERVAL_SECONDS = 5
+
+# Oldest buffered attempts are dropped beyond this size, e.g. while the database is unavailable
+LOGIN_ATTEMPTS_MAX_BUFFER_SIZE = 10000
+
+# Save the buffered attempts when the process exits instead of losing them
+LOGIN_ATTEMPTS_FLUSH_ON_SHUTDOWN = True
+
+# Login attempt retention
+
+# Monthly partitions created in advance by `partition_login_attempts` and `rotate_login_attempts`
+LOGIN_ATTEMPTS_PARTITIONS_AHEAD = 3
+
+# Login attempts older than this are dropped by `rotate_login_attempts`
+LOGIN_ATTEMPTS_RETENTION_DAYS = 365
+
+# Rows deleted per statement when the table is not partitioned
+LOGIN_ATTEMPTS_DELETE_BATCH_SIZE = 5000
+
+# Login analytics
+
+# Cities kept per hourly and daily rollup, and listed on the admin dashboard
+LOGIN_ROLLUPS_TOP_CITIES = 5
+
+# How often the Celery beat schedule refreshes the rollups
+LOGIN_ROLLUPS_REFRESH_INTERVAL_SECONDS = 5 * 60
+
+# Days shown on the admin login dashboard
+LOGIN_ROLLUPS_DASHBOARD_DAYS = 30
+
+LOGIN_ROLLUPS_DASHBOARD_CACHE_TIMEOUT = 5 * 60
+
+# GeoIP
+
+GEOIP_PATH = os.environ.get('DJANGO_BASIC_STACK_GEOIP_PATH')
+
+# Login geolocation lookups kept in each process
+GEOIP_CACHE_SIZE = 10000
+
+GEOIP_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+# Cache lookups per /24 (IPv4) or /48 (IPv6) network instead of per address
+GEOIP_CACHE_BY_NETWORK = False
+
+# Parsed login User-Agent headers kept in each process
+USER_AGENT_CACHE_SIZE = 4096
+
+# Pagination
+
+# Planner estimates below this threshold are replaced with an exact COUNT(*)
+ESTIMATED_COUNT_THRESHOLD = 10000
+
+# Shop
+
+# Rows fetched per round trip of the server-side cursor used by the streaming exports
+SHOP_EXPORT_CHUNK_SIZE = 2000
+
+SHOP_SEARCH_BACKEND = 'apps.shop.search.postgres.PostgresSearchBackend'
+
+# Documents read and sent per batch while (re)building the search index
+SHOP_SEARCH_CHUNK_SIZE = 500
+
+# Seconds the category tree stays cached; every category change invalidates it anyway
+SHOP_CATEGORY_TREE_CACHE_TIMEOUT = 60 * 60
+
+# Lower edges of the price facet buckets; the last bucket has no upper bound
+SHOP_PRICE_FACET_BUCKETS = (0, 50, 100, 250, 500, 1000)
+
+# None picks pg_trgm on PostgreSQL and the in-memory prefix index elsewhere
+SHOP_AUTOCOMPLETE_BACKEND = None
+
+SHOP_SEARCH_ELASTICSEARCH = {
+    'URL': os.environ.get('DJANGO_BASIC_STACK_ELASTICSEARCH_URL', 'http://django-basic-stack-elasticsearch:9200'),
+    'INDEX': 'products',
+}
+
 # Simple JWT
 
 SIMPLE_JWT = {
@@ -233,6 +388,37 @@ SIMPLE_JWT = {
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
 }
 
+# Users resolved by `CookieJWTAuthentication` are cached until they are saved or this many seconds pass
+USER_CACHE_TIMEOUT = 5 * 60
+
+# Refresh token blacklist checks go through a per-process Bloom filter, the database is read on filter hits only
+JWT_BLACKLIST_BLOOM_ENABLED = True
+
+JWT_BLACKLIST_BLOOM_CAPACITY = 1000000
+
+JWT_BLACKLIST_BLOOM_ERROR_RATE = 0.001
+
+# Newly blacklisted tokens are added to the filter of every process this often
+JWT_BLACKLIST_SYNC_INTERVAL_SECONDS = 30
+
+# The filter is rebuilt from the unexpired blacklisted tokens this often
+JWT_BLACKLIST_REBUILD_INTERVAL_SECONDS = 60 * 60
+
+# Blacklisted jtis kept in the shared cache; must outlast the sync interval
+JWT_BLACKLIST_CACHE_TIMEOUT = 5 * 60
+
+# Expired outstanding tokens deleted per statement by the daily purge
+JWT_PURGE_BATCH_SIZE = 5000
+
+
+# Account deletion
+
+# Rows deleted per transaction when an account is deleted in the background
+ACCOUNT_DELETION_BATCH_SIZE = 1000
+
+# Seconds without progress after which an unfinished account deletion is dispatched again
+ACCOUNT_DELETION_RESUME_AFTER_SECONDS = 15 * 60
+
 
 # Compressor
 
@@ -253,6 +439,25 @@ CELERY_BROKER_URL = 'redis://django-basic-stack-redis:6379/0'
 
 CELERY_RESULT_BACKEND = 'redis://django-basic-stack-redis:6379/0'
 
+CELERY_BEAT_SCHEDULE = {
+    'refresh-login-attempt-rollups': {
+        'task': 'apps.membership.tasks.refresh_login_attempt_rollups',
+        'schedule': LOGIN_ROLLUPS_REFRESH_INTERVAL_SECONDS,
+    },
+    'send-outbound-emails': {
+        'task': 'apps.membership.tasks.send_outbound_emails',
+        'schedule': 60,
+    },
+    'purge-expired-tokens': {
+        'task': 'apps.membership.tasks.purge_expired_tokens',
+        'schedule': 24 * 60 * 60,
+    },
+    'resume-account-deletions': {
+        'task': 'apps.membership.tasks.resume_account_deletions',
+        'schedule': ACCOUNT_DELETION_RESUME_AFTER_SECONDS,
+    },
+}
+
 
 # User extending
 
@@ -1 +1,11 @@
 from .common import *  # noqa
+
+SHOP_SEARCH_BACKEND = 'apps.shop.search.memory.InMemorySearchBackend'
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+LOGIN_ATTEMPTS_WRITE_BEHIND = False
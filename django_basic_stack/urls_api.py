@@ -2,4 +2,5 @@ from django.urls import include, path
 
 urlpatterns = [
     path('membership/', include('apps.membership.urls_api')),
+    path('shop/', include('apps.shop.urls')),
 ]